@@ -0,0 +1,61 @@
+"""
+Week 1: Python fundamentals + calculus for finance
+
+Importing the package does no work: nothing is downloaded or plotted and
+pandas / matplotlib / yfinance are only loaded when something needs them.
+The main classes and functions are importable from here and are loaded on
+first use:
+
+    from week1 import MultiStockAnalyzer, tail_risk
+
+Run configured jobs headlessly with `python -m week1 run jobs.json`.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'BankAccount': 'week1.day1.day1_bank_account',
+    'Ledger': 'week1.day1.ledger',
+    'Bank': 'week1.day1.bank',
+    'Journal': 'week1.day1.journal',
+    'derivative': 'week1.day2.day2_derivative_calc',
+    'visualize_derivative': 'week1.day3.day3_visualizing_derivatives',
+    'savgol_derivatives': 'week1.day3.price_derivatives',
+    'regularized_derivatives': 'week1.day3.price_derivatives',
+    'MovingAverageEngine': 'week1.day3.moving_averages',
+    'numerical_derivative': 'week1.day4.day4_chain_rule',
+    'compounded_value': 'week1.day4.day4_chain_rule',
+    'AlignedPanel': 'week1.day4.calendar_alignment',
+    'MultiStockAnalyzer': 'week1.day4.day4_multi_stock',
+    'StockComparison': 'week1.day4.day4_complete_comparison',
+    'ReturnPyramid': 'week1.day4.return_pyramid',
+    'parallel_ticker_metrics': 'week1.day4.parallel_analytics',
+    'CorrelationClusters': 'week1.day4.correlation_clusters',
+    'visualize_integration': 'week1.day5.integration_visualization',
+    'NumericalIntegrator': 'week1.day5.numerical_integration',
+    'WealthAccumulator': 'week1.day5.wealth_accumulator',
+    'AccountsTable': 'week1.day5.interest_accrual',
+    'PortfolioWealthTracker': 'week1.day5.portfolio_wealth_tracker',
+    'PortfolioSweep': 'week1.day5.portfolio_sweep',
+    'simulate_cash_flows': 'week1.day5.cash_flows',
+    'probability_of_reaching': 'week1.day5.goal_planning',
+    'bootstrap_metrics': 'week1.day5.bootstrap',
+    'tail_risk': 'week1.day5.risk',
+    'ResultCache': 'week1.result_cache',
+    'render_portfolio_reports': 'week1.chart_rendering',
+    'render_price_charts': 'week1.chart_rendering',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'week1' has no attribute '{name}'")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,7 @@
+"""Entry point for `python -m week1` (see week1/cli.py)."""
+
+import sys
+
+from week1.cli import main
+
+sys.exit(main())
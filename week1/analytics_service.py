@@ -0,0 +1,315 @@
+"""
+Local Analytics Service
+Keep prices and results hot in one long-running process instead of paying
+interpreter start-up, imports and downloads on every script run.
+
+    python -m week1.analytics_service --serve --port 8765
+
+    GET /summary?tickers=AAPL,MSFT&start=2024-01-01&end=2024-12-31&horizon=monthly
+    GET /correlation?tickers=AAPL,MSFT,GOOGL
+    GET /metrics?tickers=AAPL,MSFT&weights=0.6,0.4&capital=10000
+    GET /tickers?tickers=AAPL,MSFT,...       (per-ticker drawdowns / rolling vol)
+    POST /batch   body: [{"path": "/summary", "tickers": "AAPL,MSFT"}, ...]
+    GET /stats
+
+- hot data:   prices per (tickers, start, end) and finished results stay in memory
+- coalescing: identical requests arriving together share ONE download / computation
+- offloading: the number crunching runs in a process pool, so the event loop
+              keeps answering cached requests while a big job is running
+Everything is keyed on today's date too, so live prices refresh once a day.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+from week1.result_cache import cache_key
+
+pd = lazy_import('pandas')
+
+ENDPOINTS = ('summary', 'correlation', 'metrics', 'tickers')
+
+
+def download_prices(tickers, start, end):
+    """Closing prices from Yahoo Finance (runs in a thread - it blocks on the network)."""
+    import yfinance as yf
+
+    data = yf.download(list(tickers), start=start, end=end, progress=False)
+    if data is None or data.empty:
+        raise ValueError(f"Failed to download data for {list(tickers)}")
+    return data['Close']
+
+
+def _compute(endpoint, tickers, data, params):
+    """CPU work for one request; runs in a worker process."""
+    from week1.day4.day4_multi_stock import MultiStockAnalyzer
+    from week1.day5.portfolio_sweep import sweep_metrics
+
+    if endpoint == 'metrics':
+        # Same metrics as PortfolioWealthTracker.calculate_metrics, from the sweep engine
+        weights = np.array(params['weights'], dtype=float)
+        if len(weights) != len(tickers) or not np.isclose(weights.sum(), 1.0):
+            raise ValueError("Need one weight per ticker, summing to 1")
+        returns = data[list(tickers)].pct_change().dropna()
+        metrics = sweep_metrics(returns.to_numpy() @ weights[:, None], params['capital'])
+        return {name: float(values[0]) for name, values in metrics.items()}
+
+    analyzer = MultiStockAnalyzer(tickers)
+    analyzer.result_cache = None  # the service keeps its own results
+    analyzer.data = data
+    if endpoint == 'summary':
+        return analyzer.summary_statistics(params['horizon'])
+    if endpoint == 'correlation':
+        return analyzer.correlation_matrix()
+    return analyzer.ticker_metrics(n_workers=1, window=params['window'])
+
+
+def _to_json(result):
+    """DataFrames as {'index', 'columns', 'data'} with NaN -> null."""
+    if isinstance(result, pd.DataFrame):
+        values = result.astype(object).where(result.notna(), None)
+        return {'index': [str(i) for i in result.index], 'columns': list(result.columns),
+                'data': values.values.tolist()}
+    return {name: (None if value != value else value) for name, value in result.items()}
+
+
+class AnalyticsService:
+    """
+    asyncio analytics server with hot data, request coalescing and a process pool.
+    """
+
+    def __init__(self, loader=download_prices, n_workers=None, max_universes=32, max_results=1024):
+        """
+        Parameters:
+        loader (callable): loader(tickers, start, end) -> DataFrame of closing prices
+        n_workers (int): Worker processes for the calculations (default: CPU cores)
+        max_universes (int): Price tables kept in memory (least recently used dropped)
+        max_results (int): Finished results kept in memory
+        """
+        self.loader = loader
+        # 'spawn': forking a process that already runs event-loop and download threads can deadlock
+        self.pool = ProcessPoolExecutor(max_workers=n_workers or os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        self.max_universes = max_universes
+        self.max_results = max_results
+        self._prices = OrderedDict()
+        self._results = OrderedDict()
+        self._in_flight = {}
+        self.counts = {'requests': 0, 'result hits': 0, 'coalesced': 0, 'downloads': 0, 'computations': 0}
+
+    @staticmethod
+    def _remember(store, key, value, limit):
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > limit:
+            store.popitem(last=False)
+
+    async def _once(self, key, make_coroutine):
+        """Run make_coroutine() once per key; concurrent callers with the same key await the same task."""
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.counts['coalesced'] += 1
+            return await asyncio.shield(task)
+        task = asyncio.ensure_future(make_coroutine())
+        self._in_flight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def prices(self, tickers, start, end):
+        """Hot price table for a universe (downloaded at most once per day)."""
+        key = cache_key('prices', sorted(tickers), start, end, date.today())
+        if key in self._prices:
+            self._prices.move_to_end(key)
+            return self._prices[key]
+
+        async def download():
+            self.counts['downloads'] += 1
+            data = await asyncio.to_thread(self.loader, tuple(sorted(tickers)), start, end)
+            self._remember(self._prices, key, data, self.max_universes)
+            return data
+
+        return await self._once(key, download)
+
+    async def query(self, endpoint, query):
+        """
+        Answer one request.
+
+        Parameters:
+        endpoint (str): 'summary', 'correlation', 'metrics' or 'tickers'
+        query (dict): tickers, start, end and endpoint options (strings, as in a URL)
+
+        Returns:
+        dict: JSON-ready result
+        """
+        if endpoint not in ENDPOINTS:
+            raise KeyError(endpoint)
+        tickers = [t.strip().upper() for t in str(query.get('tickers', '')).split(',') if t.strip()]
+        if not tickers:
+            raise ValueError("Pass at least one ticker, e.g. ?tickers=AAPL,MSFT")
+        start, end = query.get('start'), query.get('end')
+        params = {
+            'horizon': query.get('horizon', 'daily'),
+            'window': int(query.get('window', 21)),
+            'capital': float(query.get('capital', 10000)),
+            'weights': ([float(w) for w in str(query['weights']).split(',')] if 'weights' in query
+                        else [1 / len(tickers)] * len(tickers))
+        }
+        self.counts['requests'] += 1
+
+        key = cache_key(endpoint, tickers, start, end, params, date.today())
+        if key in self._results:
+            self._results.move_to_end(key)
+            self.counts['result hits'] += 1
+            return self._results[key]
+
+        async def compute():
+            data = await self.prices(tickers, start, end)
+            self.counts['computations'] += 1
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.pool, _compute, endpoint, tickers, data, params)
+            if result is None:
+                raise ValueError("No data available for these tickers and dates")
+            result = _to_json(result)
+            self._remember(self._results, key, result, self.max_results)
+            return result
+
+        return await self._once(key, compute)
+
+    def stats(self):
+        """Request counts plus how much is held in memory."""
+        return dict(self.counts, **{'hot universes': len(self._prices), 'hot results': len(self._results)})
+
+    async def _respond(self, method, path, query, body):
+        """(status, payload) for one HTTP request."""
+        endpoint = path.strip('/')
+        try:
+            if endpoint == 'stats':
+                return 200, self.stats()
+            if endpoint == 'batch' and method == 'POST':
+                jobs = json.loads(body or b'[]')
+                if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+                    return 400, {'error': 'A batch body is a JSON list of objects with a "path"'}
+                answers = await asyncio.gather(*[self._job(job) for job in jobs], return_exceptions=True)
+                return 200, [{'error': str(a)} if isinstance(a, Exception) else a for a in answers]
+            if endpoint not in ENDPOINTS:
+                return 404, {'error': f"Unknown endpoint '{path}'"}
+            return 200, await self.query(endpoint, query)
+        except ValueError as error:
+            return 400, {'error': str(error)}
+        except Exception as error:
+            return 500, {'error': f'{type(error).__name__}: {error}'}
+
+    async def _job(self, job):
+        """One query of a batch."""
+        endpoint = str(job.get('path', '')).strip('/')
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{job.get('path', '')}'")
+        return await self.query(endpoint, job)
+
+    async def handle(self, reader, writer):
+        """Minimal HTTP/1.1: one request per connection, JSON response."""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+            if len(request_line) < 2:
+                status, payload = 400, {'error': 'Bad request'}
+            else:
+                url = urlsplit(request_line[1])
+                query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+                status, payload = await self._respond(request_line[0].upper(), url.path, query, body)
+
+            content = json.dumps(payload).encode()
+            reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}[status]
+            writer.write(f'HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n'
+                         f'Content-Length: {len(content)}\r\nConnection: close\r\n\r\n'.encode() + content)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        """Serve until cancelled."""
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Analytics service on http://{host}:{port}/ (endpoints: {', '.join(ENDPOINTS)}, batch, stats)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown()
+
+
+async def _get(port, path):
+    """Tiny HTTP client for the demo."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b'\r\n\r\n', 1)[1])
+
+
+def _simulated_prices(tickers, start, end):
+    """Offline loader for the demo: random-walk prices, same for the same tickers."""
+    rng = np.random.default_rng(42)
+    days = pd.bdate_range('2023-01-02', periods=500)
+    values = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.015, (len(days), len(tickers))), axis=0))
+    return pd.DataFrame(values, index=days, columns=list(tickers))
+
+
+async def _demo(port):
+    import time
+
+    service = AnalyticsService(loader=_simulated_prices, n_workers=2)
+    server = await asyncio.start_server(service.handle, '127.0.0.1', port)
+    async with server:
+        path = '/summary?tickers=AAPL,MSFT,GOOGL,AMZN&horizon=weekly'
+
+        start = time.perf_counter()
+        answers = await asyncio.gather(*[_get(port, path) for _ in range(50)])
+        print(f"50 concurrent identical requests: {(time.perf_counter() - start) * 1000:.0f} ms, "
+              f"all equal: {all(a == answers[0] for a in answers)}")
+
+        start = time.perf_counter()
+        await _get(port, path)
+        print(f"Same request again (hot):         {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        metrics = await _get(port, '/metrics?tickers=AAPL,MSFT&weights=0.6,0.4&capital=10000')
+        print(f"Portfolio Sharpe ratio:           {metrics['Sharpe Ratio']:.3f}")
+        print("Service stats:", await _get(port, '/stats'))
+    service.pool.shutdown()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local analytics service")
+    parser.add_argument('--serve', action='store_true', help="serve real (Yahoo Finance) data until Ctrl+C")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.serve:
+        try:
+            asyncio.run(AnalyticsService().serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        print("DEMO WITH SIMULATED PRICES (use --serve for real data)")
+        asyncio.run(_demo(args.port))
@@ -0,0 +1,310 @@
+"""
+Benchmark Suite
+Time the numerical and analytics hot paths on synthetic data (no network),
+over a sweep of sizes, and catch slowdowns against a stored baseline.
+
+    python -m week1 bench --output bench.json                 # run, save results
+    python -m week1 bench --save-baseline                     # run, store as the baseline
+    python -m week1 bench --baseline week1/bench_baseline.json --threshold 1.5
+    python -m week1 bench --filter correlation --quick
+
+Each case is timed like timeit: the call is repeated until one measurement
+takes at least min_time, and the best of `repeat` measurements is kept (the
+least disturbed by other processes). A case is a REGRESSION when it is more
+than `threshold` times slower than the baseline.
+"""
+
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+
+def _returns(num_days, num_tickers, seed=42):
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range('2000-01-03', periods=num_days)
+    return pd.DataFrame(rng.normal(0.0004, 0.015, (num_days, num_tickers)), index=days,
+                        columns=[f'S{i:04d}' for i in range(num_tickers)])
+
+
+def _prices(num_days, num_tickers):
+    return 100 * (1 + _returns(num_days, num_tickers)).cumprod()
+
+
+# Every case: size -> a zero-argument callable doing the work once.
+# Setup (data, objects) happens outside the callable and is not timed.
+
+def _compounding(method):
+    def setup(num_days):
+        from week1.day5.wealth_accumulator import WealthAccumulator
+
+        accumulator = WealthAccumulator(10000)
+        returns = _returns(num_days, 1).iloc[:, 0].to_numpy()
+        return lambda: getattr(accumulator, method)(returns)
+    return setup
+
+
+def _tracker(num_days):
+    from week1.day5.portfolio_wealth_tracker import PortfolioWealthTracker
+
+    tracker = PortfolioWealthTracker(['S0000', 'S0001', 'S0002'], [0.5, 0.3, 0.2], 10000)
+    tracker.result_cache = None
+    tracker.data = _prices(num_days, 3)
+    tracker.calculate_wealth_history()
+    return tracker
+
+
+def _wealth_history(num_days):
+    tracker = _tracker(num_days)
+
+    def run():
+        tracker.invalidate('portfolio_returns')  # forget the wealth history, keep the returns
+        return tracker.calculate_wealth_history()
+    return run
+
+
+def _drawdown(num_days):
+    tracker = _tracker(num_days)
+
+    def run():
+        tracker.invalidate('wealth_history')
+        return tracker.drawdown
+    return run
+
+
+def _integrator(method):
+    def setup(n):
+        from week1.day5.numerical_integration import NumericalIntegrator
+
+        integrator = NumericalIntegrator(np.sin, 0, np.pi)
+        return lambda: getattr(integrator, method)(n)
+    return setup
+
+
+def _derivative(module, name):
+    def setup(num_points):
+        function = getattr(__import__(module, fromlist=[name]), name)
+        x = np.linspace(0, 10, num_points)
+        return lambda: function(np.sin, x)
+    return setup
+
+
+def _analyzer(num_tickers):
+    from week1.day4.day4_multi_stock import MultiStockAnalyzer
+
+    analyzer = MultiStockAnalyzer([f'S{i:04d}' for i in range(num_tickers)])
+    analyzer.result_cache = None
+    analyzer.data = _prices(1260, num_tickers)
+    return analyzer
+
+
+def _correlation(num_tickers):
+    analyzer = _analyzer(num_tickers)
+
+    def run():
+        analyzer.invalidate('panel')  # forget returns and correlation, keep the aligned panel
+        return analyzer.correlation_matrix()
+    return run
+
+
+def _summary(num_tickers):
+    analyzer = _analyzer(num_tickers)
+    analyzer.summary_statistics()
+
+    def run():
+        analyzer.invalidate('pyramid')  # forget the summaries, keep returns and pyramid
+        return analyzer.summary_statistics()
+    return run
+
+
+def _clusters(num_tickers):
+    analyzer = _analyzer(num_tickers)
+
+    def run():
+        analyzer.invalidate('panel')  # forget returns and clusters, keep the aligned panel
+        return analyzer.correlation_clusters()
+    return run
+
+
+def _accrual(num_accounts):
+    from week1.day5.interest_accrual import CONVENTIONS, AccountsTable
+
+    rng = np.random.default_rng(42)
+    book = AccountsTable(rng.lognormal(8, 1.5, num_accounts), rng.uniform(0, 0.05, num_accounts),
+                         rng.integers(0, len(CONVENTIONS), num_accounts))
+    return lambda: book.accrue(30, compound_accrued=False)
+
+
+# name -> (setup, size parameter, sizes, quick sizes)
+CASES = {
+    'compounding.discrete': (_compounding('discrete_compounding'), 'days', [252, 2520, 10080], [252, 2520]),
+    'compounding.continuous': (_compounding('continuous_compounding'), 'days', [252, 2520, 10080], [252, 2520]),
+    'tracker.wealth_history': (_wealth_history, 'days', [252, 2520, 10080], [252, 2520]),
+    'tracker.drawdown': (_drawdown, 'days', [252, 2520, 10080], [252, 2520]),
+    'integrator.riemann_left': (_integrator('riemann_left'), 'n', [1000, 10000, 100000], [1000, 10000]),
+    'integrator.riemann_midpoint': (_integrator('riemann_midpoint'), 'n', [1000, 10000, 100000], [1000, 10000]),
+    'integrator.trapezoidal': (_integrator('trapezoidal'), 'n', [1000, 10000, 100000], [1000, 10000]),
+    'integrator.simpsons': (_integrator('simpsons'), 'n', [1000, 10000, 100000], [1000, 10000]),
+    'derivative': (_derivative('week1.day2.day2_derivative_calc', 'derivative'), 'points',
+                   [1000, 100000, 1000000], [1000, 100000]),
+    'numerical_derivative': (_derivative('week1.day4.day4_chain_rule', 'numerical_derivative'), 'points',
+                             [1000, 100000, 1000000], [1000, 100000]),
+    'analyzer.correlation_matrix': (_correlation, 'tickers', [10, 100, 500], [10, 100]),
+    'analyzer.summary_statistics': (_summary, 'tickers', [10, 100, 500], [10, 100]),
+    'analyzer.correlation_clusters': (_clusters, 'tickers', [100, 1000, 5000], [100, 1000]),
+    'interest.accrue': (_accrual, 'accounts', [10_000, 1_000_000, 10_000_000], [10_000, 1_000_000]),
+}
+
+
+def time_call(function, repeat=5, min_time=0.05):
+    """
+    Best time per call (timeit-style).
+
+    Parameters:
+    function (callable): Work to time
+    repeat (int): Measurements; the best is kept
+    min_time (float): Minimum duration of one measurement in seconds
+
+    Returns:
+    dict: best and median seconds per call, calls per measurement, measurements
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+    return {'best': min(timings), 'median': float(np.median(timings)), 'number': number, 'repeat': repeat}
+
+
+def run_suite(names=None, quick=False, repeat=5, min_time=0.05, verbose=True):
+    """
+    Run benchmark cases.
+
+    Parameters:
+    names (list): Case names (default: all); a name also selects every case it is a substring of
+    quick (bool): Smaller size sweep
+    repeat (int): Measurements per case
+    min_time (float): Minimum duration of one measurement in seconds
+    verbose (bool): Print each result as it finishes
+
+    Returns:
+    dict: {'meta': machine/library info, 'results': {'case[size=...]': timing}}
+    """
+    selected = [name for name in CASES if not names or any(part in name for part in names)]
+    if not selected:
+        raise ValueError(f"No benchmark matches {names} (cases: {', '.join(CASES)})")
+
+    results = {}
+    for name in selected:
+        setup, parameter, sizes, quick_sizes = CASES[name]
+        for size in quick_sizes if quick else sizes:
+            key = f'{name}[{parameter}={size}]'
+            results[key] = time_call(setup(size), repeat, min_time)
+            if verbose:
+                print(f"  {key:<50} {results[key]['best'] * 1000:12.3f} ms")
+
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=1.5):
+    """
+    Compare two runs case by case.
+
+    Parameters:
+    current (dict): Output of run_suite
+    baseline (dict): Earlier output of run_suite
+    threshold (float): Slowdown ratio counted as a regression (1.5 = 50% slower)
+
+    Returns:
+    list: (case, baseline seconds, current seconds, ratio, status) for the cases in both runs;
+          status is 'REGRESSION', 'faster' or 'ok'
+    """
+    rows = []
+    for key, timing in current['results'].items():
+        before = baseline['results'].get(key)
+        if before is None:
+            continue
+        ratio = timing['best'] / before['best']
+        status = 'REGRESSION' if ratio > threshold else 'faster' if ratio < 1 / threshold else 'ok'
+        rows.append((key, before['best'], timing['best'], ratio, status))
+    return rows
+
+
+def save(results, path):
+    """Write results as JSON."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def main(args):
+    """Entry point for `python -m week1 bench` (args from the argparse sub-command)."""
+    print(f"Benchmarks ({'quick' if args.quick else 'full'} sizes, best of {args.repeat}):")
+    results = run_suite(args.filter, args.quick, args.repeat, args.min_time)
+
+    if args.output:
+        save(results, args.output)
+        print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        save(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline} (store one with --save-baseline)")
+        return 0
+
+    rows = compare(results, load(args.baseline), args.threshold)
+    print(f"\nAgainst {args.baseline} (regression = more than {args.threshold:.2f}x slower):")
+    print(f"  {'Case':<50} {'Baseline ms':>12} {'Now ms':>12} {'Ratio':>7}")
+    for key, before, now, ratio, status in rows:
+        flag = '' if status == 'ok' else f'  <-- {status}'
+        print(f"  {key:<50} {before * 1000:12.3f} {now * 1000:12.3f} {ratio:7.2f}{flag}")
+    regressions = [row for row in rows if row[4] == 'REGRESSION']
+    print(f"\n{len(regressions)} regression(s) in {len(rows)} compared case(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    print("BENCHMARKS (quick sizes) - full runs: python -m week1 bench")
+    run = run_suite(quick=True, repeat=3)
+    slowest = max(run['results'].items(), key=lambda item: item[1]['best'])
+    print(f"\nSlowest case: {slowest[0]} ({slowest[1]['best'] * 1000:.1f} ms)")
+    print(f"Python {run['meta']['python']}, NumPy {run['meta']['numpy']}, pandas {run['meta']['pandas']}")
@@ -0,0 +1,451 @@
+"""
+Headless Chart Rendering
+Write report charts for many portfolios / tickers straight to files.
+
+The interactive plotting methods build a new figure for every chart and stop
+at plt.show(). For a nightly batch of 1,000 reports most of that time is
+figure set-up (axes, ticks, fonts, layout), not drawing. Here:
+
+- templates draw on plain Agg figures (no pyplot, no windows, no GUI event
+  loop), so rendering in this process leaves the caller's backend and open
+  figures alone
+- each worker builds a figure TEMPLATE once (axes, lines, fills, labels, layout)
+  and for every chart only swaps the data in and calls savefig
+- long series are cut to about the pixel width first (downsampling.py)
+- charts are spread over a process pool; the returns/prices are sent to each
+  worker once, tasks are just (name, weights) or (name, tickers)
+
+    render_portfolio_reports(returns, weights, 'reports/')    # like plot_wealth_accumulation
+    render_price_charts(prices, {'tech': [...]}, 'charts/')   # like plot_normalized_prices
+    render_figures([('integral.png', visualize_integration, (f, 0, 1))], 'figures/')
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from week1.downsampling import downsample, pixel_width
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+mdates = lazy_import('matplotlib.dates')
+
+
+def use_headless_backend():
+    """Switch matplotlib to Agg (file output only; plt.show() does nothing)."""
+    import matplotlib
+
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def _agg_figure(figsize):
+    """A Figure with an Agg canvas, not registered with pyplot (never shown, closed by dropping it)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _band(x, lower, upper):
+    """Closed polygon between two curves (the vertices fill_between would make)."""
+    return np.concatenate([np.column_stack([x, upper]), np.column_stack([x[::-1], lower[::-1]])])
+
+
+def _limits(*arrays, margin=0.05):
+    """(low, high) covering all finite values, padded by a margin."""
+    values = np.concatenate([np.ravel(a) for a in arrays])
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return -1.0, 1.0
+    low, high = values.min(), values.max()
+    pad = (high - low) * margin or abs(high) * margin or 1.0
+    return low - pad, high + pad
+
+
+class WealthReportTemplate:
+    """
+    Reusable 3-panel wealth report (wealth, returns, drawdown) - the layout of
+    PortfolioWealthTracker.plot_wealth_accumulation, built once and refilled.
+    """
+
+    def __init__(self, figsize=(14, 12), dpi=100):
+        """
+        Parameters:
+        figsize (tuple): Figure size in inches
+        dpi (int): Resolution of the written files
+        """
+        self.dpi = dpi
+        self.figure = _agg_figure(figsize)
+        self.axes = self.figure.subplots(3, 1)
+        wealth_ax, returns_ax, drawdown_ax = self.axes
+
+        self.wealth_line, = wealth_ax.plot([], [], 'b-', linewidth=2)
+        self.capital_line = wealth_ax.axhline(y=0, color='red', linestyle='--', linewidth=1, alpha=0.5,
+                                              label='Initial Capital')
+        self.profit = wealth_ax.fill_between([0, 1], 0, 0, color='green', alpha=0.3, label='Profit')
+        self.loss = wealth_ax.fill_between([0, 1], 0, 0, color='red', alpha=0.3, label='Loss')
+        wealth_ax.set_title('Portfolio Wealth Over Time', fontsize=14, fontweight='bold')
+        wealth_ax.set_ylabel('Wealth ($)', fontsize=12)
+        wealth_ax.legend(loc='upper left')
+
+        self.returns_line, = returns_ax.plot([], [], 'g-', linewidth=1, alpha=0.7)
+        returns_ax.axhline(y=0, color='black', linestyle='--', linewidth=1)
+        self.gains = returns_ax.fill_between([0, 1], 0, 0, color='green', alpha=0.3)
+        self.losses = returns_ax.fill_between([0, 1], 0, 0, color='red', alpha=0.3)
+        returns_ax.set_title('Daily Portfolio Returns (Derivative of Wealth)', fontsize=14, fontweight='bold')
+        returns_ax.set_ylabel('Return (%)', fontsize=12)
+
+        self.drawdown_fill = drawdown_ax.fill_between([0, 1], 0, 0, color='red', alpha=0.5)
+        self.drawdown_line, = drawdown_ax.plot([], [], 'r-', linewidth=1)
+        drawdown_ax.set_title('Portfolio Drawdown (Peak-to-Trough Decline)', fontsize=14, fontweight='bold')
+        drawdown_ax.set_xlabel('Date', fontsize=12)
+        drawdown_ax.set_ylabel('Drawdown (%)', fontsize=12)
+
+        for ax in self.axes:
+            ax.grid(True, alpha=0.3)
+            ax.xaxis_date()
+        self.figure.tight_layout()  # once: every report has the same layout
+
+    def render(self, path, dates, returns, initial_capital, title='Portfolio Wealth Over Time'):
+        """
+        Draw one portfolio and write it to a file.
+
+        Parameters:
+        path (str or Path): Output file (format from the extension)
+        dates (ndarray): Matplotlib date numbers, one per return
+        returns (ndarray): Portfolio returns per period
+        initial_capital (float): Starting wealth
+        title (str): Title of the wealth panel
+        """
+        wealth = initial_capital * np.cumprod(1 + returns)
+        peak = np.maximum(np.maximum.accumulate(wealth), initial_capital)
+        drawdown = (wealth / peak - 1) * 100
+
+        # About 2 points per pixel column, every peak and trough kept
+        points = 2 * pixel_width(self.axes[0], self.dpi)
+        wealth_dates, wealth = downsample(dates, wealth, points)
+        returns_dates, percent = downsample(dates, returns * 100, points)
+        drawdown_dates, drawdown = downsample(dates, drawdown, points)
+        capital = np.full_like(wealth, initial_capital)
+
+        self.wealth_line.set_data(wealth_dates, wealth)
+        self.capital_line.set_ydata([initial_capital, initial_capital])
+        self.profit.set_verts([_band(wealth_dates, capital, np.maximum(wealth, capital))])
+        self.loss.set_verts([_band(wealth_dates, np.minimum(wealth, capital), capital)])
+        self.returns_line.set_data(returns_dates, percent)
+        self.gains.set_verts([_band(returns_dates, np.zeros_like(percent), np.maximum(percent, 0))])
+        self.losses.set_verts([_band(returns_dates, np.minimum(percent, 0), np.zeros_like(percent))])
+        self.drawdown_fill.set_verts([_band(drawdown_dates, drawdown, np.zeros_like(drawdown))])
+        self.drawdown_line.set_data(drawdown_dates, drawdown)
+
+        self.axes[0].set_title(title, fontsize=14, fontweight='bold')
+        for ax, values in zip(self.axes, [(wealth, capital), (percent, [0.0]), (drawdown, [0.0])]):
+            ax.set_xlim(dates[0], dates[-1])
+            ax.set_ylim(*_limits(*values))
+        self.figure.savefig(path, dpi=self.dpi)
+
+
+class PriceChartTemplate:
+    """
+    Reusable normalized-price chart (base = 100) - the layout of
+    MultiStockAnalyzer.plot_normalized_prices, with up to max_lines tickers.
+    """
+
+    def __init__(self, max_lines=10, figsize=(14, 7), dpi=100):
+        """
+        Parameters:
+        max_lines (int): Most tickers drawn on one chart
+        figsize (tuple): Figure size in inches
+        dpi (int): Resolution of the written files
+        """
+        self.dpi = dpi
+        self.figure = _agg_figure(figsize)
+        self.ax = self.figure.subplots()
+        self.lines = [self.ax.plot([], [], linewidth=2)[0] for _ in range(max_lines)]
+        self.ax.axhline(y=100, color='black', linestyle='--', linewidth=1, alpha=0.3)
+        self.ax.set_title('Normalized Stock Prices (Base = 100)', fontsize=14, fontweight='bold')
+        self.ax.set_xlabel('Date', fontsize=12)
+        self.ax.set_ylabel('Normalized Price', fontsize=12)
+        self.ax.grid(True, alpha=0.3)
+        self.ax.xaxis_date()
+        self.figure.tight_layout()
+
+    def render(self, path, dates, normalized, labels, title='Normalized Stock Prices (Base = 100)'):
+        """
+        Draw one group of tickers and write it to a file.
+
+        Parameters:
+        path (str or Path): Output file
+        dates (ndarray): Matplotlib date numbers
+        normalized (ndarray): Shape (days, tickers), prices with base 100
+        labels (list): Ticker names
+        title (str): Chart title
+        """
+        if len(labels) > len(self.lines):
+            raise ValueError(f"At most {len(self.lines)} tickers per chart, got {len(labels)}")
+        points = 2 * pixel_width(self.ax, self.dpi)
+        for i, line in enumerate(self.lines):
+            visible = i < len(labels)
+            line.set_visible(visible)
+            if visible:
+                line.set_data(*downsample(dates, normalized[:, i], points))
+                line.set_label(labels[i])
+            else:
+                line.set_data([], [])
+        self.ax.legend(handles=self.lines[:len(labels)], loc='upper left')
+        self.ax.set_title(title, fontsize=14, fontweight='bold')
+        self.ax.set_xlim(dates[0], dates[-1])
+        self.ax.set_ylim(*_limits(normalized, [100.0]))
+        self.figure.savefig(path, dpi=self.dpi)
+
+
+# Per-worker state: set once by the pool initializer
+_worker_data = None
+_worker_template = None
+
+
+def _init_worker(data, template_class, template_kwargs):
+    global _worker_data, _worker_template
+    _worker_data = data
+    _worker_template = template_class(**template_kwargs)
+
+
+def _release_worker():
+    """Drop the data and template figure after rendering in this process."""
+    global _worker_data, _worker_template
+    _worker_data = _worker_template = None
+
+
+def _render_portfolios(tasks, initial_capital):
+    """Render a chunk of (name, path, weights) with this worker's template."""
+    dates, returns = _worker_data
+    weights = np.array([w for _, _, w in tasks]).T
+    portfolio_returns = returns @ weights  # all portfolios of the chunk in one multiply
+    for column, (name, path, _) in enumerate(tasks):
+        _worker_template.render(path, dates, portfolio_returns[:, column], initial_capital,
+                                title=f'{name}: Portfolio Wealth Over Time')
+    return [path for _, path, _ in tasks]
+
+
+def _render_prices(tasks):
+    """Render a chunk of (name, path, column indices) with this worker's template."""
+    dates, prices, labels = _worker_data
+    for name, path, columns in tasks:
+        group = prices[:, columns]
+        # Base 100 from each ticker's first price (as plot_normalized_prices)
+        first = group[np.argmax(np.isfinite(group), axis=0), np.arange(len(columns))]
+        _worker_template.render(path, dates, group / first * 100, [labels[c] for c in columns],
+                                title=f'{name}: Normalized Stock Prices (Base = 100)')
+    return [path for _, path, _ in tasks]
+
+
+def _run(render, tasks, data, template_class, template_kwargs, n_workers, chunk_size, extra=()):
+    """Render tasks in chunks: in this process (n_workers=1) or in a process pool."""
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(tasks)))
+    chunk_size = chunk_size or max(1, min(50, -(-len(tasks) // (n_workers * 4))))
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+    if n_workers == 1:
+        _init_worker(data, template_class, template_kwargs)
+        try:
+            return [path for chunk in chunks for path in render(chunk, *extra)]
+        finally:
+            _release_worker()
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(data, template_class, template_kwargs)) as pool:
+        done = pool.map(render, chunks, *[[value] * len(chunks) for value in extra])
+        return [path for chunk in done for path in chunk]
+
+
+def _file_name(name, file_format):
+    safe = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in str(name))
+    return f'{safe}.{file_format}'
+
+
+def render_portfolio_reports(returns, weights, output_dir, names=None, initial_capital=10000,
+                             n_workers=None, chunk_size=None, file_format='png', **template_kwargs):
+    """
+    Write one wealth report per portfolio.
+
+    Parameters:
+    returns (DataFrame): Asset returns (dates x assets), e.g. PortfolioWealthTracker.returns
+    weights (array-like): Shape (assets, portfolios), one column per report (as sweep_weights)
+    output_dir (str or Path): Directory for the files (created if needed)
+    names (list): Report names, used as file names (default: portfolio_0000, ...)
+    initial_capital (float): Starting wealth of every portfolio
+    n_workers (int): Worker processes (default: CPU cores; 1 = no pool)
+    chunk_size (int): Reports per task (default: about 4 tasks per worker, at most 50)
+    file_format (str): 'png', 'svg', 'pdf', ...
+    **template_kwargs: figsize / dpi for WealthReportTemplate
+
+    Returns:
+    list: Paths of the written files
+    """
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim == 1:
+        weights = weights[:, None]
+    if weights.shape[0] != returns.shape[1]:
+        raise ValueError(f"Need {returns.shape[1]} weights per portfolio, got {weights.shape[0]}")
+    weights = weights.T
+    names = list(names) if names is not None else [f'portfolio_{i:04d}' for i in range(len(weights))]
+    if len(names) != len(weights):
+        raise ValueError("Need one name per weight vector")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [(name, str(output_dir / _file_name(name, file_format)), w) for name, w in zip(names, weights)]
+    data = (mdates.date2num(returns.index), returns.to_numpy(dtype=float))
+    return _run(_render_portfolios, tasks, data, WealthReportTemplate, template_kwargs,
+                n_workers, chunk_size, extra=(initial_capital,))
+
+
+def render_price_charts(prices, groups, output_dir, n_workers=None, chunk_size=None, file_format='png',
+                        **template_kwargs):
+    """
+    Write one normalized-price chart per group of tickers.
+
+    Parameters:
+    prices (DataFrame): Closing prices, one column per ticker
+    groups (dict or list): {chart name: [tickers]}, or a list of tickers for one chart each
+    output_dir (str or Path): Directory for the files (created if needed)
+    n_workers (int): Worker processes (default: CPU cores; 1 = no pool)
+    chunk_size (int): Charts per task
+    file_format (str): 'png', 'svg', 'pdf', ...
+    **template_kwargs: max_lines / figsize / dpi for PriceChartTemplate
+
+    Returns:
+    list: Paths of the written files
+    """
+    if not isinstance(groups, dict):
+        groups = {ticker: [ticker] for ticker in groups}
+    position = {ticker: i for i, ticker in enumerate(prices.columns)}
+    missing = sorted({t for tickers in groups.values() for t in tickers} - set(position))
+    if missing:
+        raise ValueError(f"No prices for {missing}")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [(name, str(output_dir / _file_name(name, file_format)), [position[t] for t in tickers])
+             for name, tickers in groups.items()]
+    template_kwargs.setdefault('max_lines', max(len(tickers) for tickers in groups.values()))
+    data = (mdates.date2num(prices.index), prices.to_numpy(dtype=float), list(prices.columns))
+    return _run(_render_prices, tasks, data, PriceChartTemplate, template_kwargs, n_workers, chunk_size)
+
+
+def _render_figure(path, function, args, kwargs, dpi):
+    """In a worker process: switch to Agg, draw, save, close."""
+    plt = use_headless_backend()
+    try:
+        function(*args, **kwargs)
+        plt.gcf().savefig(path, dpi=dpi, bbox_inches='tight')
+    finally:
+        plt.close('all')
+    return path
+
+
+def _render_figure_here(path, function, args, kwargs, dpi):
+    """
+    In the caller's process: keep its backend, make plt.show() a no-op during
+    the call, save the figure the call drew and close only the figures it opened.
+    """
+    import matplotlib.pyplot as plt
+
+    before = set(plt.get_fignums())
+    show, plt.show = plt.show, lambda *show_args, **show_kwargs: None
+    try:
+        function(*args, **kwargs)
+        plt.gcf().savefig(path, dpi=dpi, bbox_inches='tight')
+    finally:
+        plt.show = show
+        for number in set(plt.get_fignums()) - before:
+            plt.close(number)
+    return path
+
+
+def render_figures(tasks, output_dir, n_workers=None, dpi=100):
+    """
+    Run any plotting functions (visualize_integration, visualize_derivative,
+    plot_comparison, ...) in a process pool and save the figure each one draws.
+    No template reuse here - each call builds its own figure - but the calls run
+    in parallel and plt.show() is a no-op under Agg. With one worker the calls
+    run in this process on its own backend (plt.show() skipped).
+
+    Parameters:
+    tasks (list): (file name, function, args) or (file name, function, args, kwargs);
+                  functions and arguments must be picklable (defined at module level)
+    output_dir (str or Path): Directory for the files
+    n_workers (int): Worker processes (default: CPU cores)
+    dpi (int): Resolution of the written files
+
+    Returns:
+    list: Paths of the written files
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    calls = [(str(output_dir / task[0]), task[1], tuple(task[2]), task[3] if len(task) > 3 else {}, dpi)
+             for task in tasks]
+    n_workers = max(1, min(n_workers or os.cpu_count() or 1, len(calls)))
+    if n_workers == 1:
+        return [_render_figure_here(*call) for call in calls]
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(_render_figure, *zip(*calls)))
+
+
+def _one_chart_at_a_time(returns, weights, output_dir, initial_capital):
+    """The plot_wealth_accumulation way: a new figure per report (for the timing comparison)."""
+    plt = use_headless_backend()
+    for i, w in enumerate(weights):
+        portfolio = returns @ w
+        wealth = initial_capital * (1 + portfolio).cumprod()
+        drawdown = (wealth / np.maximum(wealth.cummax(), initial_capital) - 1) * 100
+        fig, axes = plt.subplots(3, 1, figsize=(14, 12))
+        axes[0].plot(wealth.index, wealth, 'b-', linewidth=2)
+        axes[0].axhline(y=initial_capital, color='red', linestyle='--', linewidth=1, alpha=0.5)
+        axes[0].fill_between(wealth.index, initial_capital, wealth, where=wealth >= initial_capital,
+                             color='green', alpha=0.3)
+        axes[0].fill_between(wealth.index, initial_capital, wealth, where=wealth < initial_capital,
+                             color='red', alpha=0.3)
+        axes[1].plot(portfolio.index, portfolio * 100, 'g-', linewidth=1, alpha=0.7)
+        axes[2].fill_between(drawdown.index, 0, drawdown, color='red', alpha=0.5)
+        axes[2].plot(drawdown.index, drawdown, 'r-', linewidth=1)
+        plt.tight_layout()
+        fig.savefig(Path(output_dir) / f'old_{i:04d}.png', dpi=100)
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    print("HEADLESS REPORTS FOR SIMULATED PORTFOLIOS (5 stocks, 3 years of daily returns)")
+    rng = np.random.default_rng(42)
+    days = pd.bdate_range('2022-01-03', periods=756)
+    returns = pd.DataFrame(rng.normal(0.0004, 0.012, (756, 5)), index=days,
+                           columns=['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA'])
+    weights = rng.dirichlet(np.ones(5), size=40).T
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        _one_chart_at_a_time(returns, weights[:, :10].T, directory, 10000)
+        per_chart_old = (time.perf_counter() - start) / 10
+        print(f"  new figure per chart:            {per_chart_old * 1000:6.0f} ms/chart")
+
+        for n_workers in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            paths = render_portfolio_reports(returns, weights, directory, n_workers=n_workers)
+            per_chart = (time.perf_counter() - start) / len(paths)
+            print(f"  template, {n_workers} worker(s):            {per_chart * 1000:6.0f} ms/chart "
+                  f"-> 1,000 reports in about {per_chart * 1000 / 60:.1f} min")
+
+        prices = 100 * (1 + returns).cumprod()
+        paths = render_price_charts(prices, {'tech': ['AAPL', 'MSFT', 'GOOGL'], 'growth': ['AMZN', 'NVDA']},
+                                    directory)
+        print(f"\nPrice charts written: {[Path(p).name for p in paths]}")
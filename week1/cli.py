@@ -0,0 +1,250 @@
+"""
+Command line: run analyses headlessly and check import cost
+
+    python -m week1 run jobs.json --output-dir results
+    python -m week1 run jobs.json --trace trace.json
+    python -m week1 example week1.day5.numerical_integration
+    python -m week1 bench-import --target 0.3
+    python -m week1 bench --quick --threshold 1.5
+
+A jobs file is a JSON list (or {"jobs": [...]}); every job names what to run
+and where to write it:
+
+    [
+      {"job": "summary", "tickers": ["AAPL", "MSFT"], "start": "2024-01-01",
+       "end": "2024-12-31", "horizon": "monthly", "output": "summary.csv"},
+      {"job": "plot-correlation", "tickers": ["AAPL", "MSFT", "GOOGL"]},
+      {"job": "portfolio-metrics", "tickers": ["AAPL", "MSFT"], "weights": [0.6, 0.4],
+       "initial_capital": 10000},
+      {"job": "render-portfolios", "tickers": ["AAPL", "MSFT"], "output": "reports",
+       "portfolios": {"balanced": [0.5, 0.5], "aapl_heavy": [0.8, 0.2]}},
+      {"job": "render-prices", "tickers": ["AAPL", "MSFT", "GOOGL"], "groups": {"big_tech": ["AAPL", "MSFT", "GOOGL"]}},
+      {"job": "example", "module": "week1.day5.numerical_integration"}
+    ]
+
+render-* jobs write many charts into the directory named by "output", using
+reusable figure templates in a process pool (see chart_rendering.py).
+
+Plots are drawn with the non-interactive Agg backend and written to files,
+so jobs run unattended (cron, CI, over SSH).
+"""
+
+import argparse
+import json
+import os
+import pkgutil
+import runpy
+import subprocess
+import sys
+import time
+import warnings
+from pathlib import Path
+
+from week1 import tracing
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+
+HEAVY_MODULES = ('pandas', 'matplotlib', 'yfinance')
+
+
+def _analyzer(job):
+    from week1.day4.day4_multi_stock import MultiStockAnalyzer
+
+    return MultiStockAnalyzer(job['tickers'], job.get('start'), job.get('end'))
+
+
+def _tracker(job):
+    from week1.day5.portfolio_wealth_tracker import PortfolioWealthTracker
+
+    weights = job.get('weights') or [1 / len(job['tickers'])] * len(job['tickers'])
+    return PortfolioWealthTracker(job['tickers'], weights, job.get('initial_capital', 10000),
+                                  job.get('start'), job.get('end'))
+
+
+def _portfolio_reports(job):
+    portfolios = job['portfolios']  # {report name: weights}
+    weights = [[float(w) for w in weights] for weights in portfolios.values()]
+    return _tracker(dict(job, weights=weights[0])).render_reports(
+        list(zip(*weights)), job['output'], names=list(portfolios), n_workers=job.get('n_workers'))
+
+
+def _example(job):
+    runpy.run_module(job['module'], run_name='__main__')
+
+
+JOBS = {
+    'summary': lambda job: _analyzer(job).summary_statistics(job.get('horizon', 'daily')),
+    'correlation': lambda job: _analyzer(job).correlation_matrix(),
+    'ticker-metrics': lambda job: _analyzer(job).ticker_metrics(job.get('n_workers'), job.get('window', 21)),
+    'tail-risk': lambda job: _analyzer(job).tail_risk(tuple(job.get('confidence_levels', (0.95, 0.99))),
+                                                       tuple(job.get('horizons', (1, 10)))),
+    'portfolio-metrics': lambda job: _tracker(job).calculate_metrics(job.get('horizon', 'daily')),
+    'plot-prices': lambda job: _analyzer(job).plot_normalized_prices(job.get('horizon', 'daily')),
+    'plot-correlation': lambda job: _analyzer(job).plot_correlation_heatmap(),
+    'plot-wealth': lambda job: _tracker(job).plot_wealth_accumulation(job.get('horizon', 'daily')),
+    'render-prices': lambda job: _analyzer(job).render_price_charts(job['output'], job.get('groups'),
+                                                                    job.get('n_workers')),
+    'render-portfolios': _portfolio_reports,
+    'example': _example,
+}
+
+
+def _write(result, path):
+    """DataFrame -> CSV, dict -> JSON, anything else (plot jobs) -> the current figure as PNG."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(result, pd.DataFrame):
+        result.to_csv(path)
+    elif isinstance(result, dict):
+        path.write_text(json.dumps({k: float(v) for k, v in result.items()}, indent=2))
+    else:
+        plt.savefig(path, dpi=150, bbox_inches='tight')
+        plt.close('all')
+
+
+def run_jobs(jobs, output_dir='.'):
+    """
+    Run jobs one after another; a failing job is reported and the rest still run.
+
+    Parameters:
+    jobs (list): Job dictionaries (see module docstring)
+    output_dir (str): Where outputs without an absolute path are written
+
+    Returns:
+    int: Number of failed jobs
+    """
+    failures = 0
+    for number, job in enumerate(jobs, 1):
+        name = job.get('job')
+        if name not in JOBS:
+            print(f"[{number}] unknown job '{name}' (use one of {sorted(JOBS)})")
+            failures += 1
+            continue
+
+        start = time.perf_counter()
+        output = None
+        try:
+            with tracing.span(f'[{number}] {name}', 'job'):
+                if name.startswith('render'):
+                    # Renderers write many files themselves: output is a directory
+                    output = Path(output_dir) / job.get('output', f'{number:02d}_{name}')
+                    result = JOBS[name](dict(job, output=str(output)))
+                    output = f"{output} ({len(result)} files)"
+                else:
+                    result = JOBS[name](job)
+            if name != 'example' and not name.startswith('render'):
+                if result is None and not name.startswith('plot'):
+                    raise ValueError("job produced no result")
+                if name.startswith('plot'):
+                    extension = '.png'
+                else:
+                    extension = '.csv' if isinstance(result, pd.DataFrame) else '.json'
+                output = Path(output_dir) / job.get('output', f'{number:02d}_{name}{extension}')
+                _write(result, output)
+        except Exception as error:  # keep going: one bad ticker shouldn't stop the batch
+            print(f"[{number}] {name} FAILED: {error}")
+            failures += 1
+            continue
+        finally:
+            if 'matplotlib.pyplot' in sys.modules:
+                plt.close('all')
+        
+        print(f"[{number}] {name} done in {time.perf_counter() - start:.2f}s" + (f" -> {output}" if output else ""))
+    return failures
+
+
+def import_times(modules, repeat=3):
+    """
+    Cold import time of each module in a fresh interpreter (best of `repeat` runs).
+
+    Returns:
+    list: (module, seconds, heavy dependencies it loaded)
+    """
+    root = Path(__file__).resolve().parent.parent
+    probe = ("import sys, time; start = time.perf_counter(); import {module}; "
+             "print(time.perf_counter() - start); "
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    results = []
+    for module in modules:
+        best, heavy = float('inf'), ''
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, '-c', probe.format(module=module)], cwd=root,
+                                    capture_output=True, text=True, check=True).stdout.split('\n')
+            best, heavy = min(best, float(output[0])), output[1]
+        results.append((module, best, heavy))
+    return results
+
+
+def package_modules():
+    """Every module in the week1 package (found on disk, not imported)."""
+    package = Path(__file__).resolve().parent
+    return sorted(info.name for info in pkgutil.walk_packages([str(package)], 'week1.')
+                  if not info.ispkg and not info.name.endswith(('__main__', 'cli')))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m week1', description=__doc__.split('\n')[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run the jobs in a JSON file")
+    run.add_argument('jobs', help="path to the jobs file")
+    run.add_argument('--output-dir', default='.', help="where to write results (default: current directory)")
+    run.add_argument('--trace', help="record a stage-level timeline to this Chrome-trace JSON file")
+    run.add_argument('--trace-memory', action='store_true', help="with --trace: also record peak memory per stage")
+
+    example = commands.add_parser('example', help="run a module's examples without opening windows")
+    example.add_argument('module', help="e.g. week1.day5.numerical_integration")
+
+    bench = commands.add_parser('bench-import', help="measure cold import time of every module")
+    bench.add_argument('modules', nargs='*', help="modules to measure (default: all)")
+    bench.add_argument('--target', type=float, default=0.3, help="seconds allowed per module (default: 0.3)")
+    bench.add_argument('--repeat', type=int, default=3, help="fresh interpreters per module (best is kept)")
+
+    suite = commands.add_parser('bench', help="time the numerical/analytics hot paths and compare to a baseline")
+    suite.add_argument('--filter', nargs='*', help="only cases whose name contains one of these")
+    suite.add_argument('--quick', action='store_true', help="smaller size sweep")
+    suite.add_argument('--repeat', type=int, default=5, help="measurements per case (best is kept)")
+    suite.add_argument('--min-time', type=float, default=0.05, help="seconds per measurement (default: 0.05)")
+    suite.add_argument('--output', help="write the results to this JSON file")
+    suite.add_argument('--baseline', default=None, help="baseline JSON file (default: week1/bench_baseline.json)")
+    suite.add_argument('--save-baseline', action='store_true', help="store this run as the baseline")
+    suite.add_argument('--threshold', type=float, default=1.5, help="slowdown ratio that fails (default: 1.5)")
+
+    args = parser.parse_args(argv)
+
+    # Headless: no windows, plt.show() does nothing
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    warnings.filterwarnings('ignore', message='.*non-interactive.*')
+
+    if args.command == 'run':
+        with open(args.jobs) as file:
+            jobs = json.load(file)
+        if args.trace:
+            tracing.enable(memory=args.trace_memory)
+        failures = run_jobs(jobs['jobs'] if isinstance(jobs, dict) else jobs, args.output_dir)
+        if args.trace:
+            tracing.disable()
+            print("\nTime per stage:")
+            print(tracing.summary().round(2).to_string())
+            print(f"Timeline written to {tracing.export_chrome_trace(args.trace)} "
+                  f"(open in chrome://tracing or https://ui.perfetto.dev)")
+        return 1 if failures else 0
+
+    if args.command == 'example':
+        return run_jobs([{'job': 'example', 'module': args.module}])
+
+    if args.command == 'bench':
+        from week1 import benchmarks
+
+        args.baseline = args.baseline or benchmarks.DEFAULT_BASELINE
+        return benchmarks.main(args)
+
+    results = import_times(args.modules or package_modules(), args.repeat)
+    print(f"{'Module':<48} {'Import (ms)':>12}  Heavy modules loaded")
+    for module, seconds, heavy in results:
+        flag = '' if seconds <= args.target else '  <-- over target'
+        print(f"{module:<48} {seconds * 1000:>12.1f}  {heavy or '-'}{flag}")
+    slow = [module for module, seconds, _ in results if seconds > args.target]
+    print(f"\n{len(results) - len(slow)}/{len(results)} modules import in under {args.target * 1000:.0f} ms")
+    return 1 if slow else 0
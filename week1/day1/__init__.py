@@ -0,0 +1 @@
+"""Day 1: OOP fundamentals (BankAccount)."""
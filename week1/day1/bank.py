@@ -0,0 +1,283 @@
+"""
+Day 1: A Thread-Safe Bank of Many Accounts
+BankAccount on its own is not safe to share between threads: `balance += x`
+is read, add, write, and two threads can interleave so one update is lost.
+
+- LOCK STRIPING: one lock per account would be thousands of locks; one lock
+  for the whole bank would serialize everything. Accounts are spread over a
+  fixed number of stripes (account id % stripes), each with its own lock.
+- TRANSFERS lock both accounts' stripes, always in increasing stripe order.
+  Two opposite transfers (A -> B and B -> A) therefore never each hold one
+  lock while waiting for the other: no deadlock.
+- BATCHES (transfer_many) take every stripe they touch once, in order, and
+  apply all their transfers under them - one lock round trip per batch.
+
+    bank = Bank()
+    alice, bob = bank.open_account("Alice", 1000), bank.open_account("Bob")
+    bank.transfer(alice, bob, 250)
+    bank.transfer_many(sources, targets, amounts)
+
+Note: under CPython's GIL the threads take turns on the Python code, so
+throughput does not grow with threads; the locks are what keeps the totals
+right. stress_test() measures both.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from week1.day1.day1_bank_account import BankAccount
+from week1.day1.ledger import TRANSFER_IN, TRANSFER_OUT, now
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+class Bank:
+    """
+    Many accounts, safe to use from many threads.
+    Accounts are identified by the integer id open_account returns.
+    """
+
+    def __init__(self, num_stripes=64):
+        """
+        Parameters:
+        num_stripes (int): Number of locks the accounts are spread over
+        """
+        if num_stripes < 1:
+            raise ValueError("num_stripes must be at least 1")
+        self.accounts = []
+        self._stripes = [threading.Lock() for _ in range(num_stripes)]
+        self._registry = threading.Lock()
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def open_account(self, owner, balance=0):
+        """
+        Add an account.
+
+        Returns:
+        int: The new account's id
+        """
+        account = BankAccount(owner, balance, verbose=False, capacity=64)
+        with self._registry:
+            self.accounts.append(account)
+            return len(self.accounts) - 1
+
+    def _account(self, account_id):
+        if not 0 <= account_id < len(self.accounts):
+            raise ValueError(f"Unknown account {account_id}")
+        return self.accounts[account_id]
+
+    def _acquire(self, stripes):
+        """Lock the given stripe numbers in increasing order; returns the locks to release."""
+        locks = [self._stripes[stripe] for stripe in sorted(set(stripes))]
+        for lock in locks:
+            lock.acquire()
+        return locks
+
+    @staticmethod
+    def _release(locks):
+        for lock in reversed(locks):
+            lock.release()
+
+    def deposit(self, account_id, amount):
+        """Deposit into one account. Returns True when the deposit was made."""
+        account = self._account(account_id)
+        with self._stripes[account_id % len(self._stripes)]:
+            return account.deposit(amount)
+
+    def withdraw(self, account_id, amount):
+        """Withdraw from one account. Returns True when the withdrawal was made."""
+        account = self._account(account_id)
+        with self._stripes[account_id % len(self._stripes)]:
+            return account.withdraw(amount)
+
+    def balance(self, account_id):
+        return self._account(account_id).balance
+
+    @staticmethod
+    def _move(source, target, amount, timestamp):
+        """Move money between two locked accounts if the source can cover it."""
+        if amount > source.balance:
+            return False
+        source.balance -= amount
+        source.ledger.append(timestamp, amount, TRANSFER_OUT, source.balance)
+        target.balance += amount
+        target.ledger.append(timestamp, amount, TRANSFER_IN, target.balance)
+        source._posted()
+        target._posted()
+        return True
+
+    def transfer(self, source_id, target_id, amount):
+        """
+        Move money between two accounts atomically: other threads see either
+        neither side of the transfer or both.
+
+        Parameters:
+        source_id (int): Account paying
+        target_id (int): Account receiving
+        amount (float): Positive amount
+
+        Returns:
+        bool: True when made, False when the source has insufficient funds
+        """
+        if not (np.isfinite(amount) and amount > 0):  # also rejects NaN and inf
+            raise ValueError("Transfer amount must be positive!")
+        if source_id == target_id:
+            raise ValueError("Cannot transfer to the same account")
+        source, target = self._account(source_id), self._account(target_id)
+
+        num_stripes = len(self._stripes)
+        locks = self._acquire((source_id % num_stripes, target_id % num_stripes))
+        try:
+            return self._move(source, target, amount, now())
+        finally:
+            self._release(locks)
+
+    def transfer_many(self, source_ids, target_ids, amounts):
+        """
+        Apply a batch of transfers in order under one acquisition of the stripes
+        they touch. A transfer the source cannot cover is skipped (not the batch).
+
+        Parameters:
+        source_ids (array-like): Paying account of each transfer
+        target_ids (array-like): Receiving account of each transfer
+        amounts (array-like): Positive amounts
+
+        Returns:
+        ndarray: bool per transfer, True where it was made
+        """
+        source_ids = np.asarray(source_ids, dtype=np.int64)
+        target_ids = np.asarray(target_ids, dtype=np.int64)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if not len(source_ids) == len(target_ids) == len(amounts):
+            raise ValueError("source_ids, target_ids and amounts must have the same length")
+        if not (np.isfinite(amounts) & (amounts > 0)).all():
+            raise ValueError("Transfer amounts must be positive!")
+        if (source_ids == target_ids).any():
+            raise ValueError("Cannot transfer to the same account")
+        ids = np.concatenate([source_ids, target_ids])
+        if len(ids) and (ids.min() < 0 or ids.max() >= len(self.accounts)):
+            raise ValueError("Unknown account in batch")
+
+        accounts = self.accounts
+        made = np.zeros(len(amounts), dtype=bool)
+        timestamp = now()
+        locks = self._acquire(np.unique(ids % len(self._stripes)).tolist())
+        try:
+            for i, (source, target, amount) in enumerate(zip(source_ids.tolist(), target_ids.tolist(),
+                                                             amounts.tolist())):
+                made[i] = self._move(accounts[source], accounts[target], amount, timestamp)
+        finally:
+            self._release(locks)
+        return made
+
+    def total_balance(self):
+        """Sum of all balances, taken with every stripe locked (a consistent snapshot)."""
+        locks = self._acquire(range(len(self._stripes)))
+        try:
+            return sum(account.balance for account in self.accounts)
+        finally:
+            self._release(locks)
+
+
+def stress_test(thread_counts=(1, 2, 4, 8), num_accounts=1000, transfers=200_000, batch_size=None,
+                num_stripes=64, seed=42):
+    """
+    Hammer a bank with random transfers from several threads and check nothing
+    was lost.
+
+    Parameters:
+    thread_counts (tuple): Thread counts to measure
+    num_accounts (int): Accounts in the bank (each starts with 1,000)
+    transfers (int): Transfers per run, split evenly between the threads
+    batch_size (int): Use transfer_many with batches of this size (default: transfer one by one)
+    num_stripes (int): Locks in the bank
+    seed (int): Random seed
+
+    Returns:
+    DataFrame: One row per thread count - time, transfers/second, how many were
+               made, and whether the total balance and ledgers are consistent
+    """
+    rows = []
+    for num_threads in thread_counts:
+        bank = Bank(num_stripes)
+        for i in range(num_accounts):
+            bank.open_account(f"Account {i}", 1000.0)
+        expected_total = bank.total_balance()
+
+        per_thread = transfers // num_threads
+        work = []
+        for thread in range(num_threads):
+            rng = np.random.default_rng(seed + thread)
+            sources = rng.integers(0, num_accounts, per_thread)
+            # Never the same account: shift by 1..num_accounts-1
+            targets = (sources + rng.integers(1, num_accounts, per_thread)) % num_accounts
+            work.append((sources, targets, rng.uniform(1, 200, per_thread).round(2)))
+
+        made = [0] * num_threads
+        start_line = threading.Barrier(num_threads + 1)
+
+        def run(thread):
+            sources, targets, amounts = work[thread]
+            start_line.wait()
+            if batch_size:
+                for start in range(0, per_thread, batch_size):
+                    stop = start + batch_size
+                    made[thread] += int(bank.transfer_many(sources[start:stop], targets[start:stop],
+                                                           amounts[start:stop]).sum())
+            else:
+                for source, target, amount in zip(sources.tolist(), targets.tolist(), amounts.tolist()):
+                    made[thread] += bank.transfer(source, target, amount)
+
+        threads = [threading.Thread(target=run, args=(thread,)) for thread in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        start_line.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        total_made = sum(made)
+        ledger_entries = sum(len(account.ledger) for account in bank.accounts)
+        rows.append({
+            'Threads': num_threads,
+            'Transfers': per_thread * num_threads,
+            'Made': total_made,
+            'Seconds': elapsed,
+            'Transfers/s': per_thread * num_threads / elapsed,
+            'Total Conserved': np.isclose(bank.total_balance(), expected_total),
+            'No Overdraft': min(account.balance for account in bank.accounts) >= 0,
+            'Ledgers Match': ledger_entries == 2 * total_made,
+        })
+    return pd.DataFrame(rows).set_index('Threads')
+
+
+if __name__ == "__main__":
+    print("BANK: ATOMIC TRANSFERS")
+    bank = Bank()
+    alice = bank.open_account("Alice", 1000)
+    bob = bank.open_account("Bob", 500)
+    print(f"Transfer 250 Alice -> Bob: {bank.transfer(alice, bob, 250)}")
+    print(f"Transfer 5000 Bob -> Alice: {bank.transfer(bob, alice, 5000)} (insufficient funds)")
+    print(f"Balances: Alice ${bank.balance(alice)}, Bob ${bank.balance(bob)}, total ${bank.total_balance()}")
+    bank.accounts[bob].show_history()
+
+    # Many threads depositing into ONE account: no update may be lost
+    hot = bank.open_account("Hot", 0)
+    threads = [threading.Thread(target=lambda: [bank.deposit(hot, 1) for _ in range(20_000)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"\n8 threads x 20,000 deposits of $1 into one account: ${bank.balance(hot):,} (expected $160,000)")
+
+    print("\nSTRESS TEST: 200,000 random transfers between 1,000 accounts")
+    for label, batch_size in (("one at a time", None), ("batches of 1,000", 1000)):
+        results = stress_test(batch_size=batch_size)
+        print(f"\n{label}:")
+        print(results.round(2).to_string())
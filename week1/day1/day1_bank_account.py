@@ -7,59 +7,165 @@ Date: [Today's date]
 Description: 
 A simple bank account class to practice OOP fundamentals.
 """
+import numpy as np
+
+from week1.day1.ledger import DEPOSIT, WITHDRAWAL, Ledger, now
+
+
 class BankAccount:
     """
     Represents a bank account with basic operations.
+    Transactions are kept in an array-backed Ledger (timestamp, amount, type,
+    balance after), so an account can hold millions of them; deposit_many /
+    withdraw_many post whole batches at once. With a Journal the ledger is
+    also written to disk and restored when the account is opened again.
     """
+    __slots__ = ('owner', 'balance', 'ledger', 'verbose', 'journal')
     
-    def __init__(self, owner, balance=0):
+    def __init__(self, owner, balance=0, verbose=True, capacity=1024, journal=None):
         """
         Initialize a new bank account.
         
         Parameters:
         owner (str): Name of account owner
         balance (float): Initial balance (default 0)
+        verbose (bool): Print a line for every transaction (turn off for bulk work)
+        capacity (int): Transactions the ledger allocates up front
+        journal (Journal): Persist transactions here; an existing journal restores
+                           the balance and history (the balance argument is then ignored)
         """
         self.owner = owner
         self.balance = balance
-        self.transaction_history = []
+        self.ledger = Ledger(capacity)
+        self.verbose = verbose
+        self.journal = journal
+        if journal is not None:
+            if journal.exists():
+                self.balance, self.ledger = journal.recover()
+            else:
+                journal.create(balance)
+    
+    @property
+    def transaction_history(self):
+        """All transactions as text, e.g. ['Deposit: +$500', 'Withdrawal: -$200']."""
+        return [self.ledger.describe(i) for i in range(len(self.ledger))]
     
     def deposit(self, amount):
-        """Add money to account."""
-        if amount <= 0:
-            print("Deposit amount must be positive!")
-            return
+        """Add money to account. Returns True when the deposit was made."""
+        if not (np.isfinite(amount) and amount > 0):  # also rejects NaN and inf
+            if self.verbose:
+                print("Deposit amount must be positive!")
+            return False
         
         self.balance += amount
-        self.transaction_history.append(f"Deposit: +${amount}")
-        print(f"Deposited ${amount}. New balance: ${self.balance}")
+        self.ledger.append(now(), amount, DEPOSIT, self.balance)
+        self._posted()
+        if self.verbose:
+            print(f"Deposited ${amount}. New balance: ${self.balance}")
+        return True
     
     def withdraw(self, amount):
-        """Remove money from account."""
-        if amount <= 0:
-            print("Withdrawal amount must be positive!")
-            return
+        """Remove money from account. Returns True when the withdrawal was made."""
+        if not (np.isfinite(amount) and amount > 0):  # also rejects NaN and inf
+            if self.verbose:
+                print("Withdrawal amount must be positive!")
+            return False
         
         if amount > self.balance:
-            print(f"Insufficient funds! Balance: ${self.balance}")
-            return
+            if self.verbose:
+                print(f"Insufficient funds! Balance: ${self.balance}")
+            return False
         
         self.balance -= amount
-        self.transaction_history.append(f"Withdrawal: -${amount}")
-        print(f"Withdrew ${amount}. New balance: ${self.balance}")
+        self.ledger.append(now(), amount, WITHDRAWAL, self.balance)
+        self._posted()
+        if self.verbose:
+            print(f"Withdrew ${amount}. New balance: ${self.balance}")
+        return True
+    
+    def _post_many(self, amounts, kind, timestamps):
+        """Validate a batch, then append it to the ledger and move the balance."""
+        amounts = np.asarray(amounts, dtype=np.float64).ravel()
+        if len(amounts) == 0:
+            return self.balance
+        valid = np.isfinite(amounts) & (amounts > 0)  # also catches NaN and inf
+        if not valid.all():
+            position = int(np.flatnonzero(~valid)[0])
+            raise ValueError(f"Amounts must be positive (position {position}: {amounts[position]})")
+        
+        # Balance after every transaction of the batch
+        sign = 1 if kind == DEPOSIT else -1
+        balances = self.balance + sign * np.cumsum(amounts)
+        if kind == WITHDRAWAL and balances[-1] < 0:
+            position = int(np.argmax(balances < 0))
+            raise ValueError(f"Insufficient funds at position {position}: balance would be "
+                             f"{balances[position]:.2f} (nothing was withdrawn)")
+        
+        self.ledger.extend(now() if timestamps is None else timestamps, amounts, kind, balances)
+        self.balance = float(balances[-1])
+        self._posted()
+        if self.verbose:
+            action = 'Deposited' if kind == DEPOSIT else 'Withdrew'
+            print(f"{action} {len(amounts)} amounts totalling ${amounts.sum():.2f}. New balance: ${self.balance:.2f}")
+        return self.balance
+    
+    def deposit_many(self, amounts, timestamps=None):
+        """
+        Deposit a batch of amounts in one step.
+        
+        Parameters:
+        amounts (array-like): Positive amounts, in order
+        timestamps (array-like): Time of each deposit (default: now for all)
+        
+        Returns:
+        float: New balance
+        """
+        return self._post_many(amounts, DEPOSIT, timestamps)
+    
+    def withdraw_many(self, amounts, timestamps=None):
+        """
+        Withdraw a batch of amounts in one step - all or nothing: if the running
+        balance would go below zero anywhere in the batch, nothing is withdrawn.
+        
+        Parameters:
+        amounts (array-like): Positive amounts, in order
+        timestamps (array-like): Time of each withdrawal (default: now for all)
+        
+        Returns:
+        float: New balance
+        """
+        return self._post_many(amounts, WITHDRAWAL, timestamps)
+    
+    def _posted(self):
+        """Hand new ledger records to the journal, which commits full groups."""
+        if self.journal is not None:
+            self.journal.log(self.ledger, self.balance)
+    
+    def commit(self):
+        """Make every transaction so far durable (no-op without a journal)."""
+        if self.journal is not None:
+            self.journal.commit(self.ledger, self.balance)
+    
+    def close(self):
+        """Commit, snapshot the balance and close the journal."""
+        if self.journal is not None:
+            self.journal.close(self.ledger, self.balance)
     
     def get_balance(self):
         """Return current balance."""
         return self.balance
     
-    def show_history(self):
-        """Display all transactions."""
+    def show_history(self, last=None):
+        """Display all transactions (or only the `last` ones)."""
         print(f"\n=== Transaction History for {self.owner} ===")
-        if not self.transaction_history:
+        if not len(self.ledger):
             print("No transactions yet.")
         else:
-            for transaction in self.transaction_history:
-                print(transaction)
+            first = 0 if last is None else max(len(self.ledger) - last, 0)
+            if first:
+                print(f"... {first} earlier transactions")
+            for index in range(first, len(self.ledger)):
+                print(self.ledger.describe(index))
         print(f"Current Balance: ${self.balance}")
         print("=" * 40)
 
@@ -81,4 +187,34 @@ if __name__ == "__main__":
     account.show_history()
     
     # Check balance
-    print(f"\nFinal balance: ${account.get_balance()}")
\ No newline at end of file
+    print(f"\nFinal balance: ${account.get_balance()}")
+    
+    # A million transactions: quiet account, batches instead of one call each
+    import time
+    
+    rng = np.random.default_rng(42)
+    amounts = rng.uniform(1, 100, 1_000_000).round(2)
+    
+    account = BankAccount("Bulk Test", 0, verbose=False)
+    start = time.perf_counter()
+    for amount in amounts[:100_000]:
+        account.deposit(amount)
+    loop = (time.perf_counter() - start) * 10
+    
+    account = BankAccount("Bulk Test", 0, verbose=False)
+    start = time.perf_counter()
+    account.deposit_many(amounts)
+    account.withdraw_many(amounts[:500_000])
+    bulk = time.perf_counter() - start
+    print(f"\n1,000,000 deposits: ~{loop:.2f}s one at a time, {bulk:.3f}s as batches "
+          f"(+ 500,000 withdrawals)")
+    print(f"Ledger: {len(account.ledger):,} transactions in {account.ledger.nbytes / 2**20:.1f} MB, "
+          f"balance ${account.balance:,.2f}")
+    
+    try:
+        account.withdraw_many([account.balance / 2, account.balance])
+    except ValueError as error:
+        print(f"Rejected batch: {error}")
+    for kind, (count, total) in account.ledger.totals().items():
+        print(f"  {kind:<11} {count:>9,} transactions, ${total:,.2f}")
+    account.show_history(last=3)
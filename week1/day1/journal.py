@@ -0,0 +1,288 @@
+"""
+Day 1: Durable Transaction Journal
+Keep a BankAccount's transactions after the process exits - and after a crash.
+
+- APPEND-ONLY: the ledger's fixed-size records are written to a binary file
+  exactly as they sit in memory (no text formatting, no parsing back).
+- GROUP COMMIT: fsync is what makes a write survive a power cut, and it costs
+  about as much for one record as for thousands. Records are written and
+  fsynced in groups of `group_size` (and on commit()/close()), so millions of
+  transactions cost thousands of fsyncs, not millions.
+- FRAMED BLOCKS: each group is one block - a 12-byte header (magic, record
+  count, CRC32 of the records) then the records. A crash in the middle of a
+  write leaves a short or mismatching last block, which recovery detects and
+  cuts off: the account comes back exactly as of the last complete commit.
+- SNAPSHOTS: every `snapshot_every` records the balance and journal position
+  are written to snapshot.json (atomically, via rename). A restart reads the
+  snapshot and only the blocks after it, through a memory map - restart time
+  doesn't grow with the size of the journal.
+
+    account = BankAccount("Alice", 1000, journal=Journal('data/alice'))
+    account.deposit_many(amounts)
+    account.close()                  # commit + snapshot
+    # later / after a crash:
+    account = BankAccount("Alice", journal=Journal('data/alice'))   # balance restored
+
+Only what was committed survives: call commit() at the points where losing
+the last group of transactions is not acceptable.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from week1.day1.ledger import ENTRY_DTYPE, SIGNS, Ledger
+
+FILE_MAGIC = b'LEDGER01'
+BLOCK_MAGIC = 0x4B4C4247
+BLOCK_HEADER = struct.Struct('<III')  # magic, record count, crc32 of the records
+# +1 / -1 for each transaction type (deposits add, withdrawals subtract, ...)
+DIRECTIONS = np.array([1.0 if sign == '+' else -1.0 for sign in SIGNS])
+
+
+class Journal:
+    """
+    Append-only, crash-consistent file of one account's ledger records.
+    """
+
+    def __init__(self, directory, group_size=4096, snapshot_every=1_000_000, fsync=True, load_history=True):
+        """
+        Parameters:
+        directory (str): Where journal.bin and snapshot.json live (created if missing)
+        group_size (int): Records per commit (one write + one fsync)
+        snapshot_every (int): Records between balance snapshots
+        fsync (bool): Force every commit to disk (turn off only for throwaway data)
+        load_history (bool): On recovery, load every record into the ledger (False:
+                             balance from the snapshot + records after it only)
+        """
+        if group_size < 1 or snapshot_every < 1:
+            raise ValueError("group_size and snapshot_every must be at least 1")
+        self.directory = directory
+        self.path = os.path.join(directory, 'journal.bin')
+        self.snapshot_path = os.path.join(directory, 'snapshot.json')
+        self.group_size = group_size
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.load_history = load_history
+        self.records = 0             # records in the journal
+        self.fsyncs = 0
+        self._ledger_mark = 0        # ledger entries already written
+        self._last_snapshot = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def exists(self):
+        return os.path.exists(self.snapshot_path)
+
+    def _sync(self, file_or_fd):
+        if self.fsync:
+            os.fsync(file_or_fd if isinstance(file_or_fd, int) else file_or_fd.fileno())
+            self.fsyncs += 1
+
+    def create(self, balance):
+        """Start an empty journal for an account opening with `balance`."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path, 'wb') as file:
+            file.write(FILE_MAGIC)
+            file.flush()
+            self._sync(file)
+        self.records = 0
+        self._write_snapshot(balance, len(FILE_MAGIC))
+        self._file = open(self.path, 'ab')
+
+    def _write_snapshot(self, balance, offset):
+        """Balance as of `offset` bytes / self.records records, replaced atomically."""
+        temporary = self.snapshot_path + '.tmp'
+        with open(temporary, 'w') as file:
+            json.dump({'balance': float(balance), 'records': self.records, 'offset': offset}, file)
+            file.flush()
+            self._sync(file)
+        os.replace(temporary, self.snapshot_path)
+        if self.fsync and hasattr(os, 'O_DIRECTORY'):
+            directory = os.open(self.directory, os.O_DIRECTORY)
+            try:
+                self._sync(directory)
+            finally:
+                os.close(directory)
+        self._last_snapshot = self.records
+
+    def recover(self, history=None):
+        """
+        Read the account back: snapshot plus the journal blocks after it.
+        A torn last block (crash during a write) is cut off.
+
+        Parameters:
+        history (bool): Load every record into the ledger (False: only the
+                        records after the snapshot - fastest restart).
+                        Default: the journal's load_history
+
+        Returns:
+        tuple: (balance, Ledger)
+        """
+        history = self.load_history if history is None else history
+        with open(self.snapshot_path) as file:
+            snapshot = json.load(file)
+
+        with open(self.path, 'r+b') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < len(FILE_MAGIC) or file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"{self.path} is not a ledger journal")
+            start = len(FILE_MAGIC) if history else snapshot['offset']
+            blocks, end, entries = [], start, np.empty(0, ENTRY_DTYPE)
+            if size > start:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    blocks, end = _scan(view, start, size)
+                    if blocks:
+                        entries = np.concatenate([np.frombuffer(view, ENTRY_DTYPE, count, offset)
+                                                  for offset, count in blocks])
+            if end < snapshot['offset']:
+                raise ValueError(f"{self.path} is damaged before its last snapshot")
+            if end < size:
+                file.truncate(end)  # drop the torn tail
+                self._sync(file)
+
+        # Records up to the snapshot are the first snapshot['records'] ones when reading everything
+        tail = entries[snapshot['records']:] if history else entries
+        balance = snapshot['balance']
+        if len(tail):
+            # Every record must move the previous balance by its own amount
+            previous = np.concatenate([[balance], tail['balance'][:-1]])
+            moved = tail['balance'] - previous
+            scale = max(np.abs(tail['balance']).max(), abs(balance), 1)
+            if not (np.abs(moved - tail['amount'] * DIRECTIONS[tail['type']]) <= 1e-9 * scale).all():
+                raise ValueError(f"{self.path}: recorded balances do not match the transactions")
+            balance = float(tail['balance'][-1])
+
+        self.records = snapshot['records'] + len(tail)
+        self._last_snapshot = snapshot['records']
+        ledger = Ledger.from_entries(entries)
+        self._ledger_mark = len(ledger)
+        self._file = open(self.path, 'ab')
+        return balance, ledger
+
+    def log(self, ledger, balance):
+        """Called after the ledger grew: commit once a full group is waiting."""
+        if len(ledger) - self._ledger_mark >= self.group_size:
+            self.commit(ledger, balance)
+
+    def commit(self, ledger, balance):
+        """
+        Write every ledger record not yet in the journal as one block and fsync.
+
+        Parameters:
+        ledger (Ledger): The account's ledger
+        balance (float): The account's balance after those records
+        """
+        with self._lock:
+            pending = ledger.entries[self._ledger_mark:]
+            if not len(pending):
+                return
+            payload = pending.tobytes()
+            self._file.write(BLOCK_HEADER.pack(BLOCK_MAGIC, len(pending), zlib.crc32(payload)))
+            self._file.write(payload)
+            self._file.flush()
+            self._sync(self._file)
+            self._ledger_mark += len(pending)
+            self.records += len(pending)
+            if self.records - self._last_snapshot >= self.snapshot_every:
+                self._write_snapshot(balance, self._file.tell())
+
+    def close(self, ledger=None, balance=None):
+        """Commit what is pending (when given the ledger), snapshot, and close the file."""
+        if self._file is None:
+            return
+        if ledger is not None:
+            self.commit(ledger, balance)
+            if self.records != self._last_snapshot:
+                self._write_snapshot(balance, self._file.tell())
+        self._file.close()
+        self._file = None
+
+
+def _scan(view, start, size):
+    """
+    Walk the blocks from `start`.
+
+    Returns:
+    tuple: ([(records offset, record count), ...] of the valid blocks, end of the last valid block)
+    """
+    blocks, position = [], start
+    while position + BLOCK_HEADER.size <= size:
+        magic, count, checksum = BLOCK_HEADER.unpack_from(view, position)
+        payload_start = position + BLOCK_HEADER.size
+        payload_end = payload_start + count * ENTRY_DTYPE.itemsize
+        if magic != BLOCK_MAGIC or payload_end > size:
+            break
+        with memoryview(view)[payload_start:payload_end] as payload:
+            if zlib.crc32(payload) != checksum:
+                break
+        blocks.append((payload_start, count))
+        position = payload_end
+    return blocks, position
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from week1.day1.day1_bank_account import BankAccount
+
+    print("DURABLE JOURNAL")
+    rng = np.random.default_rng(42)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'alice')
+        account = BankAccount("Alice", 1000, verbose=False, journal=Journal(path))
+        account.deposit(500)
+        account.withdraw(200)
+        account.close()
+        account = BankAccount("Alice", journal=Journal(path))
+        print(f"Reopened: balance ${account.balance}, history {account.transaction_history}")
+        account.close()
+
+        # One fsync per transaction vs one per group
+        print("\nDeposits one at a time:")
+        for group_size, count in ((1, 2000), (4096, 200_000)):
+            journal = Journal(os.path.join(directory, f'group_{group_size}'), group_size=group_size)
+            account = BankAccount("Test", 0, verbose=False, journal=journal)
+            start = time.perf_counter()
+            for amount in rng.uniform(1, 100, count).round(2):
+                account.deposit(amount)
+            account.close()
+            elapsed = time.perf_counter() - start
+            print(f"  group_size {group_size:>5}: {count / elapsed:>10,.0f} deposits/s ({journal.fsyncs} fsyncs)")
+
+        # A large ledger, written in batches
+        path = os.path.join(directory, 'large')
+        journal = Journal(path, group_size=65536)
+        account = BankAccount("Large", 0, verbose=False, journal=journal)
+        batch = rng.uniform(1, 100, 100_000).round(2)
+        start = time.perf_counter()
+        for _ in range(100):
+            account.deposit_many(batch)
+        account.close()
+        elapsed = time.perf_counter() - start
+        print(f"\n10,000,000 records in batches: {10_000_000 / elapsed:,.0f} records/s, "
+              f"{os.path.getsize(journal.path) / 2**20:.0f} MB, balance ${account.balance:,.2f}")
+
+        # Crash: two more deposits committed, then half a block written
+        account = BankAccount("Large", verbose=False, journal=Journal(path, load_history=False))
+        account.deposit_many([10.0, 20.0])
+        account.commit()
+        committed = account.balance
+        with open(account.journal.path, 'ab') as file:
+            file.write(BLOCK_HEADER.pack(BLOCK_MAGIC, 1000, 0) + b'\x00' * 100)
+
+        print(f"\nAfter a torn write (last commit: balance ${committed:,.2f}):")
+        for load_history in (False, True):
+            start = time.perf_counter()
+            account = BankAccount("Large", journal=Journal(path, load_history=load_history))
+            elapsed = time.perf_counter() - start
+            print(f"  restart with {'full history' if load_history else 'snapshot + tail'}: "
+                  f"{elapsed * 1000:7.1f} ms, {len(account.ledger):>10,} records loaded, "
+                  f"balance ${account.balance:,.2f}")
+            account.close()
@@ -0,0 +1,146 @@
+"""
+Day 1: Array-Backed Transaction Ledger
+A BankAccount's history as one typed NumPy array instead of a list of strings
+
+Every transaction is a fixed-size record (timestamp, amount, type, balance
+after), so a million transactions take 25 MB in one block instead of a
+million Python strings, and questions like "total withdrawn in March" are
+array operations. The array doubles its capacity when full (amortized O(1)
+appends, like a Python list).
+
+    ledger = Ledger()
+    ledger.append(now(), 500.0, DEPOSIT, 1500.0)
+    ledger.entries['balance']        # every balance, as a float64 view
+    ledger.to_frame()                # DataFrame for analysis
+"""
+
+import time
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Transaction type codes stored in the 'type' field
+DEPOSIT, WITHDRAWAL, TRANSFER_IN, TRANSFER_OUT = 0, 1, 2, 3
+TRANSACTION_TYPES = ('Deposit', 'Withdrawal', 'Transfer In', 'Transfer Out')
+SIGNS = ('+', '-', '+', '-')
+
+ENTRY_DTYPE = np.dtype([
+    ('timestamp', 'datetime64[ns]'),
+    ('amount', np.float64),
+    ('type', np.int8),
+    ('balance', np.float64),
+])
+
+
+def now():
+    """Current time as a nanosecond datetime64."""
+    return np.datetime64(time.time_ns(), 'ns')
+
+
+def format_amount(value):
+    """500.0 -> '500', 12.5 -> '12.5' (no exponent, no trailing zeros)."""
+    return np.format_float_positional(value, precision=2, trim='-')
+
+
+class Ledger:
+    """
+    Growable structured array of transactions.
+    """
+    __slots__ = ('_entries', '_size')
+
+    def __init__(self, capacity=1024):
+        """
+        Parameters:
+        capacity (int): Records allocated up front (grows by doubling)
+        """
+        self._entries = np.empty(max(int(capacity), 1), dtype=ENTRY_DTYPE)
+        self._size = 0
+
+    @classmethod
+    def from_entries(cls, entries, capacity=1024):
+        """A ledger holding a copy of existing records (e.g. read back from a journal)."""
+        ledger = cls(max(capacity, 2 * len(entries)))
+        ledger.extend(entries['timestamp'], entries['amount'], entries['type'], entries['balance'])
+        return ledger
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def entries(self):
+        """The recorded transactions (a view - do not modify)."""
+        return self._entries[:self._size]
+
+    def _reserve(self, count):
+        """Make room for `count` more records."""
+        needed = self._size + count
+        if needed > len(self._entries):
+            grown = np.empty(max(needed, 2 * len(self._entries)), dtype=ENTRY_DTYPE)
+            grown[:self._size] = self._entries[:self._size]
+            self._entries = grown
+
+    def append(self, timestamp, amount, kind, balance):
+        """Record one transaction."""
+        if self._size == len(self._entries):
+            self._reserve(1)
+        self._entries[self._size] = (timestamp, amount, kind, balance)
+        self._size += 1
+
+    def extend(self, timestamps, amounts, kind, balances):
+        """
+        Record many transactions at once.
+
+        Parameters:
+        timestamps (datetime64 or array): One time for all, or one per transaction
+        amounts (ndarray): Transaction amounts
+        kind (int or ndarray): Type code(s)
+        balances (ndarray): Balance after each transaction
+        """
+        count = len(amounts)
+        self._reserve(count)
+        block = self._entries[self._size:self._size + count]
+        block['timestamp'] = timestamps
+        block['amount'] = amounts
+        block['type'] = kind
+        block['balance'] = balances
+        self._size += count
+
+    def describe(self, index):
+        """One transaction as text, e.g. 'Deposit: +$500'."""
+        entry = self._entries[:self._size][index]
+        kind = entry['type']
+        return f"{TRANSACTION_TYPES[kind]}: {SIGNS[kind]}${format_amount(entry['amount'])}"
+
+    def to_frame(self):
+        """
+        Transactions as a DataFrame.
+
+        Returns:
+        DataFrame: Timestamp, Type, Amount and Balance columns
+        """
+        entries = self.entries
+        return pd.DataFrame({
+            'Timestamp': entries['timestamp'],
+            'Type': pd.Categorical.from_codes(entries['type'], TRANSACTION_TYPES),
+            'Amount': entries['amount'],
+            'Balance': entries['balance'],
+        })
+
+    def totals(self):
+        """
+        Sum and count of each transaction type.
+
+        Returns:
+        dict: {'Deposit': (count, total), 'Withdrawal': (count, total), ...}
+        """
+        entries = self.entries
+        counts = np.bincount(entries['type'], minlength=len(TRANSACTION_TYPES))
+        sums = np.bincount(entries['type'], weights=entries['amount'], minlength=len(TRANSACTION_TYPES))
+        return {name: (int(counts[code]), float(sums[code])) for code, name in enumerate(TRANSACTION_TYPES)}
+
+    @property
+    def nbytes(self):
+        return self._size * ENTRY_DTYPE.itemsize
@@ -0,0 +1 @@
+"""Day 2: Numerical derivatives and NumPy returns."""
@@ -0,0 +1 @@
+"""Day 3: Visualizing derivatives and real stock data."""
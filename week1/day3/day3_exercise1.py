@@ -3,21 +3,21 @@
 # Use visualize_derivative() from before
 # Try points: x = -1, x = 0, x = 1
 
-from day3_visualizing_derivatives import visualize_derivative
+from week1.day3.day3_visualizing_derivatives import visualize_derivative
 
 
-# Define the function f(x) = x^3
-def f(x):
-    return x**3
+if __name__ == "__main__":
+    # Define the function f(x) = x^3
+    def f(x):
+        return x**3
 
-# Define the derivative f'(x) = 3x^2
-def f_prime(x):
-    return 3*x**2
+    # Define the derivative f'(x) = 3x^2
+    def f_prime(x):
+        return 3*x**2
 
-# Visualize at different points
-tangent_x = [-1, 0, 1]
+    # Visualize at different points
+    tangent_x = [-1, 0, 1]
 
-for x in tangent_x:
-    print(f"\n\nVisualizing f(x) = x³ at x = {x}")
-    visualize_derivative(f, f_prime, x_range=(-2, 2), tangent_x=x)
-    
\ No newline at end of file
+    for x in tangent_x:
+        print(f"\n\nVisualizing f(x) = x³ at x = {x}")
+        visualize_derivative(f, f_prime, x_range=(-2, 2), tangent_x=x)
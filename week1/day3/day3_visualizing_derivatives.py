@@ -8,7 +8,10 @@ This code will show :
 3. The tangent line at a specific point
 """
 import numpy as np
-import matplotlib.pyplot as plt
+
+from week1.lazy_imports import lazy_import
+
+plt = lazy_import('matplotlib.pyplot')
 
 def visualize_derivative(f, f_prime, x_range, tangent_x):
     """
@@ -79,47 +82,47 @@ def visualize_derivative(f, f_prime, x_range, tangent_x):
     print(f"            at a rate of {abs(slope):.3f} units per unit of x")
     print("="*60)
 
-# EXAMPLE 1: f(x) = x²
-print("EXAMPLE 1: f(x) = x²")
-print("We know: f'(x) = 2x")
-
-def f1(x):
-    return x**2
 
-def f1_prime(x):
-    return 2*x
+if __name__ == "__main__":
+    # EXAMPLE 1: f(x) = x²
+    print("EXAMPLE 1: f(x) = x²")
+    print("We know: f'(x) = 2x")
 
-visualize_derivative(f1, f1_prime, x_range=(-3, 3), tangent_x=1)
+    def f1(x):
+        return x**2
 
-# EXAMPLE 2: f(x) = x³ - 3x
-print("\n\nEXAMPLE 2: f(x) = x³ - 3x")
-print("We know: f'(x) = 3x² - 3")
+    def f1_prime(x):
+        return 2*x
 
-def f2(x):
-    return x**3 - 3*x
+    visualize_derivative(f1, f1_prime, x_range=(-3, 3), tangent_x=1)
 
-def f2_prime(x):
-    return 3*x**2 - 3
+    # EXAMPLE 2: f(x) = x³ - 3x
+    print("\n\nEXAMPLE 2: f(x) = x³ - 3x")
+    print("We know: f'(x) = 3x² - 3")
 
-visualize_derivative(f2, f2_prime, x_range=(-2, 2), tangent_x=0)
+    def f2(x):
+        return x**3 - 3*x
 
-# FINANCIAL EXAMPLE: Stock price model
-print("\n\nFINANCIAL EXAMPLE: Stock Price P(t) = 100 + 10t - 0.5t²")
-print("This models a stock that initially rises, then slows down")
-print("Derivative P'(t) = 10 - t tells us the rate of price change")
+    def f2_prime(x):
+        return 3*x**2 - 3
 
-def stock_price(t):
-    return 100 + 10*t - 0.5*t**2
+    visualize_derivative(f2, f2_prime, x_range=(-2, 2), tangent_x=0)
 
-def stock_price_rate(t):
-    return 10 - t
+    # FINANCIAL EXAMPLE: Stock price model
+    print("\n\nFINANCIAL EXAMPLE: Stock Price P(t) = 100 + 10t - 0.5t²")
+    print("This models a stock that initially rises, then slows down")
+    print("Derivative P'(t) = 10 - t tells us the rate of price change")
 
-visualize_derivative(stock_price, stock_price_rate, x_range=(0, 25), tangent_x=10)
+    def stock_price(t):
+        return 100 + 10*t - 0.5*t**2
 
-print("\nNOTICE:")
-print("• When derivative > 0: Price is rising")
-print("• When derivative = 0: Price peaks (maximum)")
-print("• When derivative < 0: Price is falling")
-print("\nAt t=10 days, derivative = 0, so price is at maximum!")
+    def stock_price_rate(t):
+        return 10 - t
 
+    visualize_derivative(stock_price, stock_price_rate, x_range=(0, 25), tangent_x=10)
 
+    print("\nNOTICE:")
+    print("• When derivative > 0: Price is rising")
+    print("• When derivative = 0: Price peaks (maximum)")
+    print("• When derivative < 0: Price is falling")
+    print("\nAt t=10 days, derivative = 0, so price is at maximum!")
@@ -0,0 +1,268 @@
+"""
+Day 3: Many Moving Averages for Many Tickers
+Every SMA window and EMA span of a whole universe, in a handful of array passes
+
+- SMA: one cumulative sum per ticker serves every window:
+      SMA_w(t) = (C(t) - C(t - w)) / w,   C(t) = x(1) + ... + x(t)
+  (prices are centred on their mean first, so C stays small and the
+  difference doesn't lose digits on long histories)
+- EMA: y(t) = (1 - α) y(t - 1) + α x(t),  α = 2 / (span + 1)
+  is a recursion, but over a block of k bars it unrolls to
+      y(t0 + k) = β^k [β y(t0 - 1) + α Σ_j β^-j x(t0 + j)],   β = 1 - α
+  - a cumulative sum again. Blocks are short enough that β^-j stays far
+  from overflow. Across a universe one bar per step is already a vector of
+  spans x tickers; for a few long series the blocks save the Python loop
+  over bars. A missing bar repeats the last
+  price for the EMA; an SMA is NaN until its window holds `w` prices.
+
+Results are ONE float32 array of shape (averages, bars, tickers), labelled
+'SMA 5', ..., 'EMA 200'. The engine keeps the last bars and EMA values, so
+new bars are added with update() without recomputing the history.
+
+    engine = MovingAverageEngine(sma_windows=(5, 20, 50, 200), ema_spans=(12, 26))
+    averages = engine.compute(prices)        # (6, bars, tickers)
+    latest = engine.update(new_bars)         # (6, new bars, tickers)
+"""
+
+import warnings
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Largest β^-j inside an EMA block (keeps 12+ significant digits to spare)
+MAX_BLOCK_GROWTH = 1e12
+# Spans x tickers from which one bar per step is already a large enough vector
+VECTOR_STEP_SIZE = 2048
+
+
+def rolling_means(values, windows, out=None):
+    """
+    Simple moving averages for several windows from one cumulative sum.
+
+    Parameters:
+    values (ndarray): Bars x tickers; NaN = no price
+    windows (list): Window lengths in bars
+    out (ndarray): Where to write, (windows, bars, tickers) of any float type
+
+    Returns:
+    ndarray: (windows, bars, tickers); NaN until a window holds `w` prices
+    """
+    valid = np.isfinite(values)
+    gaps = not valid.all()
+    if gaps:
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # tickers with no price at all
+            centre = np.nan_to_num(np.nanmean(values, axis=0))
+    else:
+        centre = values.mean(axis=0) if len(values) else 0
+    sums = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.subtract(values, centre, out=sums[1:])
+    if gaps:
+        sums[1:][~valid] = 0
+        counts = np.zeros(sums.shape, dtype=np.int64)
+        np.cumsum(valid, axis=0, out=counts[1:])
+    np.cumsum(sums[1:], axis=0, out=sums[1:])
+
+    means = np.empty((len(windows),) + values.shape) if out is None else out
+    for i, window in enumerate(windows):
+        means[i, :window - 1] = np.nan
+        if window > len(values):
+            continue
+        mean = means[i, window - 1:]
+        np.subtract(sums[window:], sums[:-window], out=mean, casting='same_kind')
+        mean /= window
+        mean += centre
+        if gaps:
+            mean[counts[window:] - counts[:-window] < window] = np.nan
+    return means
+
+
+def exponential_means(values, spans, previous, out=None):
+    """
+    EMAs (pandas ewm(span, adjust=False)) for several spans.
+
+    With many spans x tickers each bar is one vector step over all of them;
+    with few (one long series), a block of bars per step.
+
+    Parameters:
+    values (ndarray): Bars x tickers, no NaN
+    spans (ndarray): EMA spans
+    previous (ndarray): EMA before the first bar, (spans, tickers) - the first
+                        price for a fresh start
+    out (ndarray): Where to write, (spans, bars, tickers) of any float type
+
+    Returns:
+    tuple: ((spans, bars, tickers) EMAs, float64 EMA after the last bar (spans, tickers))
+    """
+    alpha = 2 / (np.asarray(spans, dtype=float) + 1)[:, None]
+    beta = 1 - alpha
+    means = np.empty((len(alpha),) + values.shape) if out is None else out
+    state = np.array(previous, dtype=float)
+
+    # span 1 (β = 0) is the price itself and has no β^-j to unroll with
+    if state.size >= VECTOR_STEP_SIZE or not beta.min() > 0:
+        for t, x in enumerate(values):
+            state += alpha * (x - state)
+            means[:, t] = state
+        return means, state
+
+    block = max(1, int(np.log(MAX_BLOCK_GROWTH) / -np.log(beta.min())))
+    steps = np.arange(block)
+    powers, inverse_powers = beta ** steps, beta ** -steps  # (spans, block)
+    for start in range(0, len(values), block):
+        x = values[start:start + block]
+        size = len(x)
+        sums = np.cumsum(inverse_powers[:, :size, None] * x, axis=1)  # (spans, size, tickers)
+        block_means = powers[:, :size, None] * ((beta * state)[:, None] + alpha[:, None] * sums)
+        means[:, start:start + size] = block_means
+        state = block_means[:, -1]
+    return means, state
+
+
+def _carry_forward(values, last=None):
+    """
+    Fill missing bars with the previous price (or `last`, the price before the
+    first bar); bars before a ticker's first price get that first price.
+    """
+    valid = np.isfinite(values)
+    rows = np.where(valid, np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = np.take_along_axis(values, rows, axis=0)
+    gaps = ~np.isfinite(filled)
+    if last is not None:
+        filled = np.where(gaps, last, filled)
+        gaps = ~np.isfinite(filled)
+    if gaps.any():
+        first = np.take_along_axis(values, valid.argmax(axis=0)[None], axis=0)
+        filled = np.where(gaps, first, filled)
+    return filled
+
+
+class MovingAverageEngine:
+    """
+    SMA and EMA for many windows and tickers, with incremental updates.
+    """
+
+    def __init__(self, sma_windows=(5, 10, 20, 50, 100, 200), ema_spans=(5, 12, 26, 50, 100, 200),
+                 dtype=np.float32):
+        """
+        Parameters:
+        sma_windows (tuple): SMA lengths in bars
+        ema_spans (tuple): EMA spans in bars (α = 2 / (span + 1))
+        dtype (type): Result type (float32 halves the memory; states stay float64)
+        """
+        if min(tuple(sma_windows) + tuple(ema_spans), default=1) < 1:
+            raise ValueError("Windows and spans must be at least 1 bar")
+        self.sma_windows = list(sma_windows)
+        self.ema_spans = list(ema_spans)
+        self.dtype = dtype
+        self.labels = [f'SMA {w}' for w in self.sma_windows] + [f'EMA {s}' for s in self.ema_spans]
+        self.columns = None
+        self._history = None    # last max(sma_windows) - 1 bars
+        self._ema = None        # EMA after the last bar, (spans, tickers)
+        self._last = None       # last known price per ticker
+
+    def _as_values(self, prices):
+        values = np.array(prices, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        return values
+
+    def _run(self, values, history, ema, last):
+        """Averages of `values` given the state before them; updates the state."""
+        averages = np.empty((len(self.labels),) + values.shape, dtype=self.dtype)
+        keep = max(self.sma_windows, default=1) - 1
+        if self.sma_windows:
+            combined = values if history is None else np.concatenate([history, values])
+            if history is None:
+                rolling_means(combined, self.sma_windows, out=averages[:len(self.sma_windows)])
+            else:
+                averages[:len(self.sma_windows)] = rolling_means(combined, self.sma_windows)[:, len(history):]
+            self._history = combined[len(combined) - keep:] if keep else combined[:0]
+        filled = _carry_forward(values, last)
+        if self.ema_spans:
+            # Fresh start (or a ticker's first price): the EMA starts at the first price
+            first = np.broadcast_to(filled[0], (len(self.ema_spans),) + filled.shape[1:])
+            start = first if ema is None else np.where(np.isfinite(ema), ema, first)
+            means, self._ema = exponential_means(filled, self.ema_spans, start,
+                                                 out=averages[len(self.sma_windows):])
+            # No average before a ticker's first price
+            never_priced = np.ones(filled.shape[1:], dtype=bool) if last is None else ~np.isfinite(last)
+            means[:, never_priced & (np.cumsum(np.isfinite(values), axis=0) == 0)] = np.nan
+        self._last = filled[-1]
+        return averages
+
+    def compute(self, prices):
+        """
+        Every average over a full history (resets the engine's state).
+
+        Parameters:
+        prices (DataFrame or ndarray): Bars x tickers (or one series)
+
+        Returns:
+        ndarray: (len(labels), bars, tickers) in self.dtype
+        """
+        self.columns = getattr(prices, 'columns', None)
+        return self._run(self._as_values(prices), None, None, None)
+
+    def update(self, new_prices):
+        """
+        Averages for bars that arrived after the last compute/update, continuing
+        from the stored state - same numbers as recomputing the whole history.
+
+        Parameters:
+        new_prices (DataFrame or ndarray): New bars x tickers, same tickers in the same order
+
+        Returns:
+        ndarray: (len(labels), new bars, tickers)
+        """
+        if self._last is None:
+            raise ValueError("Call compute() with the history before update()")
+        values = self._as_values(new_prices)
+        if values.shape[1:] != self._last.shape:
+            raise ValueError(f"Expected {self._last.shape[0]} tickers, got {values.shape[1]}")
+        return self._run(values, self._history, self._ema, self._last)
+
+    def frame(self, averages, label, index=None):
+        """One average (e.g. 'SMA 50') from a result array as a DataFrame."""
+        return pd.DataFrame(averages[self.labels.index(label)], index=index, columns=self.columns)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("MOVING AVERAGES: 12 AVERAGES x 2,520 DAYS x 3,000 TICKERS")
+    rng = np.random.default_rng(42)
+    days = pd.bdate_range('2015-01-01', periods=2520)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (2520, 3000)), axis=0)),
+                          index=days, columns=[f'S{i:04d}' for i in range(3000)])
+
+    engine = MovingAverageEngine()
+    start = time.perf_counter()
+    averages = engine.compute(prices.iloc[:-5])
+    elapsed = time.perf_counter() - start
+    print(f"Engine: {elapsed:.2f}s, result {averages.shape} {averages.dtype}, {averages.nbytes / 2**20:.0f} MB")
+
+    start = time.perf_counter()
+    for window in engine.sma_windows:
+        prices.iloc[:-5].rolling(window).mean()
+    for span in engine.ema_spans:
+        prices.iloc[:-5].ewm(span=span, adjust=False).mean()
+    print(f"pandas rolling/ewm one average at a time: {time.perf_counter() - start:.2f}s")
+
+    # Five new days arrive
+    start = time.perf_counter()
+    latest = engine.update(prices.iloc[-5:])
+    print(f"update() with 5 new bars: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # float32 keeps ~7 significant digits: compare relative differences
+    full = MovingAverageEngine().compute(prices)
+    print(f"Largest relative difference update vs full recompute: "
+          f"{np.nanmax(np.abs(latest / full[:, -5:] - 1)):.1e}")
+    reference = {'SMA 200': prices.rolling(200).mean(), 'EMA 26': prices.ewm(span=26, adjust=False).mean()}
+    for label, expected in reference.items():
+        relative = (engine.frame(full, label, prices.index) / expected - 1).abs().to_numpy()
+        print(f"Largest relative difference {label} vs pandas: {np.nanmax(relative):.1e}")
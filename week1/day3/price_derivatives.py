@@ -0,0 +1,307 @@
+"""
+Day 3: Smoothed Derivatives of Price Series
+Velocity and acceleration of real prices - without the noise of pct_change
+
+A price series is a noisy SAMPLE of a function, and a finite difference of
+noise is mostly noise (the second difference even more so). Both methods
+here fit something smooth first and differentiate that:
+
+- Savitzky-Golay: fit a polynomial of degree `polyorder` to the `window`
+  points around each date (least squares) and take its derivatives there.
+  The fit depends only on the timestamps, so the weights are computed ONCE
+  and applied to every ticker's windows in one batched matrix product.
+- Regularized (Whittaker): the smoothest curve z close to the prices,
+
+      minimize  |y - z|² + λ |D z|²      (D = divided differences of order `order`)
+
+  solved with a banded Cholesky factorization shared by all tickers, then
+  differentiated. `cutoff` sets λ: swings shorter than about `cutoff` time
+  units are smoothed away.
+
+Timestamps may be irregular (weekends, holidays, missing bars): the fits use
+the actual times. Gaps inside a ticker's history are interpolated for the
+fit and are NaN again in the results.
+
+    level, velocity, acceleration = savgol_derivatives(prices, window=21, log=True)
+"""
+
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+def _times(prices, times):
+    """Sample times as increasing floats: given, from a DatetimeIndex (in days), or 0, 1, 2, ..."""
+    if times is None:
+        index = getattr(prices, 'index', None)
+        if index is not None and np.issubdtype(np.asarray(index).dtype, np.datetime64):
+            times = index
+        else:
+            return np.arange(len(prices), dtype=float)
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        times = (times - times[0]) / np.timedelta64(1, 'D')
+    times = times.astype(float)
+    if len(times) != len(prices):
+        raise ValueError(f"{len(times)} timestamps for {len(prices)} prices")
+    if np.any(np.diff(times) <= 0):
+        raise ValueError("Timestamps must be strictly increasing")
+    return times
+
+
+def _prepare(prices, times, log):
+    """(values as (samples, tickers) floats with gaps filled, missing mask, times, 1-D input?)"""
+    values = np.array(prices, dtype=float)
+    one_dimensional = values.ndim == 1
+    values = values.reshape(len(values), -1)
+    if log:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.log(values)
+    times = _times(prices, times)
+
+    missing = ~np.isfinite(values)
+    for column in np.flatnonzero(missing.any(axis=0)):
+        valid = ~missing[:, column]
+        if valid.any():
+            # Linear in time between observations, held flat before/after
+            values[:, column] = np.interp(times, times[valid], values[valid, column])
+    return values, missing, times, one_dimensional
+
+
+def _finish(prices, outputs, missing, one_dimensional, log):
+    """Mask the filled gaps and return in the input's shape/type."""
+    level, first, second = outputs
+    if log:
+        level = np.exp(level)
+    results = []
+    for values in (level, first, second):
+        values[missing] = np.nan
+        if one_dimensional:
+            values = values[:, 0]
+        if isinstance(prices, pd.DataFrame):
+            values = pd.DataFrame(values, index=prices.index, columns=prices.columns)
+        elif isinstance(prices, pd.Series):
+            values = pd.Series(values, index=prices.index, name=prices.name)
+        results.append(values)
+    return tuple(results)
+
+
+def savgol_weights(times, window=21, polyorder=3, max_deriv=2):
+    """
+    Local least-squares polynomial weights for (possibly irregular) sample times.
+
+    Parameters:
+    times (ndarray): Increasing sample times
+    window (int): Points per fit (odd)
+    polyorder (int): Degree of the fitted polynomial (< window)
+    max_deriv (int): Highest derivative wanted
+
+    Returns:
+    tuple: (starts, weights) - the fit for sample i uses samples starts[i] ...
+           starts[i] + window - 1, and derivative d at sample i is
+           weights[d, i] @ values[starts[i]:starts[i] + window]
+    """
+    n = len(times)
+    if window % 2 == 0 or window <= polyorder or polyorder < max_deriv:
+        raise ValueError("window must be odd and larger than polyorder, and polyorder >= max_deriv")
+    if window > n:
+        raise ValueError(f"window ({window}) is longer than the series ({n})")
+
+    # Windows are centred, shifted inwards at the ends (the end points are
+    # evaluated off-centre instead of padding the series)
+    starts = np.clip(np.arange(n) - window // 2, 0, n - window)
+    positions = starts[:, None] + np.arange(window)
+    offsets = times[positions] - times[:, None]
+    scale = (times[starts + window - 1] - times[starts]) / 2  # keeps the powers near 1
+    vandermonde = (offsets / scale[:, None])[..., None] ** np.arange(polyorder + 1)
+    fits = np.linalg.pinv(vandermonde)  # (n, polyorder + 1, window): data -> coefficients
+
+    # p(t) = Σ c_k ((t - t_i) / scale)^k, so d-th derivative at t_i = d! c_d / scale^d
+    weights = np.stack([fits[:, d] * (math.factorial(d) / scale[:, None] ** d) for d in range(max_deriv + 1)])
+    return starts, weights
+
+
+def savgol_derivatives(prices, window=21, polyorder=3, times=None, log=False):
+    """
+    Smoothed level, first and second derivative with Savitzky-Golay fits.
+
+    Parameters:
+    prices (DataFrame, Series or ndarray): Samples x tickers (or one series)
+    window (int): Points per local fit (odd); larger = smoother
+    polyorder (int): Degree of the local polynomial (>= 2)
+    times (array-like): Sample times (default: the DatetimeIndex in days, else 0, 1, 2, ...)
+    log (bool): Differentiate log prices - velocity is then a return per time unit
+
+    Returns:
+    tuple: (level, velocity, acceleration), each shaped and typed like prices;
+           derivatives are per time unit of `times`
+    """
+    values, missing, times, one_dimensional = _prepare(prices, times, log)
+    _, weights = savgol_weights(times, window, polyorder)
+    n, half = len(values), window // 2
+
+    # Every window of every ticker, as a strided view (no copy): (n - window + 1, tickers, window)
+    windows = sliding_window_view(values, window, axis=0)
+    outputs = np.empty((3,) + values.shape)
+    # Sample i in the middle uses window i - half: one batched matrix product
+    outputs[:, half:n - half] = np.matmul(windows, weights[:, half:n - half].transpose(1, 2, 0)).transpose(2, 0, 1)
+    # The first and last `half` samples use the first and last window
+    outputs[:, :half] = np.einsum('diw,tw->dit', weights[:, :half], windows[0])
+    outputs[:, n - half:] = np.einsum('diw,tw->dit', weights[:, n - half:], windows[-1])
+    return _finish(prices, list(outputs), missing, one_dimensional, log)
+
+
+def difference_matrix(times, order):
+    """
+    Divided differences of `order` as coefficient rows: row i, times d!, estimates
+    the order-th derivative from samples i ... i + order.
+
+    Returns:
+    ndarray: Shape (n - order, order + 1)
+    """
+    n = len(times)
+    nodes = times[np.arange(n - order)[:, None] + np.arange(order + 1)]
+    coefficients = np.empty((n - order, order + 1))
+    for j in range(order + 1):
+        others = np.delete(nodes, j, axis=1)
+        coefficients[:, j] = 1 / np.prod(nodes[:, [j]] - others, axis=1)
+    return coefficients * math.factorial(order)
+
+
+def _banded_cholesky(bands):
+    """
+    Cholesky factor of a symmetric positive definite banded matrix.
+
+    Parameters:
+    bands (ndarray): bands[k, i] = M[i, i + k] for k = 0 ... b
+
+    Returns:
+    ndarray: lower[i, k] = L[i, i - k] with M = L Lᵀ
+    """
+    b, n = len(bands) - 1, bands.shape[1]
+    lower = np.zeros((n, b + 1))
+    rows = lower.tolist()  # plain floats: this loop is scalar work
+    for i in range(n):
+        row = rows[i]
+        for k in range(min(b, i), 0, -1):
+            j = i - k
+            # L[i, j] = (M[j, i] - Σ_p L[i, p] L[j, p]) / L[j, j], p from i - b to j - 1
+            total = bands[k, j]
+            for p_offset in range(k + 1, b + 1):  # p = i - p_offset
+                if i - p_offset < 0:
+                    break
+                total -= row[p_offset] * rows[j][p_offset - k]
+            row[k] = total / rows[j][0]
+        row[0] = math.sqrt(bands[0, i] - sum(value * value for value in row[1:]))
+    return np.array(rows)
+
+
+def _banded_solve(lower, right):
+    """Solve L Lᵀ z = right for every column of right (samples x tickers)."""
+    n, b = len(lower), lower.shape[1] - 1
+    forward = np.empty_like(right)
+    for i in range(n):
+        total = right[i].copy()
+        for k in range(1, min(b, i) + 1):
+            total -= lower[i, k] * forward[i - k]
+        forward[i] = total / lower[i, 0]
+    solution = np.empty_like(right)
+    for i in range(n - 1, -1, -1):
+        total = forward[i].copy()
+        for k in range(1, min(b, n - 1 - i) + 1):
+            total -= lower[i + k, k] * solution[i + k]
+        solution[i] = total / lower[i, 0]
+    return solution
+
+
+def whittaker_smooth(values, times, cutoff=21, order=3):
+    """
+    Whittaker smoother on (possibly irregular) times, for all columns at once.
+
+    Parameters:
+    values (ndarray): Samples x tickers, no NaN
+    times (ndarray): Increasing sample times
+    cutoff (float): Swings shorter than about this many time units are removed
+    order (int): Order of the penalized differences (3: smooth up to the 2nd derivative)
+
+    Returns:
+    ndarray: Smoothed values, same shape
+    """
+    n = len(values)
+    if n <= order:
+        raise ValueError(f"Need more than {order} samples")
+    # Response 1 / (1 + λ ω^(2 order)) is one half at the cutoff frequency ω = 2π / cutoff
+    penalty = (cutoff / (2 * np.pi)) ** (2 * order)
+
+    # M = I + λ DᵀD, stored by diagonals
+    coefficients = difference_matrix(times, order)
+    bands = np.zeros((order + 1, n))
+    bands[0] = 1
+    for k in range(order + 1):
+        for j in range(order + 1 - k):
+            bands[k, j:j + n - order] += penalty * coefficients[:, j] * coefficients[:, j + k]
+    return _banded_solve(_banded_cholesky(bands), values)
+
+
+def regularized_derivatives(prices, cutoff=21, order=3, times=None, log=False):
+    """
+    Smoothed level, first and second derivative from the Whittaker smoother.
+
+    Parameters:
+    prices (DataFrame, Series or ndarray): Samples x tickers (or one series)
+    cutoff (float): Swings shorter than about this many time units are smoothed away
+    order (int): Penalized derivative order (>= 3 keeps the acceleration smooth)
+    times (array-like): Sample times (default: the DatetimeIndex in days, else 0, 1, 2, ...)
+    log (bool): Differentiate log prices - velocity is then a return per time unit
+
+    Returns:
+    tuple: (level, velocity, acceleration), each shaped and typed like prices
+    """
+    values, missing, times, one_dimensional = _prepare(prices, times, log)
+    level = whittaker_smooth(values, times, cutoff, order)
+    velocity = np.gradient(level, times, axis=0)
+    acceleration = np.gradient(velocity, times, axis=0)
+    return _finish(prices, [level, velocity, acceleration], missing, one_dimensional, log)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("DERIVATIVES OF NOISY PRICES WITH KNOWN TRUE VELOCITY")
+    rng = np.random.default_rng(42)
+
+    # Irregular sampling: ~2 years of days with random missing days
+    times = np.sort(rng.choice(np.arange(730), 500, replace=False)).astype(float)
+    true_log_price = np.log(100) + 0.2 * np.sin(2 * np.pi * times / 180) + 0.0005 * times
+    true_velocity = 0.2 * 2 * np.pi / 180 * np.cos(2 * np.pi * times / 180) + 0.0005
+    true_acceleration = -0.2 * (2 * np.pi / 180) ** 2 * np.sin(2 * np.pi * times / 180)
+    prices = np.exp(true_log_price + rng.normal(0, 0.01, len(times)))
+
+    raw_velocity = np.gradient(np.log(prices), times)
+    raw_acceleration = np.gradient(raw_velocity, times)
+    estimates = {
+        'finite difference': (raw_velocity, raw_acceleration),
+        'savitzky-golay': savgol_derivatives(prices, window=31, times=times, log=True)[1:],
+        'regularized': regularized_derivatives(prices, cutoff=60, times=times, log=True)[1:],
+    }
+    print(f"{'Method':<18} {'Velocity RMSE':>14} {'Acceleration RMSE':>18}")
+    for name, (velocity, acceleration) in estimates.items():
+        print(f"{name:<18} {np.sqrt(np.mean((velocity - true_velocity) ** 2)):14.6f} "
+              f"{np.sqrt(np.mean((acceleration - true_acceleration) ** 2)):18.8f}")
+
+    print("\nWHOLE UNIVERSE: 2,520 business days x 2,000 tickers")
+    days = pd.bdate_range('2015-01-01', periods=2520)
+    universe = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (2520, 2000)), axis=0)),
+                            index=days, columns=[f'S{i:04d}' for i in range(2000)])
+    universe.iloc[100:110, :50] = np.nan  # a trading halt
+    for name, function, options in (('savitzky-golay', savgol_derivatives, {'window': 21}),
+                                     ('regularized', regularized_derivatives, {'cutoff': 30})):
+        start = time.perf_counter()
+        level, velocity, acceleration = function(universe, log=True, **options)
+        print(f"  {name:<15} {time.perf_counter() - start:5.2f}s  (velocity per calendar day, "
+              f"{int(velocity.isna().sum().sum())} NaN from the halt)")
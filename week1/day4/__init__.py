@@ -0,0 +1 @@
+"""Day 4: Multi-stock analysis, chain rule and stock comparison."""
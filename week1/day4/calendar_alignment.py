@@ -0,0 +1,156 @@
+"""
+Day 4: Trading-Calendar Alignment
+Line up many tickers ONCE instead of pd.concat(...).dropna() on every call
+
+Different stocks don't always trade on the same days (listings, halts,
+different exchanges). dropna() on the joined table throws away a whole
+day for EVERY ticker when just one is missing. Instead:
+- build the union of all trading days once
+- keep one True/False validity mask per ticker
+- compute each statistic on the days that are valid for the tickers involved
+"""
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+class AlignedPanel:
+    """
+    Prices and returns of many tickers on one shared (union) calendar,
+    with validity masks so missing days are skipped instead of dropped.
+    """
+
+    def __init__(self, calendar, tickers, prices):
+        """
+        Parameters:
+        calendar (DatetimeIndex): Sorted union of all trading days
+        tickers (list): Column labels
+        prices (ndarray): Shape (days, tickers), NaN where a ticker has no price
+        """
+        self.calendar = calendar
+        self.tickers = list(tickers)
+        self.prices = np.asarray(prices, dtype=float)
+        self.price_valid = np.isfinite(self.prices)
+        self._column = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+        # Each ticker's return is measured against ITS previous valid price,
+        # so a day missing for one stock doesn't create a gap for the others
+        last_price = pd.DataFrame(self.prices).ffill().to_numpy()
+        previous = np.vstack([np.full((1, len(self.tickers)), np.nan), last_price[:-1]])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.returns = self.prices / previous - 1
+        self.valid = np.isfinite(self.returns)
+        self.returns[~self.valid] = np.nan
+
+    @classmethod
+    def from_frame(cls, prices):
+        """Build from a DataFrame of prices that may contain NaN (one column per ticker)."""
+        prices = prices.sort_index()
+        return cls(pd.DatetimeIndex(prices.index), prices.columns, prices.to_numpy(dtype=float))
+
+    @classmethod
+    def from_series(cls, series_by_ticker):
+        """
+        Build from separately downloaded price series, e.g. {'AAPL': close1, 'MSFT': close2}.
+        Each series is placed on the union calendar with searchsorted - no concat.
+        """
+        series_by_ticker = {ticker: (s.squeeze(axis=1) if isinstance(s, pd.DataFrame) else s).dropna()
+                            for ticker, s in series_by_ticker.items()}
+        calendar = pd.DatetimeIndex(np.unique(np.concatenate(
+            [pd.DatetimeIndex(s.index).to_numpy() for s in series_by_ticker.values()])))
+
+        prices = np.full((len(calendar), len(series_by_ticker)), np.nan)
+        for column, series in enumerate(series_by_ticker.values()):
+            rows = calendar.searchsorted(pd.DatetimeIndex(series.index))
+            prices[rows, column] = series.to_numpy(dtype=float)
+        return cls(calendar, series_by_ticker.keys(), prices)
+
+    def _columns(self, tickers):
+        if tickers is None:
+            return list(range(len(self.tickers))), self.tickers
+        return [self._column[t] for t in tickers], list(tickers)
+
+    def returns_frame(self, tickers=None):
+        """Returns on the union calendar, NaN where a ticker has no return that day."""
+        columns, labels = self._columns(tickers)
+        any_valid = self.valid[:, columns].any(axis=1)
+        return pd.DataFrame(self.returns[np.ix_(any_valid, columns)],
+                            index=self.calendar[any_valid], columns=labels)
+
+    def aligned_returns(self, tickers=None):
+        """Returns only on days where ALL the given tickers are valid (inner join)."""
+        columns, labels = self._columns(tickers)
+        rows = self.valid[:, columns].all(axis=1)
+        return pd.DataFrame(self.returns[np.ix_(rows, columns)], index=self.calendar[rows], columns=labels)
+
+    def coverage(self):
+        """Fraction of union-calendar days on which each ticker has a return."""
+        return pd.Series(self.valid[1:].mean(axis=0), index=self.tickers)
+
+    def total_returns(self):
+        """First valid price to last valid price, per ticker."""
+        first = pd.DataFrame(self.prices).bfill().to_numpy()[0]
+        last = pd.DataFrame(self.prices).ffill().to_numpy()[-1]
+        return pd.Series(last / first - 1, index=self.tickers)
+
+    def normalized_prices(self, base=100):
+        """Prices divided by each ticker's FIRST VALID price (NaN gaps stay NaN)."""
+        first = pd.DataFrame(self.prices).bfill().to_numpy()[0]
+        return pd.DataFrame(self.prices / first * base, index=self.calendar, columns=self.tickers)
+
+    def pairwise_corr(self, tickers=None, min_periods=2):
+        """
+        Correlation of every pair using the days BOTH are valid (pairwise complete),
+        like DataFrame.corr() but computed with a few matrix products.
+
+        For a pair (i, j) with n common days:
+            cov = (Σxy - Σx Σy / n) / (n - 1)
+        where every sum only runs over rows valid for both - zero-filling the
+        returns and multiplying by the 0/1 masks does exactly that.
+        """
+        columns, labels = self._columns(tickers)
+        mask = self.valid[:, columns].astype(float)
+        x = np.where(self.valid[:, columns], self.returns[:, columns], 0.0)
+
+        n = mask.T @ mask                   # common days for each pair
+        sum_x = x.T @ mask                  # Σx_i over days where j is valid too
+        sum_xx = (x * x).T @ mask
+        sum_xy = x.T @ x
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = (sum_xy - sum_x * sum_x.T / n) / (n - 1)
+            var_i = (sum_xx - sum_x ** 2 / n) / (n - 1)
+            corr = cov / np.sqrt(var_i * var_i.T)
+        corr[n < min_periods] = np.nan
+        np.fill_diagonal(corr, np.where(np.diag(n) >= min_periods, 1.0, np.nan))
+        return pd.DataFrame(np.clip(corr, -1, 1), index=labels, columns=labels)
+
+
+if __name__ == "__main__":
+    print("ALIGNING 3 TICKERS WITH DIFFERENT TRADING DAYS")
+
+    rng = np.random.default_rng(42)
+    days = pd.bdate_range('2023-01-02', periods=250)
+    prices = {}
+    for ticker in ['AAPL', 'MSFT', 'NEWCO']:
+        values = pd.Series(100 * np.cumprod(1 + rng.normal(0.0005, 0.015, len(days))), index=days)
+        prices[ticker] = values
+    prices['MSFT'] = prices['MSFT'].drop(days[rng.choice(250, 20, replace=False)])  # 20 random halts
+    prices['NEWCO'] = prices['NEWCO'].iloc[100:]                                     # listed later
+
+    panel = AlignedPanel.from_series(prices)
+    print(f"\nUnion calendar: {len(panel.calendar)} days")
+    print("Coverage:")
+    print(panel.coverage().round(3).to_string())
+
+    joined = pd.concat(prices, axis=1).pct_change(fill_method=None).dropna()
+    print(f"\nconcat + dropna keeps {len(joined)} days for every pair")
+    print(f"AAPL/MSFT pairwise-complete correlation uses "
+          f"{panel.valid[:, 0].astype(int) @ panel.valid[:, 1]} days")
+    print("\nPairwise-complete correlation:")
+    print(panel.pairwise_corr().round(3).to_string())
+    print("\nMatches pandas DataFrame.corr():",
+          np.allclose(panel.pairwise_corr().values, panel.returns_frame().corr().values))
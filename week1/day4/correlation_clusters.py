@@ -0,0 +1,280 @@
+"""
+Day 4: Hierarchical Clusters of a Universe
+Groups of stocks that move together, from 5 tickers to 5,000
+
+- SMALL universes: average linkage on the correlation distance
+  sqrt(2 (1 - ρ)) of the full correlation matrix.
+- LARGE universes never build the N x N matrix. Each ticker's k most
+  correlated tickers (a k-nearest-neighbour graph, found chunk by chunk from
+  the standardized returns) say WHICH clusters may merge; how close two
+  clusters are is their exact mean correlation, from the cluster sums of z:
+
+      mean corr(I, J) = (Σ_{i∈I} z_i) · (Σ_{j∈J} z_j) / ((T - 1) |I| |J|)
+
+  so a merge only adds two sums. Memory is (days x tickers) + (tickers x k).
+  Groups the graph never connects are joined at the end by the same formula.
+
+    clusters = CorrelationClusters.from_returns(returns)
+    clusters.labels(6)            # ticker -> one of 6 clusters
+    clusters.order                # leaf order, for plot_correlation_heatmap(order=...)
+"""
+
+import heapq
+
+import numpy as np
+
+from week1.day4.correlation_heatmap import average_linkage, correlation_distance, leaf_order, standardize
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+def knn_graph(z, k=10, chunk_size=1000):
+    """
+    The k most correlated other tickers of every ticker.
+
+    Parameters:
+    z (ndarray): Standardized returns from standardize(), (days, tickers)
+    k (int): Neighbours per ticker
+    chunk_size (int): Tickers correlated with the universe per step
+
+    Returns:
+    ndarray: (tickers, k) positions of the neighbours
+    """
+    num_tickers = z.shape[1]
+    k = min(k, num_tickers - 1)
+    neighbours = np.empty((num_tickers, k), dtype=np.int64)
+    for start in range(0, num_tickers, chunk_size):
+        block = z[:, start:start + chunk_size].T @ z  # (chunk, tickers), only the order matters
+        rows = np.arange(len(block))
+        block[rows, start + rows] = -np.inf
+        neighbours[start:start + len(block)] = np.argpartition(block, -k, axis=1)[:, -k:]
+    return neighbours
+
+
+def sparse_average_linkage(z, k=10, chunk_size=1000):
+    """
+    Average-linkage clustering on the mean correlation between clusters,
+    merging only clusters joined by the k-nearest-neighbour graph.
+
+    Parameters:
+    z (ndarray): Standardized returns from standardize(), (days, tickers)
+    k (int): Neighbours per ticker in the graph
+    chunk_size (int): Tickers per step when building the graph
+
+    Returns:
+    ndarray: (N - 1, 4) merges like average_linkage - (cluster a, cluster b,
+             correlation distance of their mean correlation, size)
+    """
+    num_tickers = z.shape[1]
+    merges = []
+    if num_tickers < 2:
+        return np.empty((0, 4))
+    scale = 1 / max(len(z) - 1, 1)
+    sums = z.T.astype(np.float64)  # row r: Σz of the cluster stored in row r
+    size = np.ones(num_tickers)
+    label = np.arange(num_tickers)
+    version = np.zeros(num_tickers, dtype=np.int64)  # bumped on every merge into the row
+    active = np.ones(num_tickers, dtype=bool)
+
+    def distances(row, others):
+        """Squared correlation distance 2 (1 - mean corr) from cluster `row` to `others`."""
+        corr = sums[others] @ sums[row] * (scale / size[row]) / size[others]
+        return 2 * (1 - np.clip(corr, -1, 1))
+
+    adjacent = [set() for _ in range(num_tickers)]
+    for ticker, row in enumerate(knn_graph(z, k, chunk_size).tolist()):
+        adjacent[ticker].update(row)
+        for neighbour in row:
+            adjacent[neighbour].add(ticker)
+    # Heap of (squared distance, row a, row b, version of a, version of b); stale entries are skipped
+    heap = []
+    for a, neighbours in enumerate(adjacent):
+        others = np.array(sorted(b for b in neighbours if b > a), dtype=np.int64)
+        if len(others):
+            heap.extend(zip(distances(a, others).tolist(), [a] * len(others), others.tolist(),
+                            [0] * len(others), [0] * len(others)))
+    heapq.heapify(heap)
+
+    while heap:
+        d2, a, b, version_a, version_b = heapq.heappop(heap)
+        if not (active[a] and active[b] and version[a] == version_a and version[b] == version_b):
+            continue
+        if len(adjacent[a]) < len(adjacent[b]):
+            a, b = b, a  # keep the larger neighbour set
+        merges.append((min(label[a], label[b]), max(label[a], label[b]), np.sqrt(d2), size[a] + size[b]))
+        sums[a] += sums[b]
+        size[a] += size[b]
+        label[a] = num_tickers + len(merges) - 1
+        version[a] += 1
+        active[b] = False
+        for neighbour in adjacent[b]:
+            adjacent[neighbour].discard(b)
+            adjacent[neighbour].add(a)
+        adjacent[a] |= adjacent[b]
+        adjacent[a] -= {a, b}
+        adjacent[b] = set()
+
+        others = np.fromiter(adjacent[a], dtype=np.int64, count=len(adjacent[a]))
+        for c, d in zip(others.tolist(), distances(a, others).tolist()):
+            heapq.heappush(heap, (d, a, c, version[a], version[c]))
+
+    # Parts of the graph that never touched: average linkage over their mean correlations
+    rows = np.flatnonzero(active)
+    if len(rows) > 1:
+        corr = (sums[rows] @ sums[rows].T) * scale / np.outer(size[rows], size[rows])
+        final = average_linkage(2 * (1 - np.clip(corr, -1, 1)), sizes=size[rows])
+        ids = np.concatenate([label[rows], num_tickers + len(merges) + np.arange(len(rows) - 1)])
+        for a, b, d2, total in final:
+            merges.append((ids[int(a)], ids[int(b)], np.sqrt(d2), total))
+    return np.array(merges, dtype=float)
+
+
+def cut_tree(merges, num_clusters):
+    """
+    Flat clusters from a merge tree: undo its num_clusters - 1 highest merges.
+
+    Parameters:
+    merges (ndarray): From average_linkage or sparse_average_linkage
+    num_clusters (int): Clusters wanted (1..N)
+
+    Returns:
+    ndarray: Cluster 0..num_clusters-1 of every leaf, numbered left to right in leaf order
+    """
+    n = len(merges) + 1
+    if not 1 <= num_clusters <= n:
+        raise ValueError(f"num_clusters must be between 1 and {n}")
+    children = merges[:, :2].astype(int)
+    # A merge is never undone before the merges above it: its height counts as at least its children's
+    height = np.zeros(2 * n - 1)
+    for step, (a, b) in enumerate(children):
+        height[n + step] = max(merges[step, 2], height[a], height[b])
+    kept = np.sort(np.argsort(height[n:], kind='stable')[:n - num_clusters])
+
+    root = np.arange(2 * n - 1)
+    for step in kept:
+        root[children[step]] = n + step
+    # Follow every node up to the highest merge kept (parents have larger ids)
+    for node in range(2 * n - 2, -1, -1):
+        root[node] = root[root[node]]
+    order = leaf_order(merges) if n > 1 else np.zeros(1, dtype=int)
+    _, first_seen, labels = np.unique(root[order], return_index=True, return_inverse=True)
+    numbering = np.empty(num_clusters, dtype=int)
+    numbering[np.argsort(first_seen)] = np.arange(num_clusters)
+    result = np.empty(n, dtype=int)
+    result[order] = numbering[labels]
+    return result
+
+
+class CorrelationClusters:
+    """
+    A hierarchical clustering of tickers by correlation: leaf order and flat
+    clusters at any K.
+    """
+
+    def __init__(self, merges, tickers):
+        """
+        Parameters:
+        merges (ndarray): Merge tree (see average_linkage)
+        tickers (list): Ticker of each leaf 0..N-1
+        """
+        self.merges = np.asarray(merges, dtype=float)
+        self.tickers = list(tickers)
+        self.positions = leaf_order(self.merges) if len(self.tickers) > 1 else np.arange(len(self.tickers))
+
+    @classmethod
+    def from_corr(cls, corr):
+        """Average linkage on the full correlation matrix (DataFrame)."""
+        values = np.nan_to_num(np.asarray(corr, dtype=float))
+        merges = average_linkage(correlation_distance(values)) if len(values) > 1 else np.empty((0, 4))
+        return cls(merges, list(corr.columns))
+
+    @classmethod
+    def from_returns(cls, returns, max_dense=500, k=10, chunk_size=1000):
+        """
+        Clusters straight from daily returns.
+
+        Parameters:
+        returns (DataFrame): Daily returns, (days, tickers), NaN where a ticker didn't trade
+        max_dense (int): Up to this many tickers use the full correlation matrix
+        k (int): Neighbours per ticker in the graph for larger universes
+        chunk_size (int): Tickers per step when building the graph
+        """
+        z = standardize(returns)
+        if z.shape[1] <= max_dense:
+            corr = (z.T @ z) / max(len(z) - 1, 1)
+            merges = average_linkage(correlation_distance(corr)) if z.shape[1] > 1 else np.empty((0, 4))
+        else:
+            merges = sparse_average_linkage(z, k, chunk_size)
+        return cls(merges, list(returns.columns))
+
+    def __len__(self):
+        return len(self.tickers)
+
+    @property
+    def order(self):
+        """Ticker positions in leaf order (correlated tickers side by side)."""
+        return self.positions
+
+    @property
+    def ordered_tickers(self):
+        return [self.tickers[i] for i in self.positions]
+
+    def labels(self, num_clusters):
+        """
+        Cluster of every ticker when the tree is cut into num_clusters groups.
+
+        Returns:
+        Series: Ticker -> cluster number (0 = leftmost in leaf order)
+        """
+        if len(self.tickers) == 1:
+            return pd.Series([0], index=self.tickers, name='Cluster')
+        return pd.Series(cut_tree(self.merges, num_clusters), index=self.tickers, name='Cluster')
+
+    def groups(self, num_clusters):
+        """Tickers of each of num_clusters clusters, each list in leaf order."""
+        labels = self.labels(num_clusters).to_numpy()
+        groups = {cluster: [] for cluster in range(num_clusters)}
+        for position in self.positions:
+            groups[labels[position]].append(self.tickers[position])
+        return groups
+
+
+if __name__ == "__main__":
+    import time
+
+    print("HIERARCHICAL CLUSTERS OF SIMULATED SECTORS")
+    rng = np.random.default_rng(42)
+
+    def sector_returns(num_tickers, num_sectors, days=500):
+        """Market factor + one of num_sectors sector factors + noise, tickers shuffled."""
+        sector = rng.permutation(np.arange(num_tickers) % num_sectors)
+        market = rng.normal(0, 0.01, (days, 1))
+        sectors = rng.normal(0, 0.01, (days, num_sectors))
+        noise = rng.normal(0, 0.01, (days, num_tickers))
+        returns = pd.DataFrame(market + sectors[:, sector] + noise,
+                               columns=[f'S{i:04d}' for i in range(num_tickers)])
+        return returns, sector
+
+    def agreement(labels, sector):
+        """Share of tickers whose cluster's most common sector is their own."""
+        table = pd.crosstab(labels, sector)
+        return table.max(axis=1).sum() / len(sector)
+
+    for num_tickers in (60, 1000, 5000):
+        returns, sector = sector_returns(num_tickers, 8)
+        start = time.perf_counter()
+        clusters = CorrelationClusters.from_returns(returns)
+        elapsed = time.perf_counter() - start
+        labels = clusters.labels(8)
+        method = 'full matrix' if num_tickers <= 500 else 'k-NN graph'
+        print(f"  {num_tickers:>5} tickers ({method}): {elapsed:5.2f}s, "
+              f"cluster sizes {sorted(labels.value_counts().tolist())}, "
+              f"{agreement(labels.to_numpy(), sector):.0%} match their sector")
+
+    # The same universe through both paths
+    returns, sector = sector_returns(400, 8)
+    for label, max_dense in (('full matrix', 400), ('k-NN graph', 0)):
+        clusters = CorrelationClusters.from_returns(returns, max_dense=max_dense)
+        print(f"\n400 tickers, {label}: {agreement(clusters.labels(8).to_numpy(), sector):.0%} match their sector")
+        print(f"  first cluster in leaf order: {clusters.groups(8)[0][:6]} ...")
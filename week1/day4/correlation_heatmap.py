@@ -0,0 +1,283 @@
+"""
+Day 4: Correlation Heatmaps for Large Universes
+From 5 tickers to 5,000 without N² text labels
+
+- one mesh artist (pcolormesh) for all cells, numbers written only when N is small
+- rows/columns in hierarchical-cluster order, so correlated groups form blocks
+  on the diagonal instead of noise
+- past max_cells tickers the map shows BLOCKS: the mean correlation between
+  groups of consecutive (clustered) tickers. Block means come straight from the
+  standardized returns, never from the full N x N matrix:
+
+    mean corr(I, J) = (Σ_{i∈I} z_i) · (Σ_{j∈J} z_j) / ((T - 1) |I| |J|)
+
+  so memory is (days x tickers) + (blocks x blocks).
+"""
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+
+
+def correlation_distance(corr):
+    """Distance between two return series: sqrt(2 (1 - ρ)), 0 for identical, 2 for opposite."""
+    return np.sqrt(np.clip(2 * (1 - np.asarray(corr, dtype=float)), 0, None))
+
+
+def average_linkage(distance, sizes=None):
+    """
+    Average-linkage hierarchical clustering (nearest-neighbour chain, O(N²) time).
+
+    Parameters:
+    distance (ndarray): Symmetric N x N distance matrix
+    sizes (ndarray): Points in each of the N items when they are clusters
+                     already (default: 1 each)
+
+    Returns:
+    ndarray: Shape (N - 1, 4) merges in the order they were made: (cluster a,
+             cluster b, distance, size). Leaves are 0..N-1, merge k creates N + k.
+    """
+    d = np.array(distance, dtype=float)
+    n = len(d)
+    np.fill_diagonal(d, np.inf)
+    size = np.ones(n) if sizes is None else np.array(sizes, dtype=float)
+    label = np.arange(n)  # cluster id currently stored in each row
+    active = np.ones(n, dtype=bool)
+    merges = np.empty((n - 1, 4))
+    chain = []
+
+    for step in range(n - 1):
+        if not chain:
+            chain.append(int(np.flatnonzero(active)[0]))
+        # Follow nearest neighbours until two clusters are each other's nearest
+        while True:
+            a = chain[-1]
+            b = int(d[a].argmin())
+            if len(chain) > 1 and d[a, chain[-2]] <= d[a, b]:
+                b = chain[-2]
+            if len(chain) > 1 and b == chain[-2]:
+                break
+            chain.append(b)
+        chain.pop()
+        chain.pop()
+
+        merges[step] = (min(label[a], label[b]), max(label[a], label[b]), d[a, b], size[a] + size[b])
+        # Lance-Williams update for average linkage; the merged cluster lives in row a
+        merged = (size[a] * d[a] + size[b] * d[b]) / (size[a] + size[b])
+        d[a], d[:, a] = merged, merged
+        d[a, a] = np.inf
+        d[b], d[:, b] = np.inf, np.inf
+        active[b] = False
+        size[a] += size[b]
+        label[a] = n + step
+    return merges
+
+
+def leaf_order(merges):
+    """Leaves (0..N-1) left to right in the tree, so each cluster is contiguous."""
+    n = len(merges) + 1
+    order, stack = [], [2 * n - 2]
+    while stack:
+        node = stack.pop()
+        if node < n:
+            order.append(node)
+        else:
+            left, right = merges[node - n, :2]
+            stack.extend([int(right), int(left)])
+    return np.array(order)
+
+
+def standardize(returns):
+    """
+    Returns scaled so that z_i · z_j / (T - 1) is the correlation (missing days -> 0).
+
+    Parameters:
+    returns (DataFrame or ndarray): Shape (days, tickers), NaN where a ticker didn't trade
+
+    Returns:
+    ndarray: float32, same shape
+    """
+    x = np.asarray(returns, dtype=float)
+    valid = np.isfinite(x)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(x, axis=0)
+        std = np.nanstd(x, axis=0, ddof=1)
+        z = np.where(valid, (x - mean) / std, 0.0)
+    return np.nan_to_num(z).astype(np.float32)
+
+
+def cluster_order(corr=None, z=None, max_size=2000, chunk_size=2000):
+    """
+    Hierarchical-cluster order of tickers.
+
+    Up to max_size tickers: average linkage on the correlation distance.
+    More tickers (from z only): cluster max_size evenly spaced representatives,
+    then place every other ticker next to its most correlated representative -
+    memory stays (chunk_size x max_size) instead of N x N.
+
+    Parameters:
+    corr (DataFrame or ndarray): Correlation matrix (small universes)
+    z (ndarray): Standardized returns from standardize() (large universes)
+    max_size (int): Largest universe clustered directly
+    chunk_size (int): Tickers assigned per step in the large case
+
+    Returns:
+    ndarray: Ticker positions in display order
+    """
+    if corr is not None:
+        corr = np.nan_to_num(np.asarray(corr, dtype=float))
+        return np.arange(len(corr)) if len(corr) < 3 else leaf_order(average_linkage(correlation_distance(corr)))
+
+    num_tickers = z.shape[1]
+    scale = 1 / max(len(z) - 1, 1)
+    if num_tickers <= max_size:
+        return cluster_order(corr=(z.T @ z) * scale)
+
+    representatives = np.linspace(0, num_tickers - 1, max_size).astype(int)
+    sample = z[:, representatives]
+    rep_order = cluster_order(corr=(sample.T @ sample) * scale)
+    rank = np.empty(max_size, dtype=int)
+    rank[rep_order] = np.arange(max_size)
+
+    nearest = np.empty(num_tickers, dtype=int)
+    for start in range(0, num_tickers, chunk_size):
+        nearest[start:start + chunk_size] = (z[:, start:start + chunk_size].T @ sample).argmax(axis=1)
+    nearest[representatives] = np.arange(max_size)
+    # Sort by the representative's place in the tree (stable: representatives lead their group)
+    return np.argsort(rank[nearest], kind='stable')
+
+
+def block_correlation(z, order, num_blocks):
+    """
+    Mean correlation between groups of consecutive tickers (in display order).
+
+    Parameters:
+    z (ndarray): Standardized returns from standardize()
+    order (ndarray): Ticker positions in display order
+    num_blocks (int): Groups per axis
+
+    Returns:
+    tuple: (num_blocks x num_blocks ndarray of mean correlations, block edges into order)
+    """
+    edges = np.linspace(0, len(order), num_blocks + 1).astype(int)
+    sums = np.add.reduceat(z[:, order], edges[:-1], axis=1, dtype=np.float64)  # (days, blocks)
+    counts = np.diff(edges)
+    blocks = (sums.T @ sums) / max(len(z) - 1, 1) / np.outer(counts, counts)
+    return np.clip(blocks, -1, 1), edges
+
+
+def draw_heatmap(values, labels=None, ax=None, annotate=False, title='Stock Correlation Matrix'):
+    """
+    Draw a correlation matrix with a single QuadMesh artist.
+
+    Parameters:
+    values (ndarray): Square matrix in display order
+    labels (list): Tick labels (thinned out when there are many)
+    ax (Axes): Where to draw (default: new figure)
+    annotate (bool): Write every value in its cell (only sensible for small N)
+    title (str): Axes title
+
+    Returns:
+    Axes: The axes drawn on
+    """
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 8))
+    n = len(values)
+    mesh = ax.pcolormesh(np.asarray(values), cmap='RdYlGn', vmin=-1, vmax=1, rasterized=n > 100)
+    ax.figure.colorbar(mesh, ax=ax, label='Correlation')
+    ax.set_xlim(0, n)
+    ax.set_ylim(n, 0)  # first row on top, like imshow
+    ax.set_aspect('auto')
+
+    if labels is not None:
+        step = max(1, -(-n // 40))  # at most ~40 labels per axis
+        ticks = np.arange(0, n, step)
+        ax.set_xticks(ticks + 0.5, [labels[i] for i in ticks], rotation=45 if step == 1 else 90)
+        ax.set_yticks(ticks + 0.5, [labels[i] for i in ticks])
+
+    if annotate:
+        for (i, j), value in np.ndenumerate(values):
+            ax.text(j + 0.5, i + 0.5, f'{value:.2f}', ha="center", va="center", color="black")
+
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    return ax
+
+
+def plot_correlation_heatmap(corr=None, returns=None, order='cluster', max_cells=200, annotate_limit=20, ax=None):
+    """
+    Correlation heatmap that scales with the universe.
+
+    Parameters:
+    corr (DataFrame): Correlation matrix (used when there are at most max_cells tickers)
+    returns (DataFrame): Daily returns; needed for block view of larger universes
+    order (str or array): 'cluster' (hierarchical order), 'original', or ticker
+                          positions in display order (e.g. CorrelationClusters.order)
+    max_cells (int): Most rows/columns drawn; above this, tickers are grouped into blocks
+    annotate_limit (int): Write values in the cells up to this many tickers
+    ax (Axes): Where to draw (default: new figure)
+
+    Returns:
+    Axes: The axes drawn on
+    """
+    num_tickers = len(corr) if corr is not None else returns.shape[1]
+    if not isinstance(order, str):
+        positions = np.asarray(order, dtype=int)
+        if len(positions) != num_tickers:
+            raise ValueError(f"order has {len(positions)} positions for {num_tickers} tickers")
+    elif order not in ('cluster', 'original'):
+        raise ValueError(f"Unknown order '{order}' (use 'cluster' or 'original')")
+
+    if num_tickers <= max_cells:
+        if corr is None:
+            corr = returns.corr()
+        if isinstance(order, str):
+            positions = cluster_order(corr=corr) if order == 'cluster' else np.arange(num_tickers)
+        values = corr.to_numpy()[np.ix_(positions, positions)]
+        return draw_heatmap(values, [corr.columns[i] for i in positions], ax,
+                            annotate=num_tickers <= annotate_limit)
+
+    if returns is None:
+        raise ValueError(f"{num_tickers} tickers: pass returns to draw the block view")
+    z = standardize(returns)
+    if isinstance(order, str):
+        positions = cluster_order(z=z) if order == 'cluster' else np.arange(num_tickers)
+    blocks, edges = block_correlation(z, positions, max_cells)
+    labels = [str(returns.columns[positions[start]]) for start in edges[:-1]]
+    return draw_heatmap(blocks, labels, ax, title=f'Stock Correlation Matrix ({num_tickers} tickers, '
+                                                    f'mean over {num_tickers / max_cells:.0f}-ticker blocks)')
+
+
+if __name__ == "__main__":
+    import time
+
+    print("CORRELATION HEATMAPS FOR SIMULATED SECTORS")
+    rng = np.random.default_rng(42)
+
+    def sector_returns(num_tickers, num_sectors, days=500):
+        """Returns driven by a market factor plus one of num_sectors sector factors, shuffled."""
+        sector = rng.permutation(np.arange(num_tickers) % num_sectors)
+        market = rng.normal(0, 0.01, (days, 1))
+        sectors = rng.normal(0, 0.01, (days, num_sectors))
+        noise = rng.normal(0, 0.01, (days, num_tickers))
+        return pd.DataFrame(market + sectors[:, sector] + noise, columns=[f'S{i:04d}' for i in range(num_tickers)])
+
+    for num_tickers in (12, 150, 3000):
+        returns = sector_returns(num_tickers, 6)
+        start = time.perf_counter()
+        corr = returns.corr() if num_tickers <= 200 else None
+        ax = plot_correlation_heatmap(corr, returns)
+        ax.figure.canvas.draw()
+        print(f"  {num_tickers:>5} tickers: {time.perf_counter() - start:6.2f}s, "
+              f"{len(ax.texts)} text labels, {len(ax.collections)} mesh artist")
+        plt.close(ax.figure)
+
+    # The cluster order puts each sector together on the diagonal
+    returns = sector_returns(60, 4)
+    corr = returns.corr().to_numpy()
+    positions = cluster_order(corr=corr)
+    neighbours = [corr[a, b] for a, b in zip(positions[:-1], positions[1:])]
+    print(f"\nMean correlation of neighbouring rows: original {np.mean(np.diag(corr, 1)):.2f}, "
+          f"clustered {np.mean(neighbours):.2f}")
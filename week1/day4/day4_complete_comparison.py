@@ -2,14 +2,28 @@
 Day 4: Complete Stock Comparison Tool
 Synthesizing: OOP, NumPy, Pandas, Matplotlib, Calculus concepts
 """
-import yfinance as yf
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import date
-class StockComparison:
+
+from week1.day4.calendar_alignment import AlignedPanel
+from week1.day5.bootstrap import bootstrap_metrics
+from week1.downsampling import plot_downsampled
+from week1.lazy_imports import lazy_import
+from week1.lazy_results import LazyGraph, computed
+from week1.result_cache import cached, default_cache
+from week1.tracing import count, traced
+
+yf = lazy_import('yfinance')
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+
+class StockComparison(LazyGraph):
     """Comparing two stocks across multiple dimensions.
+       Downloads, returns and statistics are computed on first use and reused.
+       Downloads are also kept in result_cache (memory + disk) across sessions.
     """
+    result_cache = default_cache()
+    
     def __init__(self, ticker1 , ticker2, start_date, end_date):
         self.ticker1 = ticker1
         self.ticker2 = ticker2
@@ -21,25 +35,43 @@ class StockComparison:
             
         self.start_date = start_date
         self.end_date = end_date
-        self.data1 = None
-        self.data2 = None
-        self.returns1 = None
-        self.returns2 = None
+    
+    @traced()
+    @cached('start_date', 'end_date', as_of='end_date')
+    def _download(self, ticker):
+        data = yf.download(ticker, start=self.start_date, end=self.end_date, progress=False)
+        if data is None or data.empty:
+            raise ValueError(f"Failed to download data for {ticker}")
+        count('rows downloaded', len(data))
+        count('tickers downloaded')
+        return data
+    
+    @computed('ticker1', 'start_date', 'end_date')
+    def data1(self):
+        return self._download(self.ticker1)
+    
+    @computed('ticker2', 'start_date', 'end_date')
+    def data2(self):
+        return self._download(self.ticker2)
+    
+    @computed('data1')
+    def returns1(self):
+        return self.data1['Close'].pct_change().dropna()
+    
+    @computed('data2')
+    def returns2(self):
+        return self.data2['Close'].pct_change().dropna()
+    
+    @computed('ticker1', 'ticker2', 'data1', 'data2')
+    def panel(self):
+        """Both stocks lined up on one calendar once; later calls reuse it."""
+        return AlignedPanel.from_series({self.ticker1: self.data1['Close'], self.ticker2: self.data2['Close']})
         
     def download_data(self):
-        """Downloading Data for both stocks"""
+        """Downloading Data for both stocks (again, if already downloaded)"""
         print(f"Downloading {self.ticker1} and {self.ticker2}...")
-        self.data1 = yf.download(self.ticker1, start=self.start_date, end=self.end_date, progress=False)
-        if self.data1 is None or self.data1.empty:
-           raise ValueError(f"Failed to download data for {self.ticker1}")
-             
-        self.data2 = yf.download(self.ticker2, start=self.start_date, end=self.end_date, progress=False)
-        if self.data2 is None or self.data2.empty:
-            raise ValueError(f"Failed to download data for {self.ticker2}")
-            
-        self.returns1 = self.data1['Close'].pct_change().dropna()
-        self.returns2 = self.data2['Close'].pct_change().dropna()
-        
+        self.data1 = self._download(self.ticker1)
+        self.data2 = self._download(self.ticker2)
         print(f"Download Complete!")
         
     def calculate_max_drawdown(self, prices):
@@ -57,8 +89,9 @@ class StockComparison:
         return drawdown.min() * 100
       
       
-    def compare_statistics(self):
-        """Calculate and compare statistics."""
+    @computed('ticker1', 'ticker2', 'data1', 'data2', 'returns1', 'returns2', 'panel')
+    def statistics(self):
+        """Statistics table and correlation of the two stocks: (stats, correlation)."""
         if self.data1 is None or self.data1.empty:
             raise ValueError(f"Failed to download data for {self.ticker1}")
             
@@ -96,10 +129,17 @@ class StockComparison:
             }
         }).T
         
-        aligned = pd.concat([self.returns1, self.returns2], axis=1).dropna()
-
-        # Calculate correlation
-        correlation = aligned.corr().iloc[0, 1]
+        # Calculate correlation (days on which both stocks traded)
+        correlation = self.panel.pairwise_corr().iloc[0, 1]
+        
+        return stats, correlation
+    
+    @traced()
+    def compare_statistics(self):
+        """Calculate and compare statistics."""
+        if self.statistics is None:
+            return None
+        stats, correlation = self.statistics
         
         print("\n" + "="*70)
         print("COMPARISON STATISTICS")
@@ -111,6 +151,30 @@ class StockComparison:
         return stats, correlation
     
     
+    @traced()
+    def bootstrap_statistics(self, num_resamples=2000, method='stationary', confidence=0.95):
+        """
+        Confidence intervals for Sharpe ratio, volatility and max drawdown.
+        Both stocks are resampled on the same days, so their correlation is kept.
+        """
+        if self.returns1 is None or self.returns2 is None:
+            print("Error: No returns data available. Call download_data() first.")
+            return None
+        
+        aligned = self.panel.aligned_returns()
+        
+        intervals = bootstrap_metrics(aligned, num_resamples=num_resamples, method=method, confidence=confidence)
+        
+        print("\n" + "="*70)
+        print(f"BOOTSTRAP CONFIDENCE INTERVALS ({confidence:.0%}, {method}, {num_resamples} resamples)")
+        print("="*70)
+        print(intervals.to_string())
+        print("="*70)
+        
+        return intervals
+    
+    
+    @traced()
     def plot_comparison(self):
         """Create comprehensive comparison visualization."""
         if self.data1 is None or self.data1.empty:
@@ -127,16 +191,16 @@ class StockComparison:
             print("Error: No returns data available. Call calculate_returns() first.")
             return None
         
-        aligned = pd.concat([self.returns1, self.returns2], axis=1).dropna()
-        aligned.columns = [self.ticker1, self.ticker2]
+        aligned = self.panel.aligned_returns()
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
         
         # Plot 1: Normalized prices
         norm1 = (self.data1['Close'] / self.data1['Close'].iloc[0]) * 100
         norm2 = (self.data2['Close'] / self.data2['Close'].iloc[0]) * 100
         
-        axes[0, 0].plot(norm1.index, norm1, label=self.ticker1, linewidth=2)
-        axes[0, 0].plot(norm2.index, norm2, label=self.ticker2, linewidth=2)
+        # Lines are reduced to the panel's pixel width (peaks and troughs kept)
+        plot_downsampled(axes[0, 0], norm1.index, norm1, label=self.ticker1, linewidth=2)
+        plot_downsampled(axes[0, 0], norm2.index, norm2, label=self.ticker2, linewidth=2)
         axes[0, 0].axhline(y=100, color='black', linestyle='--', alpha=0.3)
         axes[0, 0].set_title('Normalized Price Performance (Base = 100)',   fontsize=12, fontweight='bold')
         axes[0, 0].set_ylabel('Normalized Price')
@@ -152,8 +216,8 @@ class StockComparison:
         
         # Plot 3: Scatter plot (correlation)
         
-        axes[1, 0].scatter(self.returns1 * 100, self.returns2 * 100, alpha=0.5)
-        axes[1, 0].set_title(f'Returns Correlation: {self.returns1.corr(self.returns2):.3f}', fontsize=12, fontweight='bold')
+        axes[1, 0].scatter(aligned[self.ticker1] * 100, aligned[self.ticker2] * 100, alpha=0.5)
+        axes[1, 0].set_title(f'Returns Correlation: {self.panel.pairwise_corr().iloc[0, 1]:.3f}', fontsize=12, fontweight='bold')
         axes[1, 0].set_xlabel(f'{self.ticker1} Return (%)')
         axes[1, 0].set_ylabel(f'{self.ticker2} Return (%)')
         axes[1, 0].grid(True, alpha=0.3)
@@ -168,8 +232,8 @@ class StockComparison:
         cumulative1 = (1 + self.returns1).cumprod() - 1
         cumulative2 = (1 + self.returns2).cumprod() - 1
 
-        axes[1, 1].plot(cumulative1.index, cumulative1 * 100, label=self.ticker1, linewidth=2)
-        axes[1, 1].plot(cumulative2.index, cumulative2 * 100, label=self.ticker2, linewidth=2)
+        plot_downsampled(axes[1, 1], cumulative1.index, cumulative1 * 100, label=self.ticker1, linewidth=2)
+        plot_downsampled(axes[1, 1], cumulative2.index, cumulative2 * 100, label=self.ticker2, linewidth=2)
         axes[1, 1].axhline(y=0, color='black', linestyle='--', alpha=0.3)
         axes[1, 1].set_title('Cumulative Returns', fontsize=12, fontweight='bold')
         axes[1, 1].set_xlabel('Date')
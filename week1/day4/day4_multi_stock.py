@@ -5,14 +5,35 @@ Learning Pandas through financial data analysis
 Goal: Build a class that handles multiple stocks at once
 """
 import numpy as np
-import pandas as pd 
-import matplotlib.pyplot as plt
-import yfinance as yf
 from datetime import date
 
-class MultiStockAnalyzer:
+from week1.chart_rendering import render_price_charts
+from week1.day4.calendar_alignment import AlignedPanel
+from week1.day4.correlation_clusters import CorrelationClusters
+from week1.day4.correlation_heatmap import plot_correlation_heatmap as plot_heatmap
+from week1.day4.parallel_analytics import parallel_ticker_metrics
+from week1.day4.return_pyramid import PERIODS_PER_YEAR, ReturnPyramid
+from week1.day5.risk import tail_risk
+from week1.downsampling import plot_downsampled
+from week1.lazy_imports import lazy_import
+from week1.lazy_results import LazyGraph, computed, memoized
+from week1.result_cache import cached, default_cache
+from week1.tracing import count, traced
+
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+yf = lazy_import('yfinance')
+
+class MultiStockAnalyzer(LazyGraph):
     """Analyze multiple stocks simultaneously
+       Data, returns, summary and correlation are computed on first use and
+       reused until tickers, dates or data change - no manual call order needed.
+       Downloads, summaries and correlations are also kept in result_cache
+       (memory + disk), so the same analysis in a later session is instant.
+       Set result_cache = None to always recompute.
     """
+    result_cache = default_cache()
+    
     def __init__(self, tickers, start_date=None, end_date=None):
         """ If no start_date or end_date is provided, use first day of the current year and today's date.
             Initialize with a list of stock tickers.
@@ -28,9 +49,29 @@ class MultiStockAnalyzer:
             end_date = date.today()
         self.start_date = start_date
         self.end_date = end_date
-        self.data = None
-        self.returns = None
+    
+    @computed('tickers', 'start_date', 'end_date')
+    def data(self):
+        """Closing prices, downloaded on first access."""
+        return self.download_data()
+    
+    @computed('data')
+    def panel(self):
+        """All tickers aligned on one calendar with per-ticker validity masks."""
+        return AlignedPanel.from_frame(self.data)
+    
+    @computed('data')
+    def pyramid(self):
+        """Weekly/monthly/quarterly/annual returns, built once for all later queries."""
+        return ReturnPyramid(self.data)
+    
+    @computed('panel')
+    def returns(self):
+        """Daily returns; a day one stock didn't trade is NaN for that stock only."""
+        return self.panel.returns_frame()
         
+    @traced()
+    @cached('tickers', 'start_date', 'end_date', as_of='end_date')
     def download_data(self):
         """Downloads data of all stocks
            Returns: DataFrames with columns for each stock
@@ -38,13 +79,14 @@ class MultiStockAnalyzer:
         # Download data for multiple tickers at once
         data = yf.download(self.tickers, start=self.start_date, end=self.end_date, progress= False)
         if data is None or data.empty:
-            print("Error: Failed to download data")
-            exit(1)
+            raise ValueError(f"Failed to download data for {self.tickers}")
             
         #Extract closing prices
         # If multiple tickers, this would create a DataFrame with columns for each
         self.data = data['Close'] 
         
+        count('rows downloaded', len(self.data))
+        count('tickers downloaded', len(self.tickers))
         print(f"Downloaded {len(self.data)} days of data for {len(self.tickers)} stocks.")
         print(f"Columns: {list(self.data.columns)}")
         return self.data
@@ -56,39 +98,80 @@ class MultiStockAnalyzer:
             print("Error: No data available. Call download_data() first.")
             return None
         
-        #ptc_change() , claculates percentage change for each column
-        self.returns = self.data.pct_change()
-        
-        # Remove first row with NaN values from pct_change()
-        self.returns = self.returns.dropna()
         return self.returns
     
-    def summary_statistics(self):
+    @memoized('returns', 'pyramid')
+    @cached('data')
+    def summary_statistics(self, horizon='daily'):
         """
            Calculates summary stats for all stocks 
+           horizon: 'daily', 'weekly', 'monthly', 'quarterly' or 'annual' returns
            Returns: DataFrame with stats for all stocks
         """
         if self.returns is None or self.returns.empty:
             print("Error: No returns data available. Call calculate_returns() first.")
             return None
         
-        if self.returns is None or self.returns.empty:
-            self.calculate_returns()
+        if horizon not in PERIODS_PER_YEAR:
+            raise ValueError(f"Unknown horizon '{horizon}' (use one of {list(PERIODS_PER_YEAR)})")
+        
+        # Daily stats use the returns directly; coarser horizons are precomputed lookups
+        if horizon == 'daily':
+            returns = self.returns
+        else:
+            # NaN where a ticker has no return in a period - skipped per column below
+            returns = self.pyramid.returns(horizon)
+        periods = PERIODS_PER_YEAR[horizon]
         
         #Create a Summary DataFrame
         summary = pd.DataFrame({
-            'Mean Return': self.returns.mean(),
-            'Volatility': self.returns.std(),
-            'Min Return': self.returns.min(),
-            'Max Return': self.returns.max(),
-            'Annual Return': self.returns.mean() * 252,
-            'Annual Volatility': self.returns.std() * np.sqrt(252)
+            'Mean Return': returns.mean(),
+            'Volatility': returns.std(),
+            'Min Return': returns.min(),
+            'Max Return': returns.max(),
+            'Annual Return': returns.mean() * periods,
+            'Annual Volatility': returns.std() * np.sqrt(periods)
         })           
         
         # Calculate Sharpe Ratio (Simplified, assuming risk-free rate = 0)
         summary['Sharpe Ratio'] = summary['Annual Return'] / summary['Annual Volatility']
+        
+        # Tail risk: 1-period historical VaR / CVaR at 95% (positive = loss)
+        risk = tail_risk(returns, confidence_levels=(0.95,), methods=('historical',))
+        summary['VaR 95%'] = risk.loc[('historical', 'VaR', 0.95, 1)]
+        summary['CVaR 95%'] = risk.loc[('historical', 'CVaR', 0.95, 1)]
         return summary
     
+    @memoized('data')
+    @cached('data')
+    def ticker_metrics(self, n_workers=None, window=21):
+        """
+        Summary statistics plus total return, max drawdown and rolling volatility,
+        computed in worker processes (tickers sharded, prices in shared memory).
+        Use for thousands of tickers; same columns as summary_statistics first.
+        n_workers: worker processes (default: CPU cores; 1 = this process only)
+        window: rolling-volatility window in days
+        """
+        if self.data is None or self.data.empty:
+            print("Error: No data available. Call download_data() first.")
+            return None
+        
+        return parallel_ticker_metrics(self.data, n_workers=n_workers, window=window)
+    
+    @traced()
+    def tail_risk(self, confidence_levels=(0.95, 0.99), horizons=(1, 10)):
+        """
+        VaR and CVaR for all stocks (historical, parametric, Cornish-Fisher).
+        Returns: DataFrame with rows (Method, Measure, Confidence, Horizon), columns = tickers
+        """
+        if self.returns is None or self.returns.empty:
+            print("Error: No returns data available. Call calculate_returns() first.")
+            return None
+        
+        return tail_risk(self.returns, confidence_levels=confidence_levels, horizons=horizons)
+    
+    @memoized('panel')
+    @cached('data')
     def correlation_matrix(self):
         """
         Calculate correlation matrix between stocks.
@@ -96,26 +179,53 @@ class MultiStockAnalyzer:
         if self.returns is None or self.returns.empty:
             print("Error: No returns data available. Call calculate_returns() first.")
             return None
-        correlation = pd.DataFrame(self.returns).corr()
+        # Each pair uses all days on which BOTH stocks traded
+        correlation = self.panel.pairwise_corr()
         return correlation
 
-    def plot_normalized_prices(self):
+    @memoized('panel')
+    def correlation_clusters(self, max_dense=500, k=10):
+        """
+        Hierarchical clusters of the stocks by correlation.
+        Up to max_dense stocks they come from correlation_matrix(); larger
+        universes use each stock's k most correlated stocks (no N x N matrix).
+        
+        Parameters:
+            max_dense (int): Most stocks clustered from the full correlation matrix
+            k (int): Neighbours per stock for larger universes
+        Returns: CorrelationClusters - .labels(K) cuts into K groups, .order is
+                 the leaf order used by plot_correlation_heatmap
+        """
+        if self.returns is None or self.returns.empty:
+            print("Error: No returns data available. Call calculate_returns() first.")
+            return None
+        if len(self.tickers) <= max_dense:
+            return CorrelationClusters.from_corr(self.correlation_matrix())
+        return CorrelationClusters.from_returns(self.returns, max_dense=max_dense, k=k)
+
+    @traced()
+    def plot_normalized_prices(self, horizon='daily'):
         """
         Plot all stock prices normalized to 100.
         This shows relative performance.
+        horizon: plot one point per day, week, month, quarter or year
         """
         if self.data is None or self.data.empty:
             print("Error: No data available. Call download_data() first.")
             return None
         
-        # Normalize to 100 (start at 100 for all stocks)
-        normalized = (self.data / self.data.iloc[0]) * 100
+        if horizon == 'daily':
+            # Normalize to 100 (start at 100 for all stocks, from each one's first price)
+            normalized = (self.data / self.data.bfill().iloc[0]) * 100
+        else:
+            normalized = self.pyramid.growth(horizon) * 100
         
         plt.figure(figsize=(14, 7))
         
         for ticker in normalized.columns:
-            plt.plot(normalized.index, normalized[ticker], 
-                    label=ticker, linewidth=2)
+            # Reduced to the chart's pixel width (peaks and troughs kept)
+            plot_downsampled(plt.gca(), normalized.index, normalized[ticker], 
+                             label=ticker, linewidth=2)
         
         plt.axhline(y=100, color='black', linestyle='--', 
                    linewidth=1, alpha=0.3)
@@ -129,40 +239,61 @@ class MultiStockAnalyzer:
         
         return plt
     
-    def plot_correlation_heatmap(self):
+    @traced()
+    def plot_correlation_heatmap(self, order='cluster', max_cells=200, annotate_limit=20):
         """
         Plot heatmap of correlations between stocks.
+        Rows/columns are in hierarchical-cluster order (correlated stocks side by side),
+        values are written in the cells only for small universes, and beyond
+        max_cells stocks the map shows mean correlations of blocks of stocks.
+        
+        Parameters:
+            order (str): 'cluster' or 'original' (ticker order)
+            max_cells (int): Most rows/columns drawn before grouping stocks into blocks
+            annotate_limit (int): Write the values up to this many stocks
         """
+        if isinstance(order, str) and order == 'cluster':
+            clusters = self.correlation_clusters()
+            order = clusters.order if clusters is not None else order
+        
+        if len(self.tickers) > max_cells:
+            # Block view: straight from the returns, no N x N matrix
+            if self.returns is None or self.returns.empty:
+                print("Error: No returns data available. Call calculate_returns() first.")
+                return None
+            plot_heatmap(returns=self.returns, order=order, max_cells=max_cells)
+            return plt
+        
         corr = self.correlation_matrix()
         
         if corr is None or corr.empty:
             print("Error: No correlation data available. Call calculate_returns() first.")
             return None
         
-        plt.figure(figsize=(10, 8))
-        
-        # Create heatmap using matplotlib
-        im = plt.imshow(corr, cmap='RdYlGn', aspect='auto', 
-                       vmin=-1, vmax=1)
-        
-        # Add colorbar
-        plt.colorbar(im, label='Correlation')
+        plot_heatmap(corr, order=order, max_cells=max_cells, annotate_limit=annotate_limit)
+        plt.tight_layout()
         
-        # Set ticks and labels
-        plt.xticks(range(len(corr.columns)), list(corr.columns), rotation=45)
-        plt.yticks(range(len(corr.columns)), list(corr.columns))
+        return plt
+    
+    @traced()
+    def render_price_charts(self, output_dir, groups=None, n_workers=None):
+        """
+        Write normalized-price charts to files, rendered headlessly in a process pool.
         
-        # Add correlation values as text
-        for i in range(len(corr)):
-            for j in range(len(corr)):
-                text = plt.text(j, i, f'{corr.iloc[i, j]:.2f}',
-                              ha="center", va="center", color="black")
+        Parameters:
+            output_dir (str): Directory for the PNG files
+            groups (dict): {chart name: [tickers]} (default: one chart per ticker)
+            n_workers (int): Worker processes (default: CPU cores)
         
-        plt.title('Stock Correlation Matrix', fontsize=14, fontweight='bold')
-        plt.tight_layout()
+        Returns:
+            list: Paths of the written files
+        """
+        if self.data is None or self.data.empty:
+            raise ValueError(f"Failed to download data for {self.tickers}")
         
-        return plt
+        return render_price_charts(self.data, groups or list(self.data.columns), output_dir, n_workers=n_workers)
     
+    @traced()
     def best_and_worst(self):
         """
         Find best and worst performing stocks.
@@ -176,8 +307,8 @@ class MultiStockAnalyzer:
             print("Error: No data available. Call download_data() first.")
             return None
         
-        # Sort by total return
-        total_returns = (self.data.iloc[-1] / self.data.iloc[0] - 1) * 100
+        # Sort by total return (first to last valid price of each stock)
+        total_returns = self.panel.total_returns() * 100
         
         best = total_returns.idxmax()
         worst = total_returns.idxmin()
@@ -218,10 +349,14 @@ if __name__ == "__main__":
     # Print correlation matrix
     print("\nCORRELATION MATRIX:")
     print(analyzer.correlation_matrix())
+    print(f"Two clusters: {analyzer.correlation_clusters().groups(2)}")
     
     # Find best and worst
     analyzer.best_and_worst()
     
+    # Running this script again (same tickers and dates) reads these from the cache
+    print(f"\nResult cache: {analyzer.result_cache.stats()}")
+    
     # Plot normalized prices
     analyzer.plot_normalized_prices()
     plt.savefig('week1/day4/normalized_prices.png', dpi=150, bbox_inches='tight')
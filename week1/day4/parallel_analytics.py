@@ -0,0 +1,173 @@
+"""
+Day 4: Per-Ticker Analytics on Many Cores
+Summary statistics, drawdowns and rolling volatility for thousands of tickers
+
+Every ticker's metrics only need that ticker's column of prices, so the
+columns can be split into shards and handled by different processes.
+The price matrix is placed ONCE in shared memory; workers map it instead
+of receiving a pickled copy per task. Only the small per-ticker results
+travel back.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from week1.day4.calendar_alignment import AlignedPanel
+from week1.day5.risk import historical_var_cvar
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Same columns as MultiStockAnalyzer.summary_statistics, then the extras
+SUMMARY_COLUMNS = ['Mean Return', 'Volatility', 'Min Return', 'Max Return', 'Annual Return',
+                   'Annual Volatility', 'Sharpe Ratio', 'VaR 95%', 'CVaR 95%']
+EXTRA_COLUMNS = ['Total Return', 'Max Drawdown', 'Rolling Volatility', 'Max Rolling Volatility']
+
+
+def ticker_metrics(prices, periods_per_year=252, window=21):
+    """
+    Metrics for every column of a price matrix.
+
+    Parameters:
+    prices (ndarray): Shape (days, tickers), NaN where a ticker has no price
+    periods_per_year (int): Annualization factor (252 for daily prices)
+    window (int): Rolling-volatility window in days
+
+    Returns:
+    dict: Column name -> array of one value per ticker
+    """
+    # Returns against each ticker's previous valid price (as in the analyzer)
+    returns = AlignedPanel(None, range(prices.shape[1]), prices).returns
+    valid = np.isfinite(returns)
+    counts = valid.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(returns, axis=0)
+        std = np.nanstd(returns, axis=0, ddof=1)
+        metrics = {
+            'Mean Return': mean,
+            'Volatility': std,
+            'Min Return': np.nanmin(np.where(valid, returns, np.inf), axis=0),
+            'Max Return': np.nanmax(np.where(valid, returns, -np.inf), axis=0),
+            'Annual Return': mean * periods_per_year,
+            'Annual Volatility': std * np.sqrt(periods_per_year)
+        }
+        metrics['Sharpe Ratio'] = metrics['Annual Return'] / metrics['Annual Volatility']
+    for name in ('Min Return', 'Max Return'):
+        metrics[name][counts == 0] = np.nan
+
+    # Tail risk for the tickers that have any returns
+    metrics['VaR 95%'] = np.full(prices.shape[1], np.nan)
+    metrics['CVaR 95%'] = np.full(prices.shape[1], np.nan)
+    if counts.any():
+        var, cvar = historical_var_cvar(returns[:, counts > 0], (0.95,))
+        metrics['VaR 95%'][counts > 0] = var[0]
+        metrics['CVaR 95%'][counts > 0] = cvar[0]
+
+    # Total return and drawdown on prices carried forward over gaps
+    filled = pd.DataFrame(prices).ffill().to_numpy()
+    first = pd.DataFrame(prices).bfill().to_numpy()[0]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        metrics['Total Return'] = filled[-1] / first - 1
+        peak = np.fmax.accumulate(filled, axis=0)
+        metrics['Max Drawdown'] = np.nanmin(np.where(np.isfinite(filled), filled / peak - 1, np.inf), axis=0)
+    metrics['Max Drawdown'][~np.isfinite(metrics['Max Drawdown'])] = np.nan
+
+    # Rolling volatility from running sums: only windows with `window` valid days count
+    zero = np.zeros((1, prices.shape[1]))
+    x = np.where(valid, returns, 0.0)
+    n = np.vstack([zero, np.cumsum(valid, axis=0)])
+    s = np.vstack([zero, np.cumsum(x, axis=0)])
+    ss = np.vstack([zero, np.cumsum(x * x, axis=0)])
+    full = (n[window:] - n[:-window]) == window
+    window_sum = s[window:] - s[:-window]
+    window_var = (ss[window:] - ss[:-window] - window_sum ** 2 / window) / (window - 1)
+    rolling = np.where(full, np.sqrt(np.maximum(window_var, 0)) * np.sqrt(periods_per_year), np.nan)
+    if not len(full):  # fewer returns than one window
+        metrics['Rolling Volatility'] = np.full(prices.shape[1], np.nan)
+        metrics['Max Rolling Volatility'] = np.full(prices.shape[1], np.nan)
+        return metrics
+    last_full = np.where(full, np.arange(len(full))[:, None], -1).max(axis=0)
+    metrics['Rolling Volatility'] = np.where(last_full >= 0, rolling[last_full, np.arange(prices.shape[1])], np.nan)
+    metrics['Max Rolling Volatility'] = np.where(last_full >= 0, np.nanmax(np.where(full, rolling, -np.inf), axis=0),
+                                                 np.nan)
+    return metrics
+
+
+_worker_prices = None
+_worker_memory = None
+
+
+def _attach(name, shape, dtype):
+    """Worker initializer: map the shared price matrix (no copy)."""
+    global _worker_prices, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_prices = np.ndarray(shape, dtype=dtype, buffer=_worker_memory.buf)
+
+
+def _shard_metrics(start, stop, periods_per_year, window):
+    return ticker_metrics(_worker_prices[:, start:stop], periods_per_year, window)
+
+
+def parallel_ticker_metrics(prices, n_workers=None, periods_per_year=252, window=21, shards_per_worker=4):
+    """
+    Per-ticker metrics with tickers sharded across worker processes.
+
+    Parameters:
+    prices (DataFrame): Prices, one column per ticker (NaN = no price that day)
+    n_workers (int): Worker processes (default: CPU cores; 1 = no pool)
+    periods_per_year (int): Annualization factor
+    window (int): Rolling-volatility window in days
+    shards_per_worker (int): Shards per worker, so a slow shard doesn't idle the others
+
+    Returns:
+    DataFrame: One row per ticker, SUMMARY_COLUMNS + EXTRA_COLUMNS
+    """
+    values = np.ascontiguousarray(prices.to_numpy(dtype=float))
+    num_tickers = values.shape[1]
+    n_workers = min(n_workers or os.cpu_count() or 1, num_tickers)
+
+    if n_workers <= 1:
+        metrics = ticker_metrics(values, periods_per_year, window)
+    else:
+        bounds = np.linspace(0, num_tickers, min(num_tickers, n_workers * shards_per_worker) + 1).astype(int)
+        memory = shared_memory.SharedMemory(create=True, size=values.nbytes)
+        try:
+            shared = np.ndarray(values.shape, dtype=values.dtype, buffer=memory.buf)
+            shared[:] = values
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_attach,
+                                     initargs=(memory.name, values.shape, values.dtype)) as pool:
+                shards = list(pool.map(_shard_metrics, bounds[:-1], bounds[1:],
+                                       [periods_per_year] * (len(bounds) - 1), [window] * (len(bounds) - 1)))
+            del shared
+        finally:
+            memory.close()
+            memory.unlink()
+        metrics = {name: np.concatenate([shard[name] for shard in shards]) for name in shards[0]}
+
+    return pd.DataFrame(metrics, index=prices.columns)[SUMMARY_COLUMNS + EXTRA_COLUMNS]
+
+
+if __name__ == "__main__":
+    import time
+
+    print("PER-TICKER ANALYTICS FOR 2,000 SIMULATED STOCKS (10 years of daily prices)")
+    rng = np.random.default_rng(42)
+    days = pd.bdate_range('2015-01-01', periods=2520)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (2520, 2000)), axis=0)),
+                          index=days, columns=[f'S{i:04d}' for i in range(2000)])
+    prices.iloc[:500, :100] = np.nan   # 100 stocks listed later
+
+    timings = {}
+    for n_workers in sorted({1, 2, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        table = parallel_ticker_metrics(prices, n_workers=n_workers)
+        timings[n_workers] = time.perf_counter() - start
+        print(f"  {n_workers} worker(s): {timings[n_workers]:.2f}s "
+              f"(speed-up {timings[1] / timings[n_workers]:.1f}x)")
+
+    print("\nFirst 5 tickers:")
+    print(table.head().round(4).to_string())
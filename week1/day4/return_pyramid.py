@@ -0,0 +1,161 @@
+"""
+Day 4: Multi-Horizon Return Pyramid
+Daily -> weekly -> monthly -> quarterly -> annual returns, computed ONCE
+
+Log returns add up over time:
+    log(P_end / P_start) = Σ daily log returns
+so every coarser horizon is just a sum over groups of finer rows. Build
+all levels once from the prices, then asking for "monthly returns" is a
+dictionary lookup instead of a pandas resample on every call.
+"""
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+HORIZONS = ('daily', 'weekly', 'monthly', 'quarterly', 'annual')
+
+PERIODS_PER_YEAR = {
+    'daily': 252,
+    'weekly': 52,
+    'monthly': 12,
+    'quarterly': 4,
+    'annual': 1
+}
+
+
+def _aggregate(log_returns, valid, dates, codes):
+    """
+    Sum rows that share a period code (rows must be in date order).
+
+    Returns:
+    tuple: (log_returns, valid_counts, period_end_dates) for the coarser level
+    """
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)] - 1
+    sums = np.add.reduceat(log_returns, starts, axis=0)
+    counts = np.add.reduceat(valid, starts, axis=0)
+    return sums, counts, dates[ends]
+
+
+class ReturnPyramid:
+    """
+    Precomputed returns at every horizon for a price table.
+    A ticker with no prices during a whole period gets NaN for that period.
+    """
+
+    def __init__(self, prices):
+        """
+        Parameters:
+        prices (DataFrame or Series): Prices with a DatetimeIndex, one column per ticker
+        """
+        if isinstance(prices, pd.Series):
+            prices = prices.to_frame()
+        if not isinstance(prices.index, pd.DatetimeIndex):
+            raise ValueError("Prices need a DatetimeIndex to build weekly/monthly/annual returns")
+        if len(prices) < 2:
+            raise ValueError("Need at least 2 prices to calculate returns")
+        prices = prices.sort_index()
+        self.columns = prices.columns
+
+        # Daily log returns against each ticker's previous VALID price, so the move
+        # across a missing day lands on the next real price; a missing price
+        # contributes 0 and is not counted as valid
+        values = np.log(prices.to_numpy(dtype=float))
+        last_value = pd.DataFrame(values).ffill().to_numpy()
+        log_returns = values[1:] - last_value[:-1]
+        valid = np.isfinite(log_returns)
+        log_returns = np.where(valid, log_returns, 0.0)
+        dates = prices.index[1:]
+
+        # Period codes straight from the calendar (no resample)
+        years = dates.year.to_numpy()
+        months = dates.month.to_numpy()
+        week_codes = (dates - pd.Timestamp('1970-01-05')).days.to_numpy() // 7  # weeks start on Monday
+        month_codes = years * 12 + months
+
+        levels = {'daily': (log_returns, valid.astype(int), dates)}
+        levels['weekly'] = _aggregate(log_returns, levels['daily'][1], dates, week_codes)
+        levels['monthly'] = _aggregate(log_returns, levels['daily'][1], dates, month_codes)
+
+        # Coarser levels build on the monthly level (months nest in quarters and years)
+        monthly_returns, monthly_counts, monthly_dates = levels['monthly']
+        quarter_codes = monthly_dates.year.to_numpy() * 4 + (monthly_dates.month.to_numpy() - 1) // 3
+        levels['quarterly'] = _aggregate(monthly_returns, monthly_counts, monthly_dates, quarter_codes)
+        levels['annual'] = _aggregate(monthly_returns, monthly_counts, monthly_dates,
+                                      monthly_dates.year.to_numpy())
+
+        self._log_returns = {}
+        self._simple_returns = {}
+        for horizon, (sums, counts, period_dates) in levels.items():
+            log_frame = pd.DataFrame(np.where(counts > 0, sums, np.nan),
+                                     index=period_dates, columns=self.columns)
+            self._log_returns[horizon] = log_frame
+            self._simple_returns[horizon] = np.expm1(log_frame)
+
+    def _check(self, horizon):
+        if horizon not in PERIODS_PER_YEAR:
+            raise ValueError(f"Unknown horizon '{horizon}' (use one of {HORIZONS})")
+
+    def returns(self, horizon='daily', log=False):
+        """Simple (or log) returns at a horizon - precomputed, O(1)."""
+        self._check(horizon)
+        return self._log_returns[horizon] if log else self._simple_returns[horizon]
+
+    def growth(self, horizon='daily'):
+        """Cumulative growth of 1 at the end of each period (normalized price / 100)."""
+        self._check(horizon)
+        return np.exp(self._log_returns[horizon].fillna(0).cumsum())
+
+    def periods_per_year(self, horizon):
+        """Annualization factor for a horizon (252 for daily, 12 for monthly, ...)."""
+        self._check(horizon)
+        return PERIODS_PER_YEAR[horizon]
+
+    def summary(self, horizon='daily'):
+        """Mean, volatility and annualized figures at a horizon (same columns as summary_statistics)."""
+        returns = self.returns(horizon)
+        periods = self.periods_per_year(horizon)
+        summary = pd.DataFrame({
+            'Mean Return': returns.mean(),
+            'Volatility': returns.std(),
+            'Min Return': returns.min(),
+            'Max Return': returns.max(),
+            'Annual Return': returns.mean() * periods,
+            'Annual Volatility': returns.std() * np.sqrt(periods)
+        })
+        summary['Sharpe Ratio'] = summary['Annual Return'] / summary['Annual Volatility']
+        return summary
+
+
+if __name__ == "__main__":
+    import time
+
+    print("RETURN PYRAMID FOR 500 SIMULATED STOCKS (10 years of daily prices)")
+    rng = np.random.default_rng(42)
+    dates = pd.bdate_range('2015-01-01', periods=2520)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (2520, 500)), axis=0)),
+                          index=dates, columns=[f'S{i:03d}' for i in range(500)])
+
+    start = time.perf_counter()
+    pyramid = ReturnPyramid(prices)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    monthly = pyramid.returns('monthly')
+    lookup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resampled = prices.resample('ME').last().pct_change()
+    resample = time.perf_counter() - start
+
+    print(f"Build all 5 levels: {build * 1000:.1f} ms")
+    print(f"Monthly lookup:     {lookup * 1e6:.1f} µs")
+    print(f"pandas resample:    {resample * 1000:.1f} ms (every call)")
+    print(f"Max difference vs resample: {np.nanmax(np.abs(monthly.values[1:] - resampled.values[1:])):.2e}")
+
+    print("\nAnnual volatility of S000 by horizon (fewer periods = noisier estimate):")
+    for horizon in HORIZONS:
+        print(f"  {horizon:<10} {pyramid.summary(horizon).loc['S000', 'Annual Volatility']:.3f}")
@@ -0,0 +1 @@
+"""Day 5: Integration, wealth accumulation and portfolio analytics."""
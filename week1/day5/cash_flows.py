@@ -0,0 +1,152 @@
+"""
+Day 5: Cash-Flow Schedules
+Wealth with contributions and withdrawals, without a Python loop
+
+The day-by-day loop
+    W(t) = W(t-1) x (1 + r(t)) + c(t)
+has a closed form. With growth factor G(t) = ∏(1 + r(s)) for s <= t:
+    W(t) = G(t) x [W(0) + Σ c(s) / G(s)]
+so one cumprod and one cumsum give the whole path - for thousands of
+savings scenarios at once when the arrays have a scenario axis.
+"""
+
+import numpy as np
+
+
+def regular_schedule(num_periods, amount, every=1, first=None, last=None):
+    """
+    Build a schedule with the same cash flow every few periods.
+
+    Parameters:
+    num_periods (int): Length of the schedule
+    amount (float): Cash flow per payment (negative = withdrawal)
+    every (int): Periods between payments (21 trading days = ~1 month)
+    first (int): Period of the first payment (default: every)
+    last (int): No payments after this period (default: end of schedule)
+
+    Returns:
+    ndarray: Cash flow for each period
+    """
+    if every < 1:
+        raise ValueError("every must be at least 1")
+    first = every if first is None else first
+    last = num_periods if last is None else min(last + 1, num_periods)
+    schedule = np.zeros(num_periods)
+    schedule[first:last:every] = amount
+    return schedule
+
+
+def simulate_cash_flows(initial_capital, returns, cash_flows=0.0):
+    """
+    Wealth path with cash flows added at the end of each period.
+
+    Every argument broadcasts along a trailing scenario axis, so one call
+    runs a whole batch: e.g. returns of shape (periods, scenarios) with a
+    single (periods,) schedule, or one return path against many schedules.
+
+    Parameters:
+    initial_capital (float or ndarray): Starting wealth, scalar or (scenarios,)
+    returns (ndarray): Per-period returns, (periods,) or (periods, scenarios)
+    cash_flows (float or ndarray): Contribution (+) / withdrawal (-) per period,
+        scalar, (periods,) or (periods, scenarios)
+
+    Returns:
+    tuple: (wealth, contributed), each of shape (periods + 1, ...) with the
+        starting value in row 0. Wealth is not floored at zero - a negative
+        value means the withdrawals depleted the account.
+    """
+    returns = np.asarray(returns, dtype=float)
+    if returns.ndim == 0 or len(returns) == 0:
+        raise ValueError("returns must have at least one period")
+    if np.any(returns <= -1):
+        raise ValueError("Returns of -100% or worse wipe out the account; closed form needs r > -1")
+
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    if cash_flows.ndim == 0:
+        cash_flows = np.full(len(returns), float(cash_flows))
+    if len(cash_flows) != len(returns):
+        raise ValueError(f"Cash-flow schedule has {len(cash_flows)} periods, returns have {len(returns)}")
+
+    # Bring everything to (periods, scenarios) so the arrays broadcast
+    initial_capital = np.asarray(initial_capital, dtype=float)
+    batched = returns.ndim > 1 or cash_flows.ndim > 1 or initial_capital.ndim > 0
+    periods = len(returns)
+    returns, cash_flows, initial_capital = np.broadcast_arrays(
+        returns.reshape(periods, -1), cash_flows.reshape(periods, -1), initial_capital.reshape(1, -1))
+    initial_capital = initial_capital[0]
+
+    # Log-space growth keeps long horizons away from overflow in G(t)
+    log_growth = np.cumsum(np.log1p(returns), axis=0)
+    discounted_flows = np.cumsum(cash_flows * np.exp(-log_growth), axis=0)
+
+    wealth = np.empty((periods + 1, returns.shape[1]))
+    wealth[0] = initial_capital
+    wealth[1:] = np.exp(log_growth) * (initial_capital + discounted_flows)
+
+    contributed = np.zeros_like(wealth)
+    contributed[1:] = np.cumsum(cash_flows, axis=0)
+
+    if not batched:
+        return wealth[:, 0], contributed[:, 0]
+    return wealth, contributed
+
+
+def future_value(initial_capital, rate, contribution, num_periods, every=1):
+    """
+    Closed-form final wealth for a constant rate and a regular contribution.
+    Geometric series - O(1) per scenario, any argument may be an array.
+
+    Parameters:
+    initial_capital (float or ndarray): Starting wealth
+    rate (float or ndarray): Return per period
+    contribution (float or ndarray): Amount added every `every` periods
+    num_periods (int): Number of periods
+    every (int): Periods between contributions (same timing as regular_schedule)
+
+    Returns:
+    float or ndarray: Wealth after num_periods
+    """
+    rate = np.asarray(rate, dtype=float)
+    growth = (1 + rate) ** num_periods
+
+    # Payments land in periods every, 2*every, ..., m*every (0-based, as in
+    # regular_schedule) and the one in period i grows for num_periods - 1 - i periods.
+    # Summing the geometric series with ratio q = (1 + r)^every:
+    num_payments = (num_periods - 1) // every
+    q = (1 + rate) ** every
+    tail = (1 + rate) ** (num_periods - 1 - num_payments * every)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(np.isclose(q, 1.0), num_payments, (q ** num_payments - 1) / (q - 1))
+
+    result = initial_capital * growth + contribution * annuity * tail
+    return result if np.ndim(result) else float(result)
+
+
+if __name__ == "__main__":
+    print("SAVINGS PLAN: $2,000 start, $200 every 21 trading days, 4 years")
+
+    num_days = 252 * 4
+    daily_return = (1 + 0.25) ** (1 / 252) - 1
+    schedule = regular_schedule(num_days, 200, every=21)
+
+    wealth, contributed = simulate_cash_flows(2000, np.full(num_days, daily_return), schedule)
+    print(f"Final Wealth (path):        ${wealth[-1]:>12,.2f}")
+    print(f"Final Wealth (closed form): ${future_value(2000, daily_return, 200, num_days, every=21):>12,.2f}")
+    print(f"Total Contributed:          ${contributed[-1]:>12,.2f}")
+
+    print("\nBATCH: 10,000 random-return scenarios in one call")
+    rng = np.random.default_rng(42)
+    random_returns = rng.normal(daily_return, 0.015, size=(num_days, 10000))
+    wealth, _ = simulate_cash_flows(2000, random_returns, schedule)
+    p5, p50, p95 = np.percentile(wealth[-1], [5, 50, 95])
+    print(f"  5th percentile:  ${p5:>12,.2f}")
+    print(f"  Median:          ${p50:>12,.2f}")
+    print(f"  95th percentile: ${p95:>12,.2f}")
+
+    print("\nRETIREMENT DRAWDOWN: $500k, withdraw $3,000 every 21 days for 30 years")
+    years = 30
+    withdrawals = regular_schedule(252 * years, -3000, every=21)
+    retirement_returns = rng.normal(0.05 / 252, 0.01, size=(252 * years, 10000))
+    wealth, _ = simulate_cash_flows(500000, retirement_returns, withdrawals)
+    depleted = (wealth <= 0).any(axis=0)
+    print(f"  Scenarios that ran out of money: {depleted.mean():.1%}")
@@ -0,0 +1,249 @@
+"""
+Day 5: Probabilistic Goal Planning
+"How long until I reach $1B?" - with risk instead of a fixed return
+
+billionaire_calculator assumes the same return every year:
+    years = log(target / initial) / log(1 + r)
+With volatility, log wealth is a random walk with drift
+    X(t) = log W(0) + ν t + σ B(t),   ν = log(1 + r) - σ²/2
+and reaching the target is a FIRST-PASSAGE problem: the first time X(t)
+crosses b = log(target / initial). For a drifted Brownian motion this has
+a closed form (the inverse Gaussian distribution), and Monte Carlo paths
+check it when we want discrete yearly/monthly steps.
+"""
+
+import math
+from itertools import product
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Chebyshev fit of erfc (Numerical Recipes' erfcc): erfc(z) = t exp(-z² + P(t)),
+# t = 1 / (1 + z/2), relative error below 1.2e-7 for every z >= 0
+_ERFC_COEFFICIENTS = (-1.26551223, 1.00002368, 0.37409196, 0.09678418, -0.18628806,
+                      0.27886807, -1.13520398, 1.48851587, -0.82215223, 0.17087277)
+
+
+def _log_erfc_positive(z):
+    """log erfc(z) for z >= 0, without underflow far in the tail."""
+    t = 1 / (1 + 0.5 * z)
+    poly = np.zeros_like(t)
+    for coefficient in reversed(_ERFC_COEFFICIENTS):
+        poly = poly * t + coefficient
+    return np.log(t) - z * z + poly
+
+
+def _log_norm_cdf(x):
+    """log Φ(x) for arrays (vectorized, no scipy needed); accurate for very negative x."""
+    z = -np.asarray(x, dtype=float) / math.sqrt(2)  # Φ(x) = erfc(z) / 2
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):  # z = ±inf
+        log_tail = _log_erfc_positive(np.abs(z))
+        # erfc(-|z|) = 2 - erfc(|z|)
+        return np.where(z >= 0, log_tail, np.log(2 - np.exp(log_tail))) - math.log(2)
+
+
+def _norm_cdf(x):
+    """Standard normal CDF for arrays."""
+    return np.exp(_log_norm_cdf(x))
+
+
+def _log_drift(annual_return, volatility):
+    """Drift of log wealth, so that E[W(1)] = W(0) x (1 + annual_return)."""
+    return np.log1p(annual_return) - 0.5 * np.asarray(volatility, dtype=float) ** 2
+
+
+def probability_of_reaching(initial, target, years, annual_return, volatility, by_end_only=False):
+    """
+    Probability that wealth reaches the target within `years`.
+    All arguments broadcast, so a whole grid is one call.
+
+    Parameters:
+    initial (float or ndarray): Starting capital
+    target (float or ndarray): Goal wealth
+    years (float or ndarray): Time horizon in years
+    annual_return (float or ndarray): Expected annual return (0.20 = 20%)
+    volatility (float or ndarray): Annual volatility (0.30 = 30%)
+    by_end_only (bool): If True, only count being above target AT `years`
+        (terminal probability) instead of touching it at any time before
+
+    Returns:
+    ndarray: Probabilities between 0 and 1
+    """
+    initial, target, years, annual_return, volatility = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (initial, target, years, annual_return, volatility)))
+    if np.any(initial <= 0) or np.any(target <= 0):
+        raise ValueError("Initial capital and target must be positive")
+
+    nu = _log_drift(annual_return, volatility)
+    b = np.log(target / initial)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        sd = volatility * np.sqrt(years)
+        terminal = _norm_cdf((nu * years - b) / sd)
+        if by_end_only:
+            result = terminal
+        else:
+            # P(max X ≥ b) = Φ((νT - b)/σ√T) + exp(2νb/σ²) Φ((-b - νT)/σ√T), done in log space
+            log_reflection = 2 * nu * b / volatility ** 2 + _log_norm_cdf((-b - nu * years) / sd)
+            result = terminal + np.exp(np.minimum(log_reflection, 0.0))
+
+        # No volatility: deterministic growth, reached iff ν x years ≥ b
+        result = np.where(volatility > 0, result, (nu * years >= b).astype(float))
+
+    # Already at the target
+    result = np.where(b <= 0, 1.0, result)
+    return np.clip(result, 0.0, 1.0)
+
+
+def expected_years_to_target(initial, target, annual_return, volatility=0.0):
+    """
+    Mean first-passage time b / ν (inf when log wealth has no upward drift).
+    With zero volatility this is exactly billionaire_calculator's answer.
+    """
+    nu = _log_drift(annual_return, volatility)
+    b = np.log(np.asarray(target, dtype=float) / np.asarray(initial, dtype=float))
+    with np.errstate(divide='ignore'):
+        years = np.where(nu > 0, np.maximum(b, 0.0) / nu, np.inf)
+    return years if np.ndim(years) else float(years)
+
+
+def years_to_target(initial, target, annual_return, volatility, confidence=0.5, max_years=200, tol=1e-4):
+    """
+    Years needed to reach the target with a given probability.
+    confidence=0.5 gives the MEDIAN time to target. Solved by vectorized
+    bisection on the first-passage probability (monotone in years).
+
+    Returns:
+    ndarray: Years (inf if the confidence is never reached within max_years)
+    """
+    initial, target, annual_return, volatility = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (initial, target, annual_return, volatility)))
+    low = np.zeros(initial.shape)
+    high = np.full(initial.shape, float(max_years))
+
+    reachable = probability_of_reaching(initial, target, high, annual_return, volatility) >= confidence
+    while np.max(high - low, initial=0.0) > tol:
+        mid = (low + high) / 2
+        hit = probability_of_reaching(initial, target, mid, annual_return, volatility) >= confidence
+        high = np.where(hit, mid, high)
+        low = np.where(hit, low, mid)
+
+    years = np.where(reachable, high, np.inf)
+    return years if np.ndim(years) else float(years)
+
+
+def simulate_first_passage(initial, target, annual_return, volatility, max_years,
+                           n_paths=None, steps_per_year=12, seed=None, shocks=None, max_elements=2**24):
+    """
+    Monte Carlo time to target, checked once per step (e.g. monthly).
+    Scenario arguments broadcast: a whole grid is simulated in one call,
+    every scenario on the same paths.
+
+    Parameters:
+    initial, target, annual_return, volatility (float or ndarray): Scenario(s)
+    max_years (float): Stop simulating after this many years
+    n_paths (int): Number of simulated wealth paths (default 10,000, or the
+        rows of `shocks`)
+    steps_per_year (int): Monitoring frequency (12 = monthly statements)
+    seed (int): Random seed for reproducibility
+    shocks (ndarray): Optional pre-drawn cumulative normal shocks, shape
+        (n_paths, max_years x steps_per_year); reusing the same array across
+        calls (common random numbers) makes them directly comparable
+    max_elements (int): Scenarios x paths x steps compared at once (memory bound)
+
+    Returns:
+    ndarray: Years until the target was first reached, inf if never -
+             (paths,) for one scenario, (scenarios, paths) for several
+    """
+    num_steps = int(round(max_years * steps_per_year))
+    dt = 1 / steps_per_year
+    if shocks is None:
+        rng = np.random.default_rng(seed)
+        shocks = np.cumsum(rng.standard_normal((n_paths or 10000, num_steps)), axis=1)
+    elif n_paths is not None and n_paths != len(shocks):
+        raise ValueError(f"n_paths={n_paths} but shocks has {len(shocks)} paths")
+    if shocks.shape[1] != num_steps:
+        raise ValueError(f"shocks has {shocks.shape[1]} steps, {max_years} years x {steps_per_year} "
+                         f"steps per year need {num_steps}")
+
+    scalar = all(np.ndim(a) == 0 for a in (initial, target, annual_return, volatility))
+    initial, target, annual_return, volatility = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(a, dtype=float)) for a in (initial, target, annual_return, volatility)))
+    b = np.log(target / initial)
+    nu = _log_drift(annual_return, volatility)
+
+    # log W(k) >= b  <=>  shock(k) >= (b - ν k dt) / (σ √dt): one comparison per step and path
+    gap = b[:, None] - nu[:, None] * dt * np.arange(1, num_steps + 1)  # (scenarios, steps)
+    scale = volatility[:, None] * math.sqrt(dt)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        threshold = np.where(scale > 0, gap / scale, np.where(gap <= 0, -np.inf, np.inf))
+
+    times = np.empty((len(b), len(shocks)))
+    chunk = max(1, max_elements // max(shocks.size, 1))
+    for start in range(0, len(b), chunk):
+        hit = shocks >= threshold[start:start + chunk, None, :]  # (chunk, paths, steps)
+        # argmax finds the FIRST True on each path; paths that never hit get inf
+        first = hit.argmax(axis=2)
+        times[start:start + chunk] = np.where(hit.any(axis=2), (first + 1) * dt, np.inf)
+    times[b <= 0] = 0.0
+    return times[0] if scalar else times
+
+
+def goal_grid(initial, annual_return, volatility, target, years, n_paths=0, steps_per_year=12, seed=42):
+    """
+    Evaluate every (initial, return, volatility, target) combination at once.
+
+    Parameters:
+    initial, annual_return, volatility, target (list): Values to combine
+    years (float): Planning horizon
+    n_paths (int): If > 0, add Monte Carlo estimates with this many paths
+        (the same paths for every scenario, all scenarios in one call)
+
+    Returns:
+    DataFrame: One row per scenario
+    """
+    grid = np.array(list(product(initial, annual_return, volatility, target)), dtype=float)
+    w0, r, vol, goal = grid.T
+
+    result = pd.DataFrame({
+        'Initial Capital': w0,
+        'Annual Return': r,
+        'Volatility': vol,
+        'Target': goal,
+        'P(Reach by Year)': probability_of_reaching(w0, goal, years, r, vol),
+        'P(Above at Year)': probability_of_reaching(w0, goal, years, r, vol, by_end_only=True),
+        'Median Years': years_to_target(w0, goal, r, vol),
+        'Mean Years': expected_years_to_target(w0, goal, r, vol)
+    })
+
+    if n_paths > 0:
+        simulated = simulate_first_passage(w0, goal, r, vol, max_years=years, n_paths=n_paths,
+                                           steps_per_year=steps_per_year, seed=seed)
+        result['P(Reach by Year) MC'] = np.isfinite(simulated).mean(axis=1)
+
+    return result
+
+
+if __name__ == "__main__":
+    print("="*70)
+    print("THE BILLIONAIRE MATH - WITH RISK")
+    print("="*70)
+    print("Deterministic answer (billionaire_calculator, 30% annual):")
+    print(f"  Years: {np.log(1e9 / 1e4) / np.log(1.30):.1f}")
+    print(f"  Same via expected_years_to_target: {expected_years_to_target(1e4, 1e9, 0.30):.1f}")
+
+    print("\nWith 30% annual return and 40% volatility:")
+    print(f"  Median years to $1B:          {years_to_target(1e4, 1e9, 0.30, 0.40):.1f}")
+    print(f"  Years for 90% confidence:     {years_to_target(1e4, 1e9, 0.30, 0.40, confidence=0.9):.1f}")
+    print(f"  P(reach $1B within 40 years): {probability_of_reaching(1e4, 1e9, 40, 0.30, 0.40):.1%}")
+
+    times = simulate_first_passage(1e4, 1e9, 0.30, 0.40, max_years=40, n_paths=20000, seed=42)
+    print(f"  Monte Carlo (monthly checks): {np.isfinite(times).mean():.1%}")
+
+    print("\nSCENARIO GRID (horizon: 30 years)")
+    grid = goal_grid(initial=[1e4, 1e5], annual_return=[0.2, 0.3, 0.4],
+                     volatility=[0.2, 0.4], target=[1e9], years=30, n_paths=5000)
+    print(grid.round(3).to_string(index=False))
@@ -4,10 +4,81 @@ Understanding integration through visualization
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
 
-def visualize_integration(f, a, b, n=50):
+from week1.lazy_imports import lazy_import
+
+plt = lazy_import('matplotlib.pyplot')
+collections = lazy_import('matplotlib.collections')
+widgets = lazy_import('matplotlib.widgets')
+
+# Above this many rectangles each one is narrower than a pixel
+MAX_BARS = 500
+# Most rectangles in the convergence plot: a static figure / the slider's range
+STATIC_MAX_N = 2**12
+INTERACTIVE_MAX_N = 2**20
+
+
+def evaluate(f, x):
+    """
+    f at every point of the array x.
+    Functions written for one number at a time (math.sin, if/else) are vectorized.
+    """
+    try:
+        y = np.asarray(f(x), dtype=float)
+        if y.shape == x.shape:
+            return y
+        if y.ndim == 0:  # constant function
+            return np.full(x.shape, float(y))
+    except (TypeError, ValueError):
+        pass
+    return np.vectorize(f, otypes=[float])(x)
+
+
+def midpoint_refinement(f, a, b, max_n=2**20):
+    """
+    Midpoint sums for n = 1, 2, 4, ... up to max_n from ONE evaluation of f.
+
+    f is evaluated once on a grid with 2 * N intervals (N = largest power of 2
+    <= max_n). The midpoints of n rectangles are every (N / n)-th of its odd
+    points, so every sum in the sequence is a strided slice of the same values.
+
+    Parameters:
+    f: Function to integrate
+    a, b: Bounds
+    max_n (int): Most rectangles
+
+    Returns:
+    tuple: (counts, midpoint sums, reference value (Simpson on the fine grid), fine-grid values)
+    """
+    levels = int(np.log2(max_n))
+    fine = 2 ** (levels + 1)
+    y = evaluate(f, np.linspace(a, b, fine + 1))
+    counts = 2 ** np.arange(levels + 1)
+    sums = np.array([y[fine // (2 * n)::fine // n].sum() * (b - a) / n for n in counts])
+    h = (b - a) / fine
+    reference = h / 3 * (y[0] + 4 * y[1:-1:2].sum() + 2 * y[2:-1:2].sum() + y[-1])
+    return counts, sums, reference, y
+
+
+def _bars(edges, heights, max_bars=MAX_BARS):
+    """
+    Rectangle outlines as one PolyCollection. More than max_bars rectangles are
+    merged into max_bars groups of mean height - same total area, bounded drawing cost.
+    """
+    n = len(heights)
+    if n > max_bars:
+        groups = np.linspace(0, n, max_bars + 1).astype(int)
+        heights = np.add.reduceat(heights, groups[:-1]) / np.diff(groups)
+        edges = edges[groups]
+    left, right = edges[:-1], edges[1:]
+    zero = np.zeros_like(heights)
+    vertices = np.stack([np.column_stack(corner) for corner in
+                         ((left, zero), (left, heights), (right, heights), (right, zero))], axis=1)
+    return collections.PolyCollection(vertices, facecolors='none', edgecolors='red',
+                                      linewidths=1.5 if n <= 100 else 0.5)
+
+
+def visualize_integration(f, a, b, n=50, max_n=None, interactive=False):
     """
     Visualize integration as area under curve.
     
@@ -16,14 +87,19 @@ def visualize_integration(f, a, b, n=50):
     a: Lower bound
     b: Upper bound
     n: Number of rectangles for Riemann sum
+    max_n: Largest number of rectangles in the convergence plot (default:
+           max(n, 4096), or 2^20 with the slider)
+    interactive: Add a slider to change the number of rectangles (1 to max_n);
+                 the slider moves in powers of 2, so n is rounded to the nearest one
     """
+    if max_n is None:
+        max_n = INTERACTIVE_MAX_N if interactive else max(n, STATIC_MAX_N)
+    if interactive:
+        n = 2 ** int(np.clip(np.round(np.log2(n)), 0, np.log2(max_n)))
     
     # Create smooth curve
     x_smooth = np.linspace(a, b, 1000)
-    y_smooth = np.array([f(x) for x in x_smooth])
-    
-    # Create rectangles for visualization
-    x_rect = np.linspace(a, b, n+1)
+    y_smooth = evaluate(f, x_smooth)
     
     fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 14))
     
@@ -38,38 +114,34 @@ def visualize_integration(f, a, b, n=50):
     ax1.legend()
     ax1.grid(True, alpha=0.3)
     
-    # PLOT 2: Riemann sum (rectangles approximating area)
+    # PLOT 2: Riemann sum (rectangles approximating area), midpoint method
     ax2.plot(x_smooth, y_smooth, 'b-', linewidth=2, label='f(x)')
     
-    # Draw rectangles (midpoint method)
+    def draw_rectangles(count, heights):
+        """Replace the rectangles (one collection artist) and the title."""
+        edges = np.linspace(a, b, count + 1)
+        for old in list(ax2.collections):
+            old.remove()
+        ax2.add_collection(_bars(edges, heights))
+        area = heights.sum() * (b - a) / count
+        ax2.set_title(f'Riemann Sum Approximation (n={count:,} rectangles)\nArea ≈ {area:.4f}',
+                      fontsize=14, fontweight='bold')
+        return area
+    
     dx = (b - a) / n
-    total_area = 0
-    for i in range(n):
-        x_mid = a + (i + 0.5) * dx
-        height = f(x_mid)
-        total_area += height * dx
-        
-        rect = Rectangle((a + i*dx, 0), dx, height, fill=False, edgecolor='red', linewidth=1.5)
-        ax2.add_patch(rect)
+    total_area = draw_rectangles(n, evaluate(f, a + (np.arange(n) + 0.5) * dx))
     
     ax2.axhline(y=0, color='black', linewidth=0.5)
-    ax2.set_title(f'Riemann Sum Approximation (n={n} rectangles)\nArea ≈ {total_area:.4f}', fontsize=14, fontweight='bold')
     ax2.set_xlabel('x')
     ax2.set_ylabel('f(x)')
     ax2.legend()
     ax2.grid(True, alpha=0.3)
     
-    # PLOT 3: Convergence (more rectangles = better approximation)
-    rectangle_counts = [5, 10, 20, 50, 100, 500, 1000]
-    approximations = []
-    
-    for num_rects in rectangle_counts:
-        dx = (b - a) / num_rects
-        area = sum(f(a + (i + 0.5) * dx) * dx for i in range(num_rects))
-        approximations.append(area)
+    # PLOT 3: Convergence (more rectangles = better approximation), n = 1, 2, 4, ... max_n
+    rectangle_counts, approximations, reference, y_fine = midpoint_refinement(f, a, b, max_n)
     
-    ax3.plot(rectangle_counts, approximations, 'ro-', linewidth=2, markersize=8)
-    ax3.axhline(y=approximations[-1], color='green', linestyle='--', linewidth=2, label=f'True value ≈ {approximations[-1]:.6f}')
+    ax3.plot(rectangle_counts, approximations, 'ro-', linewidth=2, markersize=6)
+    ax3.axhline(y=reference, color='green', linestyle='--', linewidth=2, label=f'True value ≈ {reference:.6f}')
     ax3.set_title('Convergence: More Rectangles → Better Approximation', fontsize=14, fontweight='bold')
     ax3.set_xlabel('Number of Rectangles')
     ax3.set_ylabel('Approximated Area')
@@ -78,7 +150,23 @@ def visualize_integration(f, a, b, n=50):
     ax3.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('week1/day5/integration_visualization.png', dpi=150, bbox_inches='tight')
+    
+    if interactive:
+        # n = 2^k rectangles: their midpoints are already in y_fine, so moving the slider is instant
+        fig.subplots_adjust(bottom=0.08)
+        slider = widgets.Slider(fig.add_axes([0.15, 0.01, 0.7, 0.02]), 'log₂ n', 0, len(rectangle_counts) - 1,
+                                valinit=int(np.log2(n)), valstep=1)
+        fine = len(y_fine) - 1
+        
+        def update(level):
+            count = int(rectangle_counts[int(level)])
+            draw_rectangles(count, y_fine[fine // (2 * count)::fine // count])
+            fig.canvas.draw_idle()
+        
+        slider.on_changed(update)
+        fig._integration_slider = slider  # keep a reference or the slider stops responding
+    else:
+        plt.savefig('week1/day5/integration_visualization.png', dpi=150, bbox_inches='tight')
     plt.show()
     
     print("\n" + "="*60)
@@ -88,44 +176,44 @@ def visualize_integration(f, a, b, n=50):
     print(f"Interval: [{a}, {b}]")
     print(f"Approximate area (using {n} rectangles): {total_area:.6f}")
     print(f"\nAs we use more rectangles, approximation improves:")
-    print(f"  5 rectangles:    {approximations[0]:.6f}")
-    print(f"  50 rectangles:   {approximations[3]:.6f}")
-    print(f"  1000 rectangles: {approximations[6]:.6f}")
+    for level in sorted(set(range(0, len(rectangle_counts), 5)) | {len(rectangle_counts) - 1}):
+        print(f"  {rectangle_counts[level]:>9,} rectangles: {approximations[level]:.6f}")
     print("\nThis is what integration calculates: the EXACT area")
     print("="*60)
 
 
-# EXAMPLE 1: f(x) = x²
-print("EXAMPLE 1: Integrating f(x) = x² from 0 to 1")
-print("We know the exact answer: ∫₀¹ x² dx = 1/3 = 0.33333...")
+if __name__ == "__main__":
+    # EXAMPLE 1: f(x) = x²
+    print("EXAMPLE 1: Integrating f(x) = x² from 0 to 1")
+    print("We know the exact answer: ∫₀¹ x² dx = 1/3 = 0.33333...")
 
-def f1(x):
-    return x**2
+    def f1(x):
+        return x**2
 
-visualize_integration(f1, 0, 1, n=20)
+    visualize_integration(f1, 0, 1, n=20)
 
 
-# EXAMPLE 2: f(x) = sin(x)
-print("\n\nEXAMPLE 2: Integrating f(x) = sin(x) from 0 to π")
-print("We know the exact answer: ∫₀ᵖⁱ sin(x) dx = 2")
+    # EXAMPLE 2: f(x) = sin(x)
+    print("\n\nEXAMPLE 2: Integrating f(x) = sin(x) from 0 to π")
+    print("We know the exact answer: ∫₀ᵖⁱ sin(x) dx = 2")
 
-def f2(x):
-    return np.sin(x)
+    def f2(x):
+        return np.sin(x)
 
-visualize_integration(f2, 0, np.pi, n=20)
+    visualize_integration(f2, 0, np.pi, n=20)
 
 
-# FINANCIAL EXAMPLE: Daily returns
-print("\n\nFINANCIAL EXAMPLE: Cumulative return as integral")
-print("If you have daily returns r(t), cumulative return is the integral!")
+    # FINANCIAL EXAMPLE: Daily returns
+    print("\n\nFINANCIAL EXAMPLE: Cumulative return as integral")
+    print("If you have daily returns r(t), cumulative return is the integral!")
 
-def daily_return(t):
-    """
-    Simulated daily return function.
-    In reality, this would be actual market data.
-    """
-    return 0.001 + 0.0005 * np.sin(t / 10)  # Average 0.1% per day with fluctuation
+    def daily_return(t):
+        """
+        Simulated daily return function.
+        In reality, this would be actual market data.
+        """
+        return 0.001 + 0.0005 * np.sin(t / 10)  # Average 0.1% per day with fluctuation
 
-visualize_integration(daily_return, 0, 252, n=50)
-print("\nInterpretation: The area under the daily return curve")
-print("is the TOTAL return over the year!")
\ No newline at end of file
+    visualize_integration(daily_return, 0, 252, n=50)
+    print("\nInterpretation: The area under the daily return curve")
+    print("is the TOTAL return over the year!")
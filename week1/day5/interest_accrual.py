@@ -0,0 +1,163 @@
+"""
+Day 5: Interest Accrual for a Whole Book of Accounts
+Compounding (WealthAccumulator) applied to millions of balances at once
+
+Depositing each account's interest day by day is accounts x days Python
+calls. Accrual over N days only needs each account's growth factor, which
+the compounding formulas give directly:
+
+    discrete   (m periods a year): V(t) = V(0) x (1 + r/m)^(m t)     V(t+1) = V(t) x (1 + r(t)) repeated
+    continuous:                    V(t) = V(0) x exp(r t)            V(0) x exp(∫r dt) for a constant rate
+    simple (no compounding):       V(t) = V(0) x (1 + r t)
+
+with t = days / day_count years - the closed forms WealthAccumulator uses
+(compound_interest in wealth_accumulator.py), applied to every account with
+its own number of periods m. The accounts are stored as columns (one array each for balance, rate, convention), so a
+book of millions is updated by a handful of array operations and the totals
+per convention come from bincount.
+
+    book = AccountsTable(balances, rates, compounding='daily')
+    report = book.accrue(days=30)
+"""
+
+import numpy as np
+
+from week1.day5.wealth_accumulator import compound_interest
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Compounding conventions, stored as int8 codes in the 'compounding' column
+CONVENTIONS = ('simple', 'annual', 'monthly', 'daily', 'continuous')
+# Compounding periods per year, as compound_interest takes them: 0 = simple
+# interest (no compounding), inf = continuous
+PERIODS_PER_YEAR = np.array([0, 1, 12, 365, np.inf])
+SIMPLE = CONVENTIONS.index('simple')
+
+
+def convention_codes(compounding, num_accounts):
+    """Convention names (one for all, or one per account) -> int8 codes."""
+    if isinstance(compounding, str):
+        if compounding not in CONVENTIONS:
+            raise ValueError(f"Unknown compounding '{compounding}' (use one of {CONVENTIONS})")
+        return np.full(num_accounts, CONVENTIONS.index(compounding), dtype=np.int8)
+    compounding = np.asarray(compounding)
+    if compounding.dtype.kind in 'iu':
+        codes = compounding.astype(np.int8)
+    else:
+        names, inverse = np.unique(compounding, return_inverse=True)
+        unknown = set(names) - set(CONVENTIONS)
+        if unknown:
+            raise ValueError(f"Unknown compounding {sorted(unknown)} (use one of {CONVENTIONS})")
+        codes = np.array([CONVENTIONS.index(name) for name in names], dtype=np.int8)[inverse]
+    if codes.shape != (num_accounts,) or codes.min() < 0 or codes.max() >= len(CONVENTIONS):
+        raise ValueError(f"compounding needs one valid convention per account ({num_accounts})")
+    return codes
+
+
+class AccountsTable:
+    """
+    A book of accounts as columns: balance, annual rate, compounding
+    convention and the interest accrued so far.
+    """
+
+    def __init__(self, balances, rates, compounding='daily', day_count=365):
+        """
+        Parameters:
+        balances (array-like): Balance of each account
+        rates (float or array-like): Annual nominal rate, one for all or one per account
+        compounding (str or array-like): Convention name(s) or codes - see CONVENTIONS
+        day_count (int): Days per year for converting days to years (365 or 360)
+        """
+        self.balances = np.array(balances, dtype=np.float64)
+        num_accounts = len(self.balances)
+        self.rates = np.broadcast_to(np.asarray(rates, dtype=np.float64), (num_accounts,)).copy()
+        if np.any(self.rates <= -1):
+            raise ValueError("Rates must be above -100%")
+        self.compounding = convention_codes(compounding, num_accounts)
+        self.accrued = np.zeros(num_accounts)
+        self.day_count = day_count
+
+    @classmethod
+    def from_accounts(cls, accounts, rates, compounding='daily', day_count=365):
+        """Table holding the current balances of BankAccount objects (in the same order)."""
+        return cls([account.balance for account in accounts], rates, compounding, day_count)
+
+    def __len__(self):
+        return len(self.balances)
+
+    def accrue(self, days, compound_accrued=True):
+        """
+        Apply `days` of interest to every account in one pass.
+
+        Parameters:
+        days (float): Days of accrual
+        compound_accrued (bool): Interest is added to the balance (True) or only
+                                 recorded in `accrued` and paid out later (False)
+
+        Returns:
+        DataFrame: Per convention and in total - accounts, balance before,
+                   interest, balance after
+        """
+        if days < 0:
+            raise ValueError("days must not be negative")
+        years = days / self.day_count
+        simple = self.compounding == SIMPLE
+        if simple.any() and (self.rates[simple] * years < -1).any():
+            raise ValueError(f"Simple interest over {days} days would take a balance below zero "
+                             "(rate x years below -100%)")
+        before = self.balances.copy() if compound_accrued else self.balances
+        interest = self.balances * compound_interest(self.rates, years, PERIODS_PER_YEAR[self.compounding])
+        self.accrued += interest
+        if compound_accrued:
+            self.balances += interest
+        return self.report(before, interest)
+
+    def report(self, before, interest):
+        """Totals per convention (present ones only) and overall."""
+        codes, length = self.compounding.astype(np.intp), len(CONVENTIONS)
+        counts = np.bincount(codes, minlength=length)
+        totals = pd.DataFrame({
+            'Accounts': counts,
+            'Balance Before': np.bincount(codes, weights=before, minlength=length),
+            'Interest': np.bincount(codes, weights=interest, minlength=length),
+        }, index=pd.Index(CONVENTIONS, name='Compounding'))[counts > 0]
+        totals['Balance After'] = totals['Balance Before'] + totals['Interest']
+        totals.loc['total'] = totals.sum()
+        totals['Accounts'] = totals['Accounts'].astype(int)
+        return totals
+
+
+if __name__ == "__main__":
+    import time
+
+    from week1.day5.wealth_accumulator import WealthAccumulator
+
+    print("INTEREST ACCRUAL FOR 10,000,000 ACCOUNTS")
+    rng = np.random.default_rng(42)
+    num_accounts = 10_000_000
+    book = AccountsTable(balances=rng.lognormal(8, 1.5, num_accounts).round(2),
+                         rates=rng.choice([0.01, 0.025, 0.045], num_accounts),
+                         compounding=rng.choice(np.arange(len(CONVENTIONS)), num_accounts))
+
+    start = time.perf_counter()
+    report = book.accrue(days=30)
+    elapsed = time.perf_counter() - start
+    pd.set_option('display.float_format', '{:,.2f}'.format)
+    print(report.to_string())
+    print(f"\n30 days of interest on {num_accounts:,} accounts: {elapsed:.2f}s")
+
+    # Daily compounding: the closed form against WealthAccumulator compounding
+    # one day at a time; continuous: against exp(r t) and the daily limit
+    accumulator = WealthAccumulator(10000)
+    days, rate = 365, 0.045
+    daily = AccountsTable([10000], rate, 'daily')
+    daily.accrue(days)
+    day_by_day = accumulator.discrete_compounding(np.full(days, rate / 365))[-1]
+    print(f"  daily      1 year at 4.5%: table ${daily.balances[0]:,.4f}, "
+          f"WealthAccumulator day by day ${day_by_day:,.4f}")
+    continuous = AccountsTable([10000], rate, 'continuous')
+    continuous.accrue(days)
+    print(f"  continuous 1 year at 4.5%: table ${continuous.balances[0]:,.4f}, "
+          f"10,000 x exp(0.045) ${10000 * np.exp(rate):,.4f}, "
+          f"compounding every second ${accumulator.compound_at_rate(rate, 1, 365 * 86400):,.4f}")
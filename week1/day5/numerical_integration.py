@@ -4,7 +4,10 @@ Building tools to integrate any function
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
+
+from week1.lazy_imports import lazy_import
+
+plt = lazy_import('matplotlib.pyplot')
 
 class NumericalIntegrator:
     """
@@ -120,77 +123,78 @@ class NumericalIntegrator:
         }
 
 
-# TEST 1: ∫₀¹ x² dx = 1/3
-print("TEST 1: ∫₀¹ x² dx")
-print("Known exact value: 1/3 = 0.333333...")
+if __name__ == "__main__":
+    # TEST 1: ∫₀¹ x² dx = 1/3
+    print("TEST 1: ∫₀¹ x² dx")
+    print("Known exact value: 1/3 = 0.333333...")
 
-def f1(x):
-    return x**2
+    def f1(x):
+        return x**2
 
-integrator1 = NumericalIntegrator(f1, 0, 1)
-results1 = integrator1.compare_methods(true_value=1/3, n=100)
+    integrator1 = NumericalIntegrator(f1, 0, 1)
+    results1 = integrator1.compare_methods(true_value=1/3, n=100)
 
 
-# TEST 2: ∫₀² (2x + 1) dx = 6
-print("\n\nTEST 2: ∫₀² (2x + 1) dx")
-print("Known exact value: [x² + x]₀² = 4 + 2 = 6")
+    # TEST 2: ∫₀² (2x + 1) dx = 6
+    print("\n\nTEST 2: ∫₀² (2x + 1) dx")
+    print("Known exact value: [x² + x]₀² = 4 + 2 = 6")
 
-def f2(x):
-    return 2*x + 1
+    def f2(x):
+        return 2*x + 1
 
-integrator2 = NumericalIntegrator(f2, 0, 2)
-results2 = integrator2.compare_methods(true_value=6, n=100)
+    integrator2 = NumericalIntegrator(f2, 0, 2)
+    results2 = integrator2.compare_methods(true_value=6, n=100)
 
 
-# TEST 3: ∫₀ᵖⁱ sin(x) dx = 2
-print("\n\nTEST 3: ∫₀ᵖⁱ sin(x) dx")
-print("Known exact value: [-cos(x)]₀ᵖⁱ = -cos(π) + cos(0) = 1 + 1 = 2")
+    # TEST 3: ∫₀ᵖⁱ sin(x) dx = 2
+    print("\n\nTEST 3: ∫₀ᵖⁱ sin(x) dx")
+    print("Known exact value: [-cos(x)]₀ᵖⁱ = -cos(π) + cos(0) = 1 + 1 = 2")
 
-def f3(x):
-    return np.sin(x)
+    def f3(x):
+        return np.sin(x)
 
-integrator3 = NumericalIntegrator(f3, 0, np.pi)
-results3 = integrator3.compare_methods(true_value=2, n=100)
+    integrator3 = NumericalIntegrator(f3, 0, np.pi)
+    results3 = integrator3.compare_methods(true_value=2, n=100)
 
 
-# VERIFY: All methods converge as n increases
-print("\n\nCONVERGENCE TEST: How does accuracy improve with more points?")
+    # VERIFY: All methods converge as n increases
+    print("\n\nCONVERGENCE TEST: How does accuracy improve with more points?")
 
-def test_convergence():
-    """Test how error decreases as n increases."""
-    
-    f = lambda x: x**2
-    true_value = 1/3
-    
-    n_values = [10, 50, 100, 500, 1000, 5000]
-    errors_trap = []
-    errors_simp = []
-    
-    for n in n_values:
-        integrator = NumericalIntegrator(f, 0, 1)
-        trap = integrator.trapezoidal(n)
-        simp = integrator.simpsons(n)
-        
-        errors_trap.append(abs(trap - true_value))
-        errors_simp.append(abs(simp - true_value))
-    
-    # Plot convergence
-    plt.figure(figsize=(12, 6))
-    plt.plot(n_values, errors_trap, 'bo-', linewidth=2, markersize=8, label='Trapezoidal')
-    plt.plot(n_values, errors_simp, 'ro-', linewidth=2, markersize=8, label="Simpson's")
-    plt.yscale('log')
-    plt.xscale('log')
-    plt.xlabel('Number of Points (n)', fontsize=12)
-    plt.ylabel('Absolute Error (log scale)', fontsize=12)
-    plt.title('Integration Error vs Number of Points\n(More points = Better accuracy)', 
-             fontsize=14, fontweight='bold')
-    plt.legend(fontsize=12)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig('week1/day5/convergence_test.png', dpi=150, bbox_inches='tight')
-    plt.show()
-    
-    print("Notice: Error decreases as n increases (downward slope)")
-    print("Simpson's method is more accurate (lower on graph)")
+    def test_convergence():
+        """Test how error decreases as n increases."""
+
+        f = lambda x: x**2
+        true_value = 1/3
+
+        n_values = [10, 50, 100, 500, 1000, 5000]
+        errors_trap = []
+        errors_simp = []
+
+        for n in n_values:
+            integrator = NumericalIntegrator(f, 0, 1)
+            trap = integrator.trapezoidal(n)
+            simp = integrator.simpsons(n)
+
+            errors_trap.append(abs(trap - true_value))
+            errors_simp.append(abs(simp - true_value))
+
+        # Plot convergence
+        plt.figure(figsize=(12, 6))
+        plt.plot(n_values, errors_trap, 'bo-', linewidth=2, markersize=8, label='Trapezoidal')
+        plt.plot(n_values, errors_simp, 'ro-', linewidth=2, markersize=8, label="Simpson's")
+        plt.yscale('log')
+        plt.xscale('log')
+        plt.xlabel('Number of Points (n)', fontsize=12)
+        plt.ylabel('Absolute Error (log scale)', fontsize=12)
+        plt.title('Integration Error vs Number of Points\n(More points = Better accuracy)', 
+                 fontsize=14, fontweight='bold')
+        plt.legend(fontsize=12)
+        plt.grid(True, alpha=0.3)
+        plt.tight_layout()
+        plt.savefig('week1/day5/convergence_test.png', dpi=150, bbox_inches='tight')
+        plt.show()
+
+        print("Notice: Error decreases as n increases (downward slope)")
+        print("Simpson's method is more accurate (lower on graph)")
 
-test_convergence()
\ No newline at end of file
+    test_convergence()
@@ -0,0 +1,205 @@
+"""
+Day 5: Portfolio Weight Sweep
+Evaluate thousands of candidate portfolios with one matrix multiply
+
+Every portfolio return series is a weighted sum of the same stock returns:
+    R_portfolio = returns @ w
+Stacking the candidate weight vectors as columns of W gives ALL portfolios
+at once:
+    R = returns @ W      (days x candidates)
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+def sweep_metrics(portfolio_returns, initial_capital, periods_per_year=252):
+    """
+    Calculate performance metrics for every column of a returns matrix.
+    Same definitions as PortfolioWealthTracker.calculate_metrics, vectorized.
+
+    Parameters:
+    portfolio_returns (ndarray): Shape (days, portfolios)
+    initial_capital (float): Starting amount for every portfolio
+    periods_per_year (int): Return periods per year (default 252)
+
+    Returns:
+    dict: Metric name -> ndarray of length portfolios
+    """
+    portfolio_returns = np.asarray(portfolio_returns, dtype=float)
+    if portfolio_returns.ndim == 1:
+        portfolio_returns = portfolio_returns[:, None]
+    num_days, num_portfolios = portfolio_returns.shape
+    if num_days < 2:
+        raise ValueError("Need at least 2 periods of returns to calculate metrics")
+
+    # Wealth relative to initial capital: W(t) / W(0) = ∏(1 + r)
+    growth = np.cumprod(1 + portfolio_returns, axis=0)
+    final_wealth = initial_capital * growth[-1]
+
+    num_years = num_days / periods_per_year
+    annual_return = growth[-1] ** (1 / num_years) - 1
+    annual_volatility = portfolio_returns.std(axis=0, ddof=1) * np.sqrt(periods_per_year)
+    sharpe_ratio = np.divide(annual_return, annual_volatility,
+                             out=np.zeros(num_portfolios), where=annual_volatility > 0)
+
+    # Maximum drawdown (the starting capital counts as the first peak)
+    running_max = np.maximum(np.maximum.accumulate(growth, axis=0), 1.0)
+    max_drawdown = np.minimum((growth / running_max - 1).min(axis=0), 0.0)
+
+    return {
+        'Initial Capital': np.full(num_portfolios, float(initial_capital)),
+        'Final Wealth': final_wealth,
+        'Total Return': (growth[-1] - 1) * 100,
+        'Annual Return': annual_return * 100,
+        'Annual Volatility': annual_volatility * 100,
+        'Sharpe Ratio': sharpe_ratio,
+        'Max Drawdown': max_drawdown * 100,
+        'Best Day': portfolio_returns.max(axis=0) * 100,
+        'Worst Day': portfolio_returns.min(axis=0) * 100,
+        'Days Traded': np.full(num_portfolios, num_days)
+    }
+
+
+class PortfolioSweep:
+    """
+    Evaluate many weight vectors against one returns history.
+    Candidates are processed in memory-bounded chunks, spread over threads
+    (NumPy releases the GIL inside matmul/cumprod, so threads use every core
+    without copying the returns matrix into other processes).
+    """
+
+    def __init__(self, returns, initial_capital, max_chunk_bytes=64 * 2**20, n_workers=None):
+        """
+        Parameters:
+        returns (DataFrame or ndarray): Stock returns, shape (days, assets)
+        initial_capital (float): Starting amount for every candidate
+        max_chunk_bytes (int): Memory budget for one chunk's (days x candidates) arrays
+        n_workers (int): Threads to use (default: number of CPU cores)
+        """
+        if isinstance(returns, pd.DataFrame):
+            self.assets = list(returns.columns)
+            self.index = returns.index
+        else:
+            self.assets = None
+            self.index = None
+        self.returns = np.ascontiguousarray(returns, dtype=float)
+        if self.returns.ndim != 2 or len(self.returns) < 2:
+            raise ValueError("Returns must be a (days x assets) matrix with at least 2 days")
+        if np.isnan(self.returns).any():
+            raise ValueError("Returns contain NaN values - drop or fill them first")
+
+        self.initial_capital = initial_capital
+        self.max_chunk_bytes = max_chunk_bytes
+        self.n_workers = n_workers or os.cpu_count() or 1
+
+    def _check_weights(self, weights):
+        """Return weights as a (assets x candidates) float matrix."""
+        weights = np.asarray(weights, dtype=float)
+        if weights.ndim == 1:
+            weights = weights[:, None]
+        if weights.shape[0] != self.returns.shape[1]:
+            raise ValueError(f"Weights have {weights.shape[0]} rows but there are "
+                             f"{self.returns.shape[1]} assets")
+        if not np.allclose(weights.sum(axis=0), 1.0):
+            raise ValueError("Weights must sum to 1")
+        return weights
+
+    def chunk_size(self):
+        """
+        Candidates per chunk.
+        A chunk holds about 3 (days x candidates) float64 arrays at once:
+        portfolio returns, wealth growth and drawdown.
+        """
+        bytes_per_candidate = 3 * 8 * self.returns.shape[0]
+        return max(1, self.max_chunk_bytes // bytes_per_candidate)
+
+    def portfolio_returns(self, weights):
+        """Return series of every candidate: returns @ W, shape (days, candidates)."""
+        return self.returns @ self._check_weights(weights)
+
+    def wealth_curves(self, weights):
+        """
+        Wealth over time for every candidate, shape (days + 1, candidates).
+        Row 0 is the initial capital (same layout as calculate_wealth_history).
+        """
+        growth = np.cumprod(1 + self.portfolio_returns(weights), axis=0)
+        wealth = np.empty((len(growth) + 1, growth.shape[1]))
+        wealth[0] = self.initial_capital
+        wealth[1:] = self.initial_capital * growth
+        return wealth
+
+    def _run_chunk(self, weights):
+        return sweep_metrics(self.returns @ weights, self.initial_capital)
+
+    def run(self, weights):
+        """
+        Calculate metrics for every candidate weight vector.
+
+        Parameters:
+        weights (ndarray): Shape (assets, candidates), each column sums to 1
+
+        Returns:
+        DataFrame: One row per candidate, columns as in calculate_metrics
+        """
+        weights = self._check_weights(weights)
+        step = self.chunk_size()
+        chunks = [weights[:, i:i + step] for i in range(0, weights.shape[1], step)]
+
+        if self.n_workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.n_workers) as pool:
+                results = list(pool.map(self._run_chunk, chunks))
+        else:
+            results = [self._run_chunk(chunk) for chunk in chunks]
+
+        metrics = {name: np.concatenate([r[name] for r in results]) for name in results[0]}
+        return pd.DataFrame(metrics)
+
+    def best(self, weights, by='Sharpe Ratio', top=5):
+        """Return the top candidates by a metric, with their weights."""
+        weights = self._check_weights(weights)
+        metrics = self.run(weights)
+        best = metrics.nlargest(top, by)
+        labels = self.assets or [f'Asset {i}' for i in range(weights.shape[0])]
+        best_weights = pd.DataFrame(weights[:, best.index].T, index=best.index, columns=labels)
+        return pd.concat([best, best_weights], axis=1)
+
+
+def random_weights(num_assets, num_candidates, seed=None):
+    """Random long-only weight vectors (uniform on the simplex), shape (assets, candidates)."""
+    rng = np.random.default_rng(seed)
+    weights = rng.exponential(size=(num_assets, num_candidates))
+    return weights / weights.sum(axis=0)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("SWEEPING 20,000 RANDOM PORTFOLIOS OVER 4 STOCKS")
+    print("Scenario: 4 years of simulated daily returns")
+
+    rng = np.random.default_rng(42)
+    num_days = 252 * 4
+    mean_returns = np.array([0.0008, 0.0006, 0.0007, 0.0005])
+    volatilities = np.array([0.018, 0.015, 0.017, 0.020])
+    returns = pd.DataFrame(rng.normal(mean_returns, volatilities, size=(num_days, 4)),
+                           columns=['AAPL', 'MSFT', 'GOOGL', 'AMZN'])
+
+    sweep = PortfolioSweep(returns, initial_capital=10000)
+    weights = random_weights(4, 20000, seed=1)
+
+    start = time.perf_counter()
+    metrics = sweep.run(weights)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nEvaluated {len(metrics):,} portfolios in {elapsed:.3f}s "
+          f"({sweep.chunk_size():,} candidates per chunk)")
+    print("\nTOP 5 BY SHARPE RATIO:")
+    print(sweep.best(weights, top=5)[['Annual Return', 'Annual Volatility', 'Sharpe Ratio',
+                                       'AAPL', 'MSFT', 'GOOGL', 'AMZN']].round(3).to_string())
@@ -4,17 +4,36 @@ Combines: OOP, NumPy, Pandas, Integration, Visualization
 """
 
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import yfinance as yf
 from datetime import date
 from datetime import datetime
 
-class PortfolioWealthTracker:
+from week1.chart_rendering import render_portfolio_reports
+from week1.day4.return_pyramid import PERIODS_PER_YEAR, ReturnPyramid
+from week1.day5.bootstrap import bootstrap_metrics
+from week1.day5.cash_flows import regular_schedule, simulate_cash_flows
+from week1.day5.portfolio_sweep import PortfolioSweep
+from week1.day5.risk import portfolio_tail_risk, tail_risk
+from week1.downsampling import downsample, pixel_width
+from week1.lazy_imports import lazy_import
+from week1.lazy_results import LazyGraph, computed, memoized
+from week1.result_cache import cached, default_cache
+from week1.tracing import count, traced
+
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+yf = lazy_import('yfinance')
+
+class PortfolioWealthTracker(LazyGraph):
     """
     Track wealth accumulation for a portfolio over time.
     Uses integration concepts to calculate cumulative returns.
+    Data, returns, wealth and drawdown are computed on first use and reused
+    until tickers, weights, capital or dates change.
+    Downloads and metrics are also kept in result_cache (memory + disk) across
+    sessions; set result_cache = None to always recompute.
     """
+    result_cache = default_cache()
+    
     
     def __init__(self, tickers, weights, initial_capital, start_date= None, end_date=None):
         """
@@ -37,12 +56,56 @@ class PortfolioWealthTracker:
         
         # Validate weights
         assert np.isclose(self.weights.sum(), 1.0), "Weights must sum to 1"
+    
+    @computed('tickers', 'start_date', 'end_date')
+    def data(self):
+        """Closing prices, downloaded on first access."""
+        return self.download_data()
+    
+    @computed('data')
+    def returns(self):
+        """Individual stock returns."""
+        return self.data.pct_change().dropna()
+    
+    @computed('returns', 'weights')
+    def portfolio_returns(self):
+        """Portfolio returns = weighted sum of stock returns."""
+        return self.returns @ self.weights
+    
+    @computed('data', 'portfolio_returns', 'initial_capital')
+    def wealth_history(self):
+        """
+        Wealth over time.
+        This is the INTEGRAL of returns!
+        """
+        # Discrete compounding: W(t) = W(0) × ∏(1 + r(t))
+        wealth = np.array([self.initial_capital])
         
-        self.data = None
-        self.returns = None
-        self.portfolio_returns = None
-        self.wealth_history = None
+        for r in self.portfolio_returns:
+            new_wealth = wealth[-1] * (1 + r)
+            wealth = np.append(wealth, new_wealth)
+        
+        # Create DataFrame
+        dates = [self.data.index[0]] + list(self.portfolio_returns.index)
+        
+        return pd.DataFrame({
+            'Date': dates,
+            'Wealth': wealth
+        }).set_index('Date')
+    
+    @computed('wealth_history')
+    def wealth_pyramid(self):
+        """Weekly/monthly/... portfolio returns, built once for all later queries."""
+        return ReturnPyramid(self.wealth_history['Wealth'])
+    
+    @computed('wealth_history')
+    def drawdown(self):
+        """Decline from the running peak of wealth (0 = at a new high, -0.2 = 20% below)."""
+        cumulative_max = self.wealth_history['Wealth'].expanding().max()
+        return (self.wealth_history['Wealth'] - cumulative_max) / cumulative_max
     
+    @traced()
+    @cached('tickers', 'start_date', 'end_date', as_of='end_date')
     def download_data(self):
         """Download price data for all stocks."""
         print(f"Downloading data for {len(self.tickers)} stocks...")
@@ -53,6 +116,8 @@ class PortfolioWealthTracker:
         #Extract closing prices
         # If multiple tickers, this would create a DataFrame with columns for each
         self.data = data['Close']
+        count('rows downloaded', len(self.data))
+        count('tickers downloaded', len(self.tickers))
         
         print(f"Downloaded {len(self.data)} days of data")
         return self.data
@@ -61,12 +126,6 @@ class PortfolioWealthTracker:
         """Calculate portfolio returns (weighted average of stock returns)."""
         if self.data is None or self.data.empty:
             raise ValueError(f"Failed to download data for {self.tickers}") 
-        
-        # Individual stock returns
-        self.returns = self.data.pct_change().dropna()
-        
-        # Portfolio returns = weighted sum
-        self.portfolio_returns = np.dot(self.returns,self.weights)
        
         return self.portfolio_returns
     
@@ -81,25 +140,19 @@ class PortfolioWealthTracker:
         if self.portfolio_returns is None or self.portfolio_returns.empty:
             raise ValueError(f"Failed to download data for {self.tickers}") 
         
-        # Discrete compounding: W(t) = W(0) × ∏(1 + r(t))
-        wealth = np.array([self.initial_capital])
-        
-        for r in self.portfolio_returns:
-            new_wealth = wealth[-1] * (1 + r)
-            wealth = np.append(wealth, new_wealth)
-        
-        # Create DataFrame
-        dates = [self.data.index[0]] + list(self.portfolio_returns.index)
-        
-        self.wealth_history = pd.DataFrame({
-            'Date': dates,
-            'Wealth': wealth
-        }).set_index('Date')
-        
         return self.wealth_history
     
-    def calculate_metrics(self):
-        """Calculate performance metrics."""
+    def period_returns(self, horizon='daily'):
+        """Portfolio returns at a horizon: 'daily', 'weekly', 'monthly', 'quarterly' or 'annual'."""
+        return self.wealth_pyramid.returns(horizon)['Wealth'].dropna()
+    
+    @memoized('portfolio_returns', 'wealth_history', 'wealth_pyramid', 'drawdown', 'initial_capital')
+    @cached('data', 'weights', 'initial_capital')
+    def calculate_metrics(self, horizon='daily'):
+        """
+        Calculate performance metrics.
+        horizon: returns used for volatility and tail risk ('daily', 'weekly', 'monthly', ...)
+        """
         if self.portfolio_returns is None:
             raise ValueError(f"Failed to download data for {self.tickers}")
         
@@ -114,13 +167,15 @@ class PortfolioWealthTracker:
         num_years = num_days / 252
         
         annual_return = (final_wealth / self.initial_capital) ** (1/num_years) - 1
-        annual_volatility = self.portfolio_returns.std() * np.sqrt(252)
+        period_returns = self.portfolio_returns if horizon == 'daily' else self.period_returns(horizon)
+        annual_volatility = np.std(period_returns, ddof=1) * np.sqrt(PERIODS_PER_YEAR[horizon])
         sharpe_ratio = annual_return / annual_volatility if annual_volatility > 0 else 0
         
         # Maximum drawdown
-        cumulative_max = self.wealth_history['Wealth'].expanding().max()
-        drawdown = (self.wealth_history['Wealth'] - cumulative_max) / cumulative_max
-        max_drawdown = drawdown.min()
+        max_drawdown = self.drawdown.min()
+        
+        # Tail risk: 1-period historical VaR / CVaR at 95% (positive = loss)
+        risk = tail_risk(period_returns, confidence_levels=(0.95,), methods=('historical',))
         
         metrics = {
             'Initial Capital': self.initial_capital,
@@ -132,15 +187,93 @@ class PortfolioWealthTracker:
             'Max Drawdown': max_drawdown * 100,
             'Best Day': self.portfolio_returns.max() * 100,
             'Worst Day': self.portfolio_returns.min() * 100,
+            'VaR 95%': risk.iloc[0, 0] * 100,
+            'CVaR 95%': risk.iloc[1, 0] * 100,
             'Days Traded': num_days
         }
         
         return metrics
     
-    def plot_wealth_accumulation(self):
+    @traced()
+    def metric_confidence_intervals(self, num_resamples=2000, method='stationary', confidence=0.95):
+        """
+        Bootstrap confidence intervals for the metrics in calculate_metrics.
+        
+        Parameters:
+        num_resamples (int): Number of resampled return histories
+        method (str): 'iid', 'block' or 'stationary'
+        confidence (float): Confidence level (0.95 = 95%)
+        
+        Returns:
+        DataFrame: Estimate, Std Error, Lower, Upper for each metric
+        """
+        if self.portfolio_returns is None:
+            raise ValueError("No portfolio returns available. Call calculate_portfolio_returns() first.")
+        
+        intervals = bootstrap_metrics(np.asarray(self.portfolio_returns), num_resamples=num_resamples,
+                                      method=method, confidence=confidence)
+        return intervals.droplevel('Asset')
+    
+    @traced()
+    def tail_risk(self, confidence_levels=(0.95, 0.99), horizons=(1, 10), weights=None):
+        """
+        VaR and CVaR of the portfolio (historical, parametric, Cornish-Fisher).
+        Pass a weights matrix (stocks x candidates) to get every candidate at once.
+        """
+        if weights is None:
+            if self.portfolio_returns is None:
+                raise ValueError("No portfolio returns available. Call calculate_portfolio_returns() first.")
+            return tail_risk(self.portfolio_returns.rename('Portfolio'), confidence_levels=confidence_levels,
+                             horizons=horizons)
+        
+        if self.returns is None or self.returns.empty:
+            raise ValueError("No returns data available. Call calculate_portfolio_returns() first.")
+        return portfolio_tail_risk(self.returns, weights, confidence_levels=confidence_levels, horizons=horizons)
+    
+    @traced()
+    def sweep_weights(self, weights):
+        """
+        Evaluate many alternative weight vectors on the downloaded returns.
+        Reuses this tracker's data - no extra download per candidate.
+        
+        Parameters:
+        weights (ndarray): Shape (stocks, candidates), each column sums to 1
+        
+        Returns:
+        DataFrame: One row of metrics per candidate
+        """
+        if self.returns is None or self.returns.empty:
+            raise ValueError("No returns data available. Call calculate_portfolio_returns() first.")
+        
+        return PortfolioSweep(self.returns, self.initial_capital).run(weights)
+    
+    @traced()
+    def render_reports(self, weights, output_dir, names=None, n_workers=None):
+        """
+        Write a wealth report chart (as plot_wealth_accumulation) for each
+        weight vector, rendered headlessly in a process pool.
+        
+        Parameters:
+        weights (ndarray): Shape (stocks, portfolios), each column sums to 1
+        output_dir (str): Directory for the PNG files
+        names (list): File names without extension (default: portfolio_0000, ...)
+        n_workers (int): Worker processes (default: CPU cores)
+        
+        Returns:
+        list: Paths of the written files
+        """
+        if self.returns is None or self.returns.empty:
+            raise ValueError("No returns data available. Call calculate_portfolio_returns() first.")
+        
+        return render_portfolio_reports(self.returns, weights, output_dir, names=names,
+                                        initial_capital=self.initial_capital, n_workers=n_workers)
+    
+    @traced()
+    def plot_wealth_accumulation(self, horizon='daily'):
         """
         Visualize wealth accumulation over time.
         This is visualizing the INTEGRAL of returns.
+        horizon: returns shown in the middle panel ('daily', 'weekly', 'monthly', ...)
         """
         if self.wealth_history is None:
             raise ValueError(f"Failed to download data for {self.tickers}")
@@ -149,29 +282,33 @@ class PortfolioWealthTracker:
             raise ValueError(f"Failed to download data for {self.tickers}")
         
         fig, axes = plt.subplots(3, 1, figsize=(14, 12))
+        # Long histories are cut to about 2 points per pixel column (every peak/trough kept)
+        points = 2 * pixel_width(axes[0])
         
         # PLOT 1: Wealth over time
-        axes[0].plot(self.wealth_history.index, self.wealth_history['Wealth'], 'b-', linewidth=2)
+        dates, wealth = downsample(self.wealth_history.index, self.wealth_history['Wealth'], points)
+        axes[0].plot(dates, wealth, 'b-', linewidth=2)
         axes[0].axhline(y=self.initial_capital, color='red', linestyle='--', linewidth=1, alpha=0.5, label='Initial Capital')
-        axes[0].fill_between(self.wealth_history.index,  self.initial_capital, self.wealth_history['Wealth'], where=(self.wealth_history['Wealth'] >= self.initial_capital),color='green', alpha=0.3, label='Profit')
-        axes[0].fill_between(self.wealth_history.index, self.initial_capital, self.wealth_history['Wealth'], where=(self.wealth_history['Wealth'] < self.initial_capital),color='red', alpha=0.3, label='Loss')
+        axes[0].fill_between(dates,  self.initial_capital, wealth, where=(wealth >= self.initial_capital),color='green', alpha=0.3, label='Profit')
+        axes[0].fill_between(dates, self.initial_capital, wealth, where=(wealth < self.initial_capital),color='red', alpha=0.3, label='Loss')
         axes[0].set_title('Portfolio Wealth Over Time (Integration of Returns)', fontsize=14, fontweight='bold')
         axes[0].set_ylabel('Wealth ($)', fontsize=12)
         axes[0].legend()
         axes[0].grid(True, alpha=0.3)
         
         # PLOT 2: Daily returns (this is like the derivative)
-        axes[1].plot(self.portfolio_returns.index, self.portfolio_returns * 100,  'g-', linewidth=1, alpha=0.7)
+        returns = self.portfolio_returns if horizon == 'daily' else self.period_returns(horizon)
+        returns = downsample(returns.index, returns, points)[1]
+        axes[1].plot(returns.index, returns * 100,  'g-', linewidth=1, alpha=0.7)
         axes[1].axhline(y=0, color='black', linestyle='--', linewidth=1)
-        axes[1].fill_between(self.portfolio_returns.index, 0, self.portfolio_returns * 100, where=(self.portfolio_returns > 0), color='green', alpha=0.3)
-        axes[1].fill_between(self.portfolio_returns.index, 0, self.portfolio_returns * 100, where=(self.portfolio_returns < 0), color='red', alpha=0.3)
-        axes[1].set_title('Daily Portfolio Returns (Derivative of Wealth)', fontsize=14, fontweight='bold')
+        axes[1].fill_between(returns.index, 0, returns * 100, where=(returns > 0), color='green', alpha=0.3)
+        axes[1].fill_between(returns.index, 0, returns * 100, where=(returns < 0), color='red', alpha=0.3)
+        axes[1].set_title(f'{horizon.title()} Portfolio Returns (Derivative of Wealth)', fontsize=14, fontweight='bold')
         axes[1].set_ylabel('Return (%)', fontsize=12)
         axes[1].grid(True, alpha=0.3)
         
         # PLOT 3: Drawdown
-        cumulative_max = self.wealth_history['Wealth'].expanding().max()
-        drawdown = (self.wealth_history['Wealth'] - cumulative_max) / cumulative_max * 100
+        drawdown = downsample(self.drawdown.index, self.drawdown, points)[1] * 100
         
         axes[2].fill_between(drawdown.index, 0, drawdown, color='red', alpha=0.5)
         axes[2].plot(drawdown.index, drawdown, 'r-', linewidth=1)
@@ -184,6 +321,7 @@ class PortfolioWealthTracker:
         plt.savefig('week1/day5/portfolio_wealth_tracker.png', dpi=150, bbox_inches='tight')
         plt.show()
     
+    @traced()
     def generate_report(self):
         """Generate comprehensive performance report."""
         metrics = self.calculate_metrics()
@@ -212,6 +350,8 @@ class PortfolioWealthTracker:
         print(f"  {'Max Drawdown:':<28} {metrics['Max Drawdown']:>11.2f}%")
         print(f"  {'Best Day:':<28} {metrics['Best Day']:>11.2f}%")
         print(f"  {'Worst Day:':<28} {metrics['Worst Day']:>11.2f}%")
+        print(f"  {'1-Day VaR (95%):':<28} {metrics['VaR 95%']:>11.2f}%")
+        print(f"  {'1-Day CVaR (95%):':<28} {metrics['CVaR 95%']:>11.2f}%")
         
         print("\n" + "="*70)
         print("THE INTEGRATION CONNECTION:")
@@ -228,31 +368,6 @@ class PortfolioWealthTracker:
         print("="*70)
 
 
-# EXAMPLE 1: Tech Portfolio (2023)
-print("="*70)
-print("EXAMPLE 1: TECH PORTFOLIO")
-print("="*70)
-
-tech_portfolio = PortfolioWealthTracker(
-    tickers=['AAPL', 'MSFT', 'GOOGL', 'AMZN'],
-    weights=[0.25, 0.25, 0.25, 0.25],
-    initial_capital=10000,
-    
-)
-
-tech_portfolio.download_data()
-tech_portfolio.calculate_wealth_history()
-tech_portfolio.plot_wealth_accumulation()
-tech_portfolio.generate_report()
-
-
-# EXAMPLE 2: Your future portfolio (simulate)
-print("\n\n" + "="*70)
-print("EXAMPLE 2: YOUR 4-YEAR UNIVERSITY PLAN (SIMULATED)")
-print("="*70)
-print("Scenario: You start with $2,000 and add $200/month")
-print("Target: 25% annual return")
-
 def simulate_contributions():
     """
     Simulate wealth accumulation with:
@@ -266,20 +381,10 @@ def simulate_contributions():
     daily_return = (1 + annual_return) ** (1/252) - 1  # Convert to daily
     
     num_days = 252 * 4  # 4 years
-    wealth = [initial_capital]
-    contributions = [0]
     
-    for day in range(num_days):
-        # Add contribution at start of each month (every ~21 trading days)
-        if day % 21 == 0 and day > 0:
-            contribution = monthly_contribution
-        else:
-            contribution = 0
-        
-        # Grow previous wealth + add contribution
-        new_wealth = wealth[-1] * (1 + daily_return) + contribution
-        wealth.append(new_wealth)
-        contributions.append(contributions[-1] + contribution)
+    # Contribution at the start of each month (every ~21 trading days)
+    schedule = regular_schedule(num_days, monthly_contribution, every=21)
+    wealth, contributions = simulate_cash_flows(initial_capital, np.full(num_days, daily_return), schedule)
     
     # Plot
     days = np.arange(len(wealth))
@@ -330,13 +435,6 @@ def simulate_contributions():
     print(f"  - ${wealth[-1]:,.0f} to scale with")
     print("="*70)
 
-simulate_contributions()
-
-
-# EXAMPLE 3: Path to billionaire (math check)
-print("\n\n" + "="*70)
-print("EXAMPLE 3: THE BILLIONAIRE MATH")
-print("="*70)
 
 def billionaire_calculator(initial, annual_return, target=1e9):
     """
@@ -364,20 +462,55 @@ def billionaire_calculator(initial, annual_return, target=1e9):
     
     return years
 
-print("\nScenario 1: Conservative (20% annual)")
-billionaire_calculator(initial=10000, annual_return=0.20)
 
-print("\n" + "-"*70)
-print("\nScenario 2: Optimistic (30% annual)")
-billionaire_calculator(initial=10000, annual_return=0.30)
+if __name__ == "__main__":
+    # EXAMPLE 1: Tech Portfolio (2023)
+    print("="*70)
+    print("EXAMPLE 1: TECH PORTFOLIO")
+    print("="*70)
+
+    tech_portfolio = PortfolioWealthTracker(
+        tickers=['AAPL', 'MSFT', 'GOOGL', 'AMZN'],
+        weights=[0.25, 0.25, 0.25, 0.25],
+        initial_capital=10000,
+
+    )
 
-print("\n" + "-"*70)
-print("\nScenario 3: Elite (40% annual, like Renaissance)")
-billionaire_calculator(initial=10000, annual_return=0.40)
+    tech_portfolio.download_data()
+    tech_portfolio.calculate_wealth_history()
+    tech_portfolio.plot_wealth_accumulation()
+    tech_portfolio.generate_report()
 
-print("\n" + "="*70)
-print("KEY INSIGHT:")
-print("Even at 40% annual returns (Renaissance-level), it takes ~30 years")
-print("from $10K to $1B. This is why starting NOW at age 20 matters.")
-print("Every year of head start = millions in final wealth.")
-print("="*70)
+
+    # EXAMPLE 2: Your future portfolio (simulate)
+    print("\n\n" + "="*70)
+    print("EXAMPLE 2: YOUR 4-YEAR UNIVERSITY PLAN (SIMULATED)")
+    print("="*70)
+    print("Scenario: You start with $2,000 and add $200/month")
+    print("Target: 25% annual return")
+
+    simulate_contributions()
+
+
+    # EXAMPLE 3: Path to billionaire (math check)
+    print("\n\n" + "="*70)
+    print("EXAMPLE 3: THE BILLIONAIRE MATH")
+    print("="*70)
+
+    print("\nScenario 1: Conservative (20% annual)")
+    billionaire_calculator(initial=10000, annual_return=0.20)
+
+    print("\n" + "-"*70)
+    print("\nScenario 2: Optimistic (30% annual)")
+    billionaire_calculator(initial=10000, annual_return=0.30)
+
+    print("\n" + "-"*70)
+    print("\nScenario 3: Elite (40% annual, like Renaissance)")
+    billionaire_calculator(initial=10000, annual_return=0.40)
+
+    print("\n" + "="*70)
+    print("KEY INSIGHT:")
+    print("Even at 40% annual returns (Renaissance-level), it takes ~30 years")
+    print("from $10K to $1B. This is why starting NOW at age 20 matters.")
+    print("Every year of head start = millions in final wealth.")
+    print("="*70)
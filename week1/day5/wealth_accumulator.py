@@ -4,9 +4,50 @@ Daily returns → Cumulative wealth (this is integration!)
 """
 
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import yfinance as yf
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+plt = lazy_import('matplotlib.pyplot')
+yf = lazy_import('yfinance')
+
+def compound_interest(rates, years, periods_per_year):
+    """
+    Closed-form interest earned per $1 over `years` at annual nominal rates,
+    vectorized over accounts:
+
+        periods_per_year = m > 0:   (1 + r/m)^(m t) - 1     (discrete, m periods a year)
+        periods_per_year = inf:     exp(r t) - 1            (continuous)
+        periods_per_year = 0:       r t                     (simple, no compounding)
+
+    Computed through log1p/expm1, so a 30-day accrual of 1% keeps its digits.
+
+    Parameters:
+    rates (float or ndarray): Annual nominal rates (0.045 = 4.5%)
+    years (float or ndarray): Length of the period in years
+    periods_per_year (float or ndarray): Compounding periods per year (see above)
+
+    Returns:
+    ndarray: Growth factor - 1
+    """
+    rates = np.asarray(rates, dtype=float)
+    m = np.asarray(periods_per_year, dtype=float)
+    years = np.asarray(years, dtype=float)
+    continuous, simple = np.isinf(m), m == 0
+    if not continuous.any() and not simple.any():
+        return np.expm1(m * years * np.log1p(rates / m))
+
+    # One expression for every account: discrete with m, the other two patched in
+    with np.errstate(divide='ignore', invalid='ignore'):
+        interest = np.expm1(m * years * np.log1p(rates / m))
+    interest = np.where(continuous, np.expm1(rates * years), interest)
+    return np.where(simple, rates * years, interest)
+
+
+def growth_factors(rates, years, periods_per_year):
+    """Balance multiplier over `years`: 1 + compound_interest(...)."""
+    return 1 + compound_interest(rates, years, periods_per_year)
+
 
 class WealthAccumulator:
     """
@@ -49,6 +90,15 @@ class WealthAccumulator:
         
         return wealth
     
+    def compound_at_rate(self, annual_rate, years, periods_per_year=np.inf):
+        """
+        Wealth after `years` at a constant annual rate, in closed form
+        (see compound_interest): the limit of discrete_compounding with
+        rate / m per period, and exactly exp(r t) for continuous compounding.
+        years may be an array (a whole wealth path in one call).
+        """
+        return self.initial_capital * growth_factors(annual_rate, years, periods_per_year)
+
     def compare_methods(self, returns):
         """
         Compare discrete vs continuous compounding.
@@ -94,58 +144,6 @@ class WealthAccumulator:
         print("="*70)
 
 
-# EXAMPLE: Simulate trading for 1 year
-print("SIMULATING 1 YEAR OF TRADING")
-print("Scenario: Average 0.1% daily return with volatility")
-
-np.random.seed(42)  # Reproducible results
-
-# Generate returns: mean 0.1% per day, std dev 1.5%
-num_days = 252  # Trading days in a year
-mean_return = 0.001  # 0.1% per day
-volatility = 0.015   # 1.5% daily volatility
-
-returns = np.random.normal(mean_return, volatility, num_days)
-
-# Calculate wealth accumulation
-accumulator = WealthAccumulator(initial_capital=10000)
-accumulator.compare_methods(returns)
-
-
-# REAL MARKET DATA EXAMPLE
-print("\n\nREAL MARKET DATA: Apple Stock (2023)")
-
-# Download AAPL data
-aapl = yf.download('AAPL', start='2023-01-01', end='2024-01-01', progress=False)
-
-if aapl is None:
-   raise ValueError(f"Failed to download data for AAPL")
-
-aapl_returns = aapl['Close'].pct_change().dropna().values
-
-# If you invested $10,000 in AAPL on Jan 1, 2023:
-accumulator_aapl = WealthAccumulator(initial_capital=10000)
-accumulator_aapl.compare_methods(aapl_returns)
-
-
-# THE INTEGRATION CONNECTION
-print("\n" + "="*70)
-print("THE INTEGRATION CONNECTION")
-print("="*70)
-print("Daily returns r(t) are like the DERIVATIVE of wealth")
-print("  → Returns tell you the RATE OF CHANGE of wealth")
-print()
-print("Cumulative wealth W(t) is the INTEGRAL of returns")
-print("  → Wealth = ∫ r(t) dt (in continuous case)")
-print("  → Wealth = ∏ (1 + r(t)) (in discrete case)")
-print()
-print("This is the Fundamental Theorem of Calculus in finance!")
-print("  → Derivatives and integrals are inverse operations")
-print("  → Rate of change ↔ Accumulation")
-print("  → Returns ↔ Wealth")
-print("="*70)
-
-
 # ADVANCED: Calculate average return needed to reach goal
 def calculate_required_return(initial, target, num_days):
     """
@@ -168,16 +166,70 @@ def calculate_required_return(initial, target, num_days):
     print(f"Annualized return needed:      {(1 + required_return)**252 - 1:.2%}")
     print("="*70)
 
-# Example: Turn $10,000 into $1,000,000 in 10 years
-calculate_required_return(
-    initial=10000,
-    target=1000000,
-    num_days=252 * 10  # 10 years of trading
-)
-
-# Your billionaire goal
-calculate_required_return(
-    initial=10000,
-    target=1000000000,  # $1 billion
-    num_days=252 * 20   # 20 years
-)
\ No newline at end of file
+
+if __name__ == "__main__":
+    # EXAMPLE: Simulate trading for 1 year
+    print("SIMULATING 1 YEAR OF TRADING")
+    print("Scenario: Average 0.1% daily return with volatility")
+
+    np.random.seed(42)  # Reproducible results
+
+    # Generate returns: mean 0.1% per day, std dev 1.5%
+    num_days = 252  # Trading days in a year
+    mean_return = 0.001  # 0.1% per day
+    volatility = 0.015   # 1.5% daily volatility
+
+    returns = np.random.normal(mean_return, volatility, num_days)
+
+    # Calculate wealth accumulation
+    accumulator = WealthAccumulator(initial_capital=10000)
+    accumulator.compare_methods(returns)
+
+
+    # REAL MARKET DATA EXAMPLE
+    print("\n\nREAL MARKET DATA: Apple Stock (2023)")
+
+    # Download AAPL data
+    aapl = yf.download('AAPL', start='2023-01-01', end='2024-01-01', progress=False)
+
+    if aapl is None:
+       raise ValueError(f"Failed to download data for AAPL")
+
+    aapl_returns = aapl['Close'].pct_change().dropna().values
+
+    # If you invested $10,000 in AAPL on Jan 1, 2023:
+    accumulator_aapl = WealthAccumulator(initial_capital=10000)
+    accumulator_aapl.compare_methods(aapl_returns)
+
+
+    # THE INTEGRATION CONNECTION
+    print("\n" + "="*70)
+    print("THE INTEGRATION CONNECTION")
+    print("="*70)
+    print("Daily returns r(t) are like the DERIVATIVE of wealth")
+    print("  → Returns tell you the RATE OF CHANGE of wealth")
+    print()
+    print("Cumulative wealth W(t) is the INTEGRAL of returns")
+    print("  → Wealth = ∫ r(t) dt (in continuous case)")
+    print("  → Wealth = ∏ (1 + r(t)) (in discrete case)")
+    print()
+    print("This is the Fundamental Theorem of Calculus in finance!")
+    print("  → Derivatives and integrals are inverse operations")
+    print("  → Rate of change ↔ Accumulation")
+    print("  → Returns ↔ Wealth")
+    print("="*70)
+
+
+    # Example: Turn $10,000 into $1,000,000 in 10 years
+    calculate_required_return(
+        initial=10000,
+        target=1000000,
+        num_days=252 * 10  # 10 years of trading
+    )
+
+    # Your billionaire goal
+    calculate_required_return(
+        initial=10000,
+        target=1000000000,  # $1 billion
+        num_days=252 * 20   # 20 years
+    )
@@ -0,0 +1,209 @@
+"""
+Plot-Aware Downsampling
+A chart 2,000 pixels wide cannot show more than 2,000 distinct x positions.
+Years of minute bars (hundreds of thousands of points) only slow matplotlib
+down and make huge files - so reduce each series to about the pixel width
+of its axes before plotting, keeping what the eye would see:
+
+- minmax: split the series into one bucket per pixel column and keep each
+          bucket's lowest and highest point. Every peak and trough survives
+          exactly, so the drawn envelope is identical. (default)
+- lttb:   Largest-Triangle-Three-Buckets (Steinarsson, 2013): one point per
+          bucket, the one forming the largest triangle with its neighbours.
+          Keeps the visual shape with half the points of minmax.
+
+    x, y = downsample(prices.index, prices.values, pixel_width(ax))
+    plot_downsampled(ax, prices.index, prices, label='AAPL')
+
+Series that already fit are returned unchanged.
+"""
+
+import numpy as np
+
+# Resolution the repo saves charts at (plt.savefig(..., dpi=150))
+SAVE_DPI = 150
+
+
+def _numeric(x):
+    """x as floats (dates -> nanoseconds) for the triangle areas."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def minmax_indices(y, num_buckets):
+    """
+    Indices of the minimum and maximum of each bucket (plus first and last point).
+
+    Parameters:
+    y (ndarray): Values (NaN is skipped when a bucket has other values)
+    num_buckets (int): Number of equal-width buckets
+
+    Returns:
+    ndarray: Sorted indices into y, at most 2 * num_buckets + 2
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    size = -(-n // max(num_buckets, 1))
+    if size <= 1:
+        return np.arange(n)
+
+    # Pad to whole buckets with NaN, then one argmin/argmax per row
+    padded = np.full(-(-n // size) * size, np.nan)
+    padded[:n] = y
+    rows = padded.reshape(-1, size)
+    missing = np.isnan(rows)
+    lows = np.where(missing, np.inf, rows).argmin(axis=1)
+    highs = np.where(missing, -np.inf, rows).argmax(axis=1)
+    offsets = np.arange(len(rows)) * size
+    indices = np.concatenate([[0, n - 1], offsets + lows, offsets + highs])
+    return np.unique(indices[indices < n])
+
+
+def lttb_indices(x, y, num_points):
+    """
+    Largest-Triangle-Three-Buckets selection.
+
+    Parameters:
+    x (array-like): Positions (numbers or dates), increasing
+    y (ndarray): Finite values
+    num_points (int): Points to keep (at least 3)
+
+    Returns:
+    ndarray: Sorted indices into y, exactly num_points long
+    """
+    x, y = _numeric(x), np.asarray(y, dtype=float)
+    n = len(y)
+    if num_points >= n or num_points < 3:
+        return np.arange(n)
+
+    # First and last point are always kept; the rest is split into num_points - 2 buckets
+    edges = np.linspace(1, n - 1, num_points - 1).astype(int)
+    # Average point of every bucket (the "next bucket" corner of the triangle)
+    sum_x, sum_y = np.add.reduceat(x[1:n - 1], edges[:-1] - 1), np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    mean_x = np.append(sum_x / counts, x[-1])
+    mean_y = np.append(sum_y / counts, y[-1])
+
+    selected = np.empty(num_points, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(num_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        # Twice the triangle area (previous pick, candidate, next bucket's average)
+        area = np.abs((x[a] - mean_x[bucket + 1]) * (y[start:stop] - y[a])
+                      - (x[a] - x[start:stop]) * (mean_y[bucket + 1] - y[a]))
+        a = start + int(area.argmax())
+        selected[bucket + 1] = a
+    return selected
+
+
+def downsample(x, y, max_points, method='minmax'):
+    """
+    Reduce a series to about max_points points for plotting.
+
+    Parameters:
+    x (array-like): Positions (ndarray, DatetimeIndex, ...)
+    y (array-like): Values (ndarray or Series)
+    max_points (int): Target number of points (about the pixel width)
+    method (str): 'minmax' (keeps every peak/trough) or 'lttb'
+
+    Returns:
+    tuple: (x, y) subsets of the same types as the inputs
+    """
+    values = np.asarray(y, dtype=float)
+    if len(values) <= max_points:
+        return x, y
+    if method not in ('minmax', 'lttb'):
+        raise ValueError(f"Unknown downsampling method '{method}' (use 'minmax' or 'lttb')")
+
+    # Several columns (e.g. a one-column DataFrame): keep the points any column needs
+    columns = values.reshape(len(values), -1).T
+    selections = []
+    for column in columns:
+        if method == 'lttb' and np.isfinite(column).all():
+            selections.append(lttb_indices(x, column, max_points))
+        else:
+            # Two points (low, high) per bucket -> max_points / 2 buckets.
+            # Also used by 'lttb' when there are gaps, so they stay gaps.
+            selections.append(minmax_indices(column, max(max_points // 2, 1)))
+    indices = selections[0] if len(selections) == 1 else np.unique(np.concatenate(selections))
+
+    return _take(x, indices), _take(y, indices)
+
+
+def _take(data, indices):
+    """Rows of a Series, Index or array (keeps the type, so dates stay dates)."""
+    if hasattr(data, 'iloc'):
+        return data.iloc[indices]
+    if hasattr(data, 'shape'):
+        return data[indices]
+    return np.asarray(data)[indices]
+
+
+def pixel_width(ax, dpi=None):
+    """
+    Width of an axes in pixels of the saved image.
+
+    Parameters:
+    ax (Axes): Matplotlib axes
+    dpi (float): Output resolution (default: the larger of the figure dpi and SAVE_DPI)
+
+    Returns:
+    int: Pixel columns the data area covers
+    """
+    figure = ax.get_figure()
+    dpi = dpi or max(figure.dpi, SAVE_DPI)
+    return max(int(ax.get_position().width * figure.get_figwidth() * dpi), 2)
+
+
+def plot_downsampled(ax, x, y, *args, method='minmax', max_points=None, **kwargs):
+    """
+    ax.plot(x, y, ...) with the series reduced to the axes' pixel width first.
+
+    Parameters:
+    ax (Axes): Where to plot
+    x, y (array-like): The series
+    method (str): 'minmax' or 'lttb'
+    max_points (int): Override the target (default: 2 points per pixel column for minmax, 1 for lttb)
+    *args, **kwargs: Passed to ax.plot
+
+    Returns:
+    list: The Line2D objects from ax.plot
+    """
+    if max_points is None:
+        max_points = pixel_width(ax) * (2 if method == 'minmax' else 1)
+    x, y = downsample(x, y, max_points, method)
+    return ax.plot(x, y, *args, **kwargs)
+
+
+if __name__ == "__main__":
+    import time
+
+    import matplotlib.pyplot as plt
+
+    print("DOWNSAMPLING 5 YEARS OF SIMULATED MINUTE BARS")
+    rng = np.random.default_rng(42)
+    minutes = 5 * 252 * 390
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, minutes)))
+    x = np.arange(minutes)
+
+    fig, ax = plt.subplots(figsize=(14, 6))
+    width = pixel_width(ax)
+    print(f"Points: {minutes:,}  axes width at {SAVE_DPI} dpi: {width} px")
+
+    for method in ('minmax', 'lttb'):
+        start = time.perf_counter()
+        x_small, y_small = downsample(x, prices, width * (2 if method == 'minmax' else 1), method)
+        elapsed = time.perf_counter() - start
+        print(f"  {method:<7} -> {len(y_small):>6,} points in {elapsed * 1000:6.1f} ms, "
+              f"max kept: {y_small.max() == prices.max()}, min kept: {y_small.min() == prices.min()}")
+
+    for label, series in (('full', (x, prices)), ('downsampled', downsample(x, prices, 2 * width))):
+        ax.clear()
+        ax.plot(*series, linewidth=1)
+        start = time.perf_counter()
+        fig.canvas.draw()
+        print(f"  draw {label:<12} {(time.perf_counter() - start) * 1000:7.1f} ms")
+    plt.close(fig)
@@ -0,0 +1,30 @@
+"""
+Lazy imports for heavy dependencies
+matplotlib, pandas and yfinance take hundreds of milliseconds to import.
+Modules that only need them inside some functions bind a stand-in instead:
+
+    plt = lazy_import('matplotlib.pyplot')
+    yf = lazy_import('yfinance')
+
+The real import happens on the first attribute access (plt.figure, yf.download),
+so `import week1.day5.numerical_integration` stays cheap and a pure-math
+caller never loads the plotting or download stack at all.
+"""
+
+import importlib
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Module stand-in that imports the real module on first attribute access."""
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.__name__)
+        # Copy the real namespace so later lookups don't come back here
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """Return a stand-in for module `name`; it is imported when first used."""
+    return _LazyModule(name)
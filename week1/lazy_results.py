@@ -0,0 +1,150 @@
+"""
+Lazy, memoized results for the analyzer classes
+
+Each derived result (returns, summary, correlation, wealth, drawdown, ...)
+names the attributes it is computed from. It is computed the first time
+it is read, kept, and thrown away only when one of its inputs is assigned
+a new value - directly or further up the chain:
+
+    data  ->  returns  ->  summary
+                      \\->  correlation
+
+So `analyzer.best_and_worst()` no longer has to follow a manual
+download -> returns -> stats order, and asking for the same summary twice
+costs nothing.
+
+Inputs are tracked by ASSIGNMENT (`obj.weights = new_weights`). Changing an
+array or DataFrame in place is not seen; assign a new object instead.
+Cached DataFrames are shared, so treat results as read-only.
+
+Computing a result (not reading a kept one) is a tracing span, so with
+week1.tracing enabled every stage shows up in the timeline.
+"""
+
+import functools
+
+from week1.tracing import record_shape, span
+
+
+def _cache(obj):
+    return obj.__dict__.setdefault('_lazy_cache', {})
+
+
+class computed:
+    """
+    Attribute computed on first access and memoized.
+
+    Usage:
+        @computed('data')
+        def returns(self):
+            return self.data.pct_change().dropna()
+
+    Assigning the attribute stores that value instead (and invalidates
+    everything that depends on it); `del obj.returns` forces a recompute.
+    """
+
+    def __init__(self, *depends_on):
+        self.depends_on = depends_on
+        self.func = None
+        self.name = None
+
+    def __call__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+        return self
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        cache = _cache(obj)
+        if self.name not in cache:
+            with span(f'{type(obj).__name__}.{self.name}') as current:
+                value = self.func(obj)
+                record_shape(current, value)
+            # The function may have assigned the attribute itself (e.g. download_data)
+            cache.setdefault(self.name, value)
+        return cache[self.name]
+
+    def __set__(self, obj, value):
+        _cache(obj)[self.name] = value
+
+    def __delete__(self, obj):
+        obj.invalidate(self.name)
+        _cache(obj).pop(self.name, None)
+
+
+def memoized(*depends_on):
+    """
+    Method whose result is memoized per argument combination and
+    invalidated like a computed attribute. None results (errors) are not kept.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            results = _cache(self).setdefault(method.__name__, {})
+            key = (args, tuple(sorted(kwargs.items())))
+            if key not in results:
+                with span(f'{type(self).__name__}.{method.__name__}') as current:
+                    value = method(self, *args, **kwargs)
+                    record_shape(current, value)
+                if value is None:
+                    return None
+                results[key] = value
+            return results[key]
+
+        wrapper.depends_on = depends_on
+        return wrapper
+
+    return decorate
+
+
+class LazyGraph:
+    """
+    Base class that wires computed attributes and memoized methods into a
+    dependency graph and invalidates downstream results on assignment.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        direct = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                depends_on = getattr(value, 'depends_on', None)
+                if depends_on is not None:
+                    direct[name] = depends_on
+
+        # input name -> every result that depends on it, directly or not
+        dependents = {}
+        for node, inputs in direct.items():
+            for name in inputs:
+                dependents.setdefault(name, set()).add(node)
+        changed = True
+        while changed:
+            changed = False
+            for name, nodes in dependents.items():
+                extra = set().union(*(dependents.get(node, set()) for node in nodes)) - nodes
+                if extra:
+                    nodes |= extra
+                    changed = True
+        cls._lazy_dependents = dependents
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        self.invalidate(name)
+
+    def invalidate(self, name=None):
+        """Forget results that depend on `name` (everything if name is None)."""
+        cache = _cache(self)
+        if name is None:
+            cache.clear()
+            return
+        for node in self._lazy_dependents.get(name, ()):
+            cache.pop(node, None)
+
+    def cached_results(self):
+        """Names of the results currently held in memory."""
+        return sorted(_cache(self))
@@ -0,0 +1,303 @@
+"""
+Result cache shared across sessions
+The same (tickers, dates, weights) analysis run again - tomorrow, in another
+process - comes back from the cache instead of being recomputed.
+
+Two tiers:
+- memory: the most recently used results of this process (LRU by count)
+- disk:   pickled results in a cache directory shared by all processes
+          (LRU by total size, least recently used files deleted first)
+
+Keys are content hashes (SHA-256) of everything the result depends on:
+the method, the package's source code, the input attributes (DataFrames and
+arrays hashed by value) and the call arguments. Same inputs and code -> same
+key, in any process; a file that no longer loads counts as a miss.
+
+Set the QUANT_CACHE_DIR environment variable to move the disk tier, or to
+an empty string to keep results in memory only.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+DEFAULT_DIRECTORY = Path.home() / '.cache' / 'quant-ai-month1'
+# Bump when the pickled layout of cached results changes
+CACHE_FORMAT = 1
+
+
+def _feed(digest, value):
+    """Add a value to a hash, by content, in a form that is the same in every process."""
+    if isinstance(value, pd.DataFrame):
+        digest.update(b'DataFrame')
+        _feed(digest, list(value.columns))
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(b'Series')
+        _feed(digest, value.name)
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f'ndarray{value.dtype.str}{value.shape}'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            _feed(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f'dict{len(value)}'.encode())
+        for key in sorted(value, key=repr):
+            _feed(digest, key)
+            _feed(digest, value[key])
+    else:
+        digest.update(f'{type(value).__name__}:{value!r};'.encode())
+
+
+def cache_key(*parts):
+    """Hex SHA-256 of the parts (strings, numbers, dates, arrays, DataFrames, ...)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        _feed(digest, part)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier (memory + disk) LRU cache of computed results.
+    """
+
+    def __init__(self, directory=None, max_memory_items=128, max_disk_bytes=512 * 2**20):
+        """
+        Parameters:
+        directory (str or Path): Disk tier location (None = memory only)
+        max_memory_items (int): Results kept in memory
+        max_disk_bytes (int): Total size of the disk tier
+        """
+        self.directory = Path(directory) if directory else None
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return self.directory / f'{key}.pkl'
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key, default=None):
+        """Cached value for a key (memory first, then disk), or default."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return self._memory[key]
+
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as file:
+                    value = pickle.load(file)
+                os.utime(path)  # mark as recently used for disk eviction
+            except FileNotFoundError:
+                pass
+            except Exception:
+                # Truncated, or pickled by another pandas/module layout: a miss, and useless from now on
+                path.unlink(missing_ok=True)
+            else:
+                self.hits_disk += 1
+                self._remember(key, value)
+                return value
+
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        """Store a value in both tiers."""
+        self._remember(key, value)
+        if self.directory is None:
+            return
+
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return  # kept in memory only
+        if len(payload) > self.max_disk_bytes:
+            return
+        # The result is already computed: a full disk or unwritable directory only skips the disk tier
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a unique temporary file, then rename, so another process or
+            # thread never reads a half-written file
+            handle, temporary = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+            try:
+                with os.fdopen(handle, 'wb') as file:
+                    file.write(payload)
+                os.replace(temporary, self._path(key))
+            except OSError:
+                Path(temporary).unlink(missing_ok=True)
+                raise
+            self._evict_disk()
+        except OSError:
+            pass
+
+    def _evict_disk(self):
+        """Delete least recently used files until the disk tier fits its budget."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Cached value, or compute() stored under key. None results are not stored."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def clear(self, disk=True):
+        """Forget everything (and delete the disk tier files if disk=True)."""
+        with self._lock:
+            self._memory.clear()
+        if disk and self.directory is not None and self.directory.exists():
+            for path in self.directory.glob('*.pkl'):
+                path.unlink(missing_ok=True)
+
+    def stats(self):
+        """Hit/miss counts and hit rate."""
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            'Memory Hits': self.hits_memory,
+            'Disk Hits': self.hits_disk,
+            'Misses': self.misses,
+            'Hit Rate': (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+            'Evictions': self.evictions,
+            'Memory Items': len(self._memory)
+        }
+
+
+_default_cache = None
+
+
+def default_cache():
+    """The process-wide cache (disk tier in QUANT_CACHE_DIR, default ~/.cache/quant-ai-month1)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache(os.environ.get('QUANT_CACHE_DIR', DEFAULT_DIRECTORY))
+    return _default_cache
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """
+    Hash of every source file of the package plus the cache format and the
+    Python/numpy/pandas versions. Part of every @cached key, so editing any
+    function a cached method calls (or upgrading pandas) starts a fresh cache.
+    """
+    digest = hashlib.sha256(f'format {CACHE_FORMAT}; python {sys.version_info[:2]}; '
+                            f'numpy {np.__version__}; pandas {pd.__version__}'.encode())
+    package = Path(__file__).resolve().parent
+    for path in sorted(package.rglob('*.py')):
+        digest.update(str(path.relative_to(package)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _is_open_ended(end_date):
+    """True if a date range reaches today or later - its prices can still change."""
+    return end_date is None or pd.Timestamp(end_date).date() >= date.today()
+
+
+def cached(*inputs, as_of=None):
+    """
+    Method decorator: look the result up in self.result_cache before computing.
+
+    The key hashes the method's code, the package source (code_version), the
+    named input attributes and the call arguments. as_of names an end-date attribute: a range ending today or
+    later also keys on today's date, so live data is refreshed once a day.
+    A result_cache of None disables caching.
+
+    Usage:
+        @cached('data', 'weights')
+        def calculate_metrics(self, horizon='daily'):
+            ...
+    """
+    def decorate(method):
+        # Editing the method changes its bytecode and therefore every key
+        code = method.__code__.co_code + repr(method.__code__.co_consts).encode()
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'result_cache', None)
+            if cache is None:
+                return method(self, *args, **kwargs)
+            parts = [code_version(), method.__module__, method.__qualname__, code,
+                     [getattr(self, name) for name in inputs], args, kwargs]
+            if as_of is not None and _is_open_ended(getattr(self, as_of)):
+                parts.append(date.today())
+            return cache.get_or_compute(cache_key(*parts), lambda: method(self, *args, **kwargs))
+
+        return wrapper
+
+    return decorate
+
+
+if __name__ == "__main__":
+    import time
+
+    print("RESULT CACHE: correlation of 500 simulated stocks, asked for 3 times")
+
+    rng = np.random.default_rng(42)
+    returns = pd.DataFrame(rng.normal(0, 0.01, (2520, 500)),
+                           index=pd.bdate_range('2015-01-01', periods=2520))
+
+    with tempfile.TemporaryDirectory() as directory:
+        first_session = ResultCache(directory)
+        key = cache_key('correlation', returns)
+
+        for label, cache in [('compute', first_session), ('memory', first_session),
+                             ('disk (new session)', ResultCache(directory))]:
+            start = time.perf_counter()
+            corr = cache.get_or_compute(key, returns.corr)
+            print(f"  {label:<20} {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+        print("\nFirst session:", first_session.stats())
+        print("Key changes with the data:", key != cache_key('correlation', returns * 1.01))
@@ -0,0 +1,282 @@
+"""
+Stage-Level Tracing
+Where did the time go in a slow run - download, returns, statistics, plots?
+
+Every computed stage of the analyzer classes (data, returns, panel, wealth,
+drawdown, ...) and every memoized/traced method records a timing SPAN when
+tracing is on; downloads add counters (rows, tickers). Spans nest, so a
+summary that triggers a download shows the download inside it.
+
+    from week1 import tracing
+    tracing.enable(memory=True)          # memory=True: tracemalloc peak per span
+    analyzer.summary_statistics()
+    print(tracing.summary())             # time per stage
+    tracing.export_chrome_trace('trace.json')   # open in chrome://tracing or ui.perfetto.dev
+
+Or without code changes:
+    QUANT_TRACE=trace.json python -m week1.day4.day4_multi_stock
+    python -m week1 run jobs.json --trace trace.json
+
+Disabled (the default) every hook is a single flag check.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+from week1.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+class _Tracer:
+    """Recorded events plus the per-thread stack of open spans."""
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.events = []
+        self.counters = {}
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+
+_tracer = _Tracer()
+
+
+class Span:
+    """One timed stage; add details with span.args['rows'] = ..."""
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        stack = _tracer.stack()
+        if _tracer.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # The enclosing spans saw `peak` so far; restart the peak for this one
+            for span in stack:
+                span.max_memory = max(span.max_memory, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = self.max_memory = current
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        stack = _tracer.stack()
+        stack.pop()
+        if _tracer.memory:
+            self.max_memory = max(self.max_memory, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].max_memory = max(stack[-1].max_memory, self.max_memory)
+            self.args['peak_memory_bytes'] = self.max_memory - self.start_memory
+        if exc_info[0] is not None:
+            self.args['error'] = exc_info[0].__name__
+        _tracer.events.append({
+            'name': self.name, 'cat': self.category, 'ph': 'X', 'pid': os.getpid(),
+            'tid': threading.get_ident(), 'ts': (self.start - _tracer.origin) * 1e6,
+            'dur': (end - self.start) * 1e6, 'args': self.args
+        })
+        return False
+
+
+class _NullSpan:
+    """Returned while tracing is off: does nothing, costs nothing."""
+    args = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable(memory=False):
+    """
+    Start recording.
+
+    Parameters:
+    memory (bool): Also record the peak traced memory of each span (tracemalloc;
+                   slows Python-level allocation noticeably)
+    """
+    _tracer.memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _tracer.enabled = True
+
+
+def disable():
+    """Stop recording (what was recorded is kept)."""
+    _tracer.enabled = False
+    if _tracer.memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _tracer.memory = False
+
+
+def is_enabled():
+    return _tracer.enabled
+
+
+def reset():
+    """Forget recorded spans and counters."""
+    with _tracer._lock:
+        _tracer.events = []
+        _tracer.counters = {}
+        _tracer.origin = time.perf_counter()
+
+
+def span(name, category='stage', **args):
+    """Context manager timing one stage (a no-op while tracing is off)."""
+    if not _tracer.enabled:
+        return _NULL_SPAN
+    return Span(name, category, args)
+
+
+def traced(name=None, category='stage'):
+    """
+    Method/function decorator: one span per call, named Class.method.
+
+    Usage:
+        @traced()
+        def plot_correlation_heatmap(self): ...
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return function(*args, **kwargs)
+            label = name or (f'{type(args[0]).__name__}.{function.__name__}'
+                             if args and hasattr(args[0], function.__name__) else function.__qualname__)
+            with Span(label, category, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, value=1):
+    """Add to a counter (rows downloaded, tickers processed, ...) and record its new total."""
+    if not _tracer.enabled:
+        return
+    with _tracer._lock:
+        total = _tracer.counters[name] = _tracer.counters.get(name, 0) + value
+    _tracer.events.append({'name': name, 'ph': 'C', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                           'ts': (time.perf_counter() - _tracer.origin) * 1e6, 'args': {name: total}})
+
+
+def record_shape(current, value):
+    """Note the rows/columns of a stage's result (DataFrame, Series, array) on its span."""
+    shape = getattr(value, 'shape', None)
+    if current is _NULL_SPAN or not shape:
+        return
+    current.args['rows'] = int(shape[0])
+    if len(shape) > 1:
+        current.args['columns'] = int(shape[1])
+
+
+def counters():
+    """Counter totals so far."""
+    return dict(_tracer.counters)
+
+
+def summary():
+    """
+    Time per stage.
+
+    Returns:
+    DataFrame: One row per span name - calls, total/mean/max milliseconds and
+               (with memory=True) the largest peak memory in MB, slowest first
+    """
+    rows = {}
+    for event in _tracer.events:
+        if event['ph'] != 'X':
+            continue
+        row = rows.setdefault(event['name'], {'Calls': 0, 'Total (ms)': 0.0, 'Max (ms)': 0.0,
+                                              'Peak Memory (MB)': np.nan})
+        milliseconds = event['dur'] / 1000
+        row['Calls'] += 1
+        row['Total (ms)'] += milliseconds
+        row['Max (ms)'] = max(row['Max (ms)'], milliseconds)
+        memory = event['args'].get('peak_memory_bytes', np.nan) / 2**20
+        row['Peak Memory (MB)'] = np.fmax(row['Peak Memory (MB)'], memory)
+    table = pd.DataFrame.from_dict(rows, orient='index',
+                                   columns=['Calls', 'Total (ms)', 'Max (ms)', 'Peak Memory (MB)'])
+    table.insert(2, 'Mean (ms)', table['Total (ms)'] / table['Calls'])
+    return table.sort_values('Total (ms)', ascending=False)
+
+
+def export_chrome_trace(path):
+    """
+    Write the recorded timeline in Chrome trace format (JSON), viewable in
+    chrome://tracing or https://ui.perfetto.dev.
+    """
+    with open(path, 'w') as file:
+        json.dump({'traceEvents': list(_tracer.events), 'displayTimeUnit': 'ms',
+                   'otherData': {'counters': counters()}}, file)
+    return path
+
+
+def _trace_from_environment():
+    """QUANT_TRACE=path: trace the whole run and write the timeline at exit."""
+    path = os.environ.get('QUANT_TRACE')
+    if path:
+        enable(memory=os.environ.get('QUANT_TRACE_MEMORY', '') not in ('', '0'))
+        atexit.register(export_chrome_trace, path)
+
+
+_trace_from_environment()
+
+
+if __name__ == "__main__":
+    # Run as a script this file is __main__; the analyzers record into week1.tracing
+    from week1 import tracing
+    from week1.day4.day4_multi_stock import MultiStockAnalyzer
+
+    print("TRACING A MULTI-STOCK ANALYSIS (simulated prices, no download)")
+
+    def pipeline():
+        rng = np.random.default_rng(42)
+        days = pd.bdate_range('2015-01-01', periods=2520)
+        analyzer = MultiStockAnalyzer([f'S{i:03d}' for i in range(200)])
+        analyzer.result_cache = None
+        analyzer.data = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (2520, 200)), axis=0)),
+                                     index=days, columns=analyzer.tickers)
+        analyzer.summary_statistics('monthly')
+        analyzer.correlation_matrix()
+        analyzer.tail_risk()
+
+    timings = {}
+    for label, options in (('untraced', None), ('traced', {}), ('traced + memory', {'memory': True})):
+        if options is not None:
+            tracing.reset()
+            tracing.enable(**options)
+        start = time.perf_counter()
+        pipeline()
+        timings[label] = time.perf_counter() - start
+        tracing.disable()
+
+    print(tracing.summary().round(2).to_string())
+    print("\nRun time: " + ", ".join(f"{label} {seconds:.2f}s" for label, seconds in timings.items()))
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        path = tracing.export_chrome_trace(os.path.join(directory, 'trace.json'))
+        print(f"Chrome trace: {len(tracing._tracer.events)} events, {os.path.getsize(path):,} bytes")